@@ -98,6 +98,50 @@ def calc_tire_degradation(tire_age_start: int or float,
     return t_tire_degr
 
 
+def calc_tire_degradation_ages(tire_ages: np.ndarray,
+                               compound: str,
+                               tire_pars: dict) -> np.ndarray:
+    """
+    .. description::
+    This function returns an array containing the tire degradation time deltas for the given (arbitrary) tire ages. In
+    contrast to calc_tire_degradation() the tire ages do not have to increase by 1 lap from lap to lap, e.g. if the
+    tire degradation was reduced during FCY phases. The equations are the same as for a single lap.
+
+    .. inputs::
+    :param tire_ages:       tire ages in laps
+    :type tire_ages:        np.ndarray
+    :param compound:        tire compound
+    :type compound:         str
+    :param tire_pars:       tire parameters for current driver
+    :type tire_pars:        dict
+
+    .. outputs::
+    :return t_tire_degr:    tire degradation time deltas in seconds
+    :rtype t_tire_degr:     np.ndarray
+    """
+
+    if tire_pars["tire_deg_model"] == 'lin':
+        return tire_pars[compound]['k_0'] + tire_pars[compound]['k_1_lin'] * tire_ages
+
+    elif tire_pars["tire_deg_model"] == 'quad':
+        return (tire_pars[compound]['k_0']
+                + tire_pars[compound]['k_1_quad'] * tire_ages
+                + tire_pars[compound]['k_2_quad'] * np.power(tire_ages, 2))
+
+    elif tire_pars["tire_deg_model"] == 'cub':
+        return (tire_pars[compound]['k_0']
+                + tire_pars[compound]['k_1_cub'] * tire_ages
+                + tire_pars[compound]['k_2_cub'] * np.power(tire_ages, 2)
+                + tire_pars[compound]['k_3_cub'] * np.power(tire_ages, 3))
+
+    elif tire_pars["tire_deg_model"] == 'ln':
+        return (tire_pars[compound]['k_0']
+                + tire_pars[compound]['k_1_ln'] * np.log(tire_pars[compound]['k_2_ln'] * tire_ages + 1.0))
+
+    else:
+        raise RuntimeError('Unknown tire degradation model!')
+
+
 # testing --------------------------------------------------------------------------------------------------------------
 if __name__ == "__main__":
     pass
@@ -1,4 +1,4 @@
-import itertools
+import math
 
 
 def get_strat_combinations(available_compounds: list,
@@ -41,32 +41,114 @@ def get_strat_combinations(available_compounds: list,
     strategy_combinations = {}
 
     for cur_no_pitstops in range(min_no_pitstops, max_no_pitstops + 1):
-        # combinations used since the chosen order of tire compounds does not matter for the final race time
-        if not all_orders:
-            strategy_combinations[cur_no_pitstops] = \
-                list(itertools.combinations_with_replacement(available_compounds, r=cur_no_pitstops + 1))
-        else:
-            strategy_combinations[cur_no_pitstops] = \
-                list(itertools.product(available_compounds, repeat=cur_no_pitstops + 1))
-
-        # remove strategy combinations using only a single tire compound if enforced
-        if enforce_diff_compounds:
-            strategy_combinations[cur_no_pitstops] = [strat_tmp for strat_tmp in strategy_combinations[cur_no_pitstops]
-                                                      if not len(set(strat_tmp)) == 1]
-
-        # remove strategy combinations that do not include the starting tire compound if enforced and sort compounds
-        # such that the combinations start with the starting compound, although this does not influence the total
-        # race time (for plotting purposes)
-        if start_compound:
-            strategy_combinations[cur_no_pitstops] = [strat_tmp for strat_tmp in strategy_combinations[cur_no_pitstops]
-                                                      if start_compound in strat_tmp]
-
-            for idx_set in range(len(strategy_combinations[cur_no_pitstops])):
-                # switch positions of first start compound entry and first entry if not equal
-                if not strategy_combinations[cur_no_pitstops][idx_set][0] == start_compound:
-                    set_list = list(strategy_combinations[cur_no_pitstops][idx_set])
-                    idx_start_compound = set_list.index(start_compound)
-                    set_list[0], set_list[idx_start_compound] = set_list[idx_start_compound], set_list[0]
-                    strategy_combinations[cur_no_pitstops][idx_set] = tuple(set_list)
+        strategy_combinations[cur_no_pitstops] = \
+            list(iter_strat_combinations(available_compounds=available_compounds,
+                                         no_pitstops=cur_no_pitstops,
+                                         enforce_diff_compounds=enforce_diff_compounds,
+                                         start_compound=start_compound,
+                                         all_orders=all_orders))
 
     return strategy_combinations
+
+
+def iter_strat_combinations(available_compounds: list,
+                            no_pitstops: int,
+                            enforce_diff_compounds: bool = True,
+                            start_compound: str = None,
+                            all_orders: bool = False,
+                            lower_bound: callable = None,
+                            max_cost: float = math.inf):
+    """
+    .. description::
+    Generator yielding the tire compound combinations for the given number of pit stops lazily, i.e. without holding
+    them all in memory. The combinations are built stint by stint (depth-first), the boundary conditions are applied
+    during the generation such that partial combinations that cannot fulfill them anymore are not continued:
+
+    - all_orders = False: combinations (order does not matter) are generated in the order of
+      itertools.combinations_with_replacement. If a start compound is given, its first occurrence is switched to the
+      first stint (for plotting purposes, this does not influence the total race time).
+    - all_orders = True: sequences are generated in the order of itertools.product. If a start compound is given, only
+      sequences starting with it are generated (sequences that are equal after switching the start compound to the
+      front are therefore included only once).
+
+    Optionally, a lower bound of the costs (e.g. race time) of all combinations starting with a given partial
+    combination can be inserted. Partial combinations whose lower bound exceeds max_cost are not continued.
+
+    .. inputs::
+    :param available_compounds:     Available compounds that should be included in the combinations, e.g. ['A4', 'A5']
+    :type available_compounds:      list
+    :param no_pitstops:             Number of pit stops (the combinations contain no_pitstops + 1 compounds)
+    :type no_pitstops:              int
+    :param enforce_diff_compounds:  Boolean flag to determine if combinations with a single compound should be skipped
+    :type enforce_diff_compounds:   bool
+    :param start_compound:          The start compound can be inserted such that it is included for the first stint
+    :type start_compound:           str
+    :param all_orders:              Boolean flag to determine if combinations (order of sequences does not matter) or
+                                    the product (all possible sequences orders included) are generated
+    :type all_orders:               bool
+    :param lower_bound:             Function returning a lower bound of the costs of all combinations starting with the
+                                    given partial combination (tuple of compounds in generation order, i.e. before the
+                                    start compound is switched to the front), None to deactivate pruning
+    :type lower_bound:              callable
+    :param max_cost:                Partial combinations with a lower bound above max_cost are pruned
+    :type max_cost:                 float
+
+    .. outputs::
+    :return strategy_combination:   Tuple with a compound per stint, e.g. ('A4', 'A5')
+    :rtype strategy_combination:    tuple
+    """
+
+    if start_compound and start_compound not in available_compounds:
+        return
+
+    no_stints = no_pitstops + 1
+    no_compounds = len(available_compounds)
+    idx_start_compound = available_compounds.index(start_compound) if start_compound else None
+
+    # depth-first generation of the compound indices, every stack entry contains the compound indices of a partial
+    # combination (stack is filled in reversed order such that the combinations are yielded in lexicographic order)
+    stack = [()]
+
+    while stack:
+        idxs = stack.pop()
+
+        if len(idxs) == no_stints:
+            strategy_combination = [available_compounds[idx] for idx in idxs]
+
+            # switch positions of first start compound entry and first entry if not equal
+            if not all_orders and start_compound and not strategy_combination[0] == start_compound:
+                idx_tmp = strategy_combination.index(start_compound)
+                strategy_combination[0], strategy_combination[idx_tmp] = \
+                    strategy_combination[idx_tmp], strategy_combination[0]
+
+            yield tuple(strategy_combination)
+            continue
+
+        # determine candidate compound indices of the next stint
+        if all_orders:
+            if not idxs and start_compound:
+                idxs_next = [idx_start_compound]
+            else:
+                idxs_next = list(range(no_compounds))
+        else:
+            # combinations are generated in a non-descending order of the compound indices
+            idxs_next = list(range(idxs[-1] if idxs else 0, no_compounds))
+
+            # start compound must still be includable (impossible if all remaining indices are above its index)
+            if start_compound and idx_start_compound not in idxs:
+                idxs_next = [idx for idx in idxs_next
+                             if idx == idx_start_compound or idx < idx_start_compound and len(idxs) + 1 < no_stints]
+
+        # last stint must not lead to a single compound combination if different compounds are enforced
+        if enforce_diff_compounds and len(idxs) + 1 == no_stints and len(set(idxs)) <= 1:
+            idxs_next = [idx for idx in idxs_next if idxs and idx != idxs[0]]
+
+        for idx in reversed(idxs_next):
+            idxs_tmp = idxs + (idx,)
+
+            # prune partial combinations whose costs cannot fall below max_cost anymore
+            if lower_bound is not None \
+                    and lower_bound(tuple(available_compounds[x] for x in idxs_tmp)) > max_cost:
+                continue
+
+            stack.append(idxs_tmp)
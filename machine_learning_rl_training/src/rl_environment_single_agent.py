@@ -352,7 +352,7 @@ class RaceSimulation(tf_agents.environments.py_environment.PyEnvironment):
 
         # calculate fcy_stat_curlap ------------------------------------------------------------------------------------
         idx_act_phase_rel = self.race.fcy_handling["idxs_act_phase"][self.idx_driver]
-        fcy_type = self.race.fcy_data["phases"][idx_act_phase_rel][2] if idx_act_phase_rel is not None else None
+        fcy_type = self.race.fcy_data["phases"][idx_act_phase_rel][2] if idx_act_phase_rel >= 0 else None
         fcy_stat_curlap = 0
 
         # a status other than 0 is only set if a FCY phase is active for the current driver
@@ -504,7 +504,7 @@ class RaceSimulation(tf_agents.environments.py_environment.PyEnvironment):
 
         # distinguish between SC/VSC and no SC/VSC
         idx_act_phase_rel = self.race.fcy_handling["idxs_act_phase"][self.idx_driver]
-        fcy_type = self.race.fcy_data["phases"][idx_act_phase_rel][2] if idx_act_phase_rel is not None else None
+        fcy_type = self.race.fcy_data["phases"][idx_act_phase_rel][2] if idx_act_phase_rel >= 0 else None
 
         if fcy_type is None:
             # no SC/VSC in this lap
@@ -629,8 +629,8 @@ class RaceSimulation(tf_agents.environments.py_environment.PyEnvironment):
 
         if action in [1, 2, 3]:
             # pit stop in this lap, compound = available_compounds[action - 1]
-            self.race.drivers_list[self.idx_driver].strategy_info.\
-                append([self.race.cur_lap, self.available_compounds[action - 1], 0, 0.0])
+            self.race.add_pitstop(idx_driver=self.idx_driver,
+                                  pitstop=[self.race.cur_lap, self.available_compounds[action - 1], 0, 0.0])
 
         # simulate next lap
         self.race._RaceReinftrain__simulate_lap()
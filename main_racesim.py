@@ -24,12 +24,21 @@ the simulation is located at the bottom. Have a look there to insert the require
 # MAIN FUNCTION --------------------------------------------------------------------------------------------------------
 # ----------------------------------------------------------------------------------------------------------------------
 
-def main(sim_opts: dict, race_pars_file: str, mcs_pars_file: str) -> list:
+def main(sim_opts: dict, race_pars_file: str, mcs_pars_file: str) -> list or tuple:
 
     # ------------------------------------------------------------------------------------------------------------------
     # INITIALIZATION ---------------------------------------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
 
+    # set defaults of the optional simulation options such that option dicts without them (e.g. in the notebooks) can
+    # still be used
+    sim_opts = {"use_cache": False,
+                "use_timing": False,
+                "use_compact_results": False,
+                "max_memory_mb": None,
+                "check_every_kth_run": 1,
+                **sim_opts}
+
     # get repo path
     repo_path = os.path.dirname(os.path.abspath(__file__))
 
@@ -45,6 +54,9 @@ def main(sim_opts: dict, race_pars_file: str, mcs_pars_file: str) -> list:
     testobjects_path = os.path.join(output_path, "testobjects")
     os.makedirs(testobjects_path, exist_ok=True)
 
+    # spill folder of the MCS results, the process ID assures a separate folder for runs started at the same time
+    spill_path = os.path.join(output_path, "result_spill", "%s_%i" % (time.strftime("%Y%m%d_%H%M%S"), os.getpid()))
+
     # load parameters
     pars_in, vse_paths = racesim.src.import_pars.import_pars(use_print=sim_opts["use_print"],
                                                              use_vse=sim_opts["use_vse"],
@@ -58,8 +70,14 @@ def main(sim_opts: dict, race_pars_file: str, mcs_pars_file: str) -> list:
     # SIMULATION -------------------------------------------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
 
-    # create list containing the simulated race object (single run) or dicts with valid results (multiple runs)
-    race_results = []
+    # create list containing the simulated race object (single run) or dicts with valid results (multiple runs), the
+    # results are spilled to disk if the memory budget is exceeded (half of the budget is used for the results, the
+    # other half for the race objects of the in-flight jobs)
+    if sim_opts["max_memory_mb"] is not None and sim_opts["no_sim_runs"] > 1:
+        race_results = racesim.src.result_store.ResultStore(max_memory_mb=0.5 * sim_opts["max_memory_mb"],
+                                                            spill_path=spill_path)
+    else:
+        race_results = []
 
     # save start time for runtime calculation
     if sim_opts["use_print"]:
@@ -68,8 +86,12 @@ def main(sim_opts: dict, race_pars_file: str, mcs_pars_file: str) -> list:
 
     # iteration variables
     no_sim_runs_left = sim_opts["no_sim_runs"]  # counter for the number of races left for simulation
+    ctr_submitted = 0                           # counter for the number of submitted races
     ctr_invalid = 0                             # counter for the number of simulated races marked as invalid
 
+    # accumulated timing of the lap simulation phases over all simulated races (if timing is activated)
+    timing = racesim.src.timing.create_timing() if sim_opts["use_timing"] else None
+
     # SINGLE PROCESS ---------------------------------------------------------------------------------------------------
     if sim_opts["no_workers"] == 1:
 
@@ -78,14 +100,21 @@ def main(sim_opts: dict, race_pars_file: str, mcs_pars_file: str) -> list:
             tmp_race_handle = race_handle(pars_in=pars_in,
                                           use_prob_infl=sim_opts['use_prob_infl'],
                                           create_rand_events=sim_opts['create_rand_events'],
-                                          vse_paths=vse_paths)
+                                          vse_paths=vse_paths,
+                                          use_cache=sim_opts['use_cache'],
+                                          use_timing=sim_opts['use_timing'],
+                                          use_plausibility_check=ctr_submitted % sim_opts["check_every_kth_run"] == 0)
             no_sim_runs_left -= 1
+            ctr_submitted += 1
+
+            if timing is not None:
+                racesim.src.timing.add_timing(timing_tot=timing, timing=tmp_race_handle.timing)
 
             # CASE 1: result is valid
             if tmp_race_handle.result_status == 0:
                 # save race object for later evaluation (single race) or simple race results (MCS)
                 if sim_opts["no_sim_runs"] > 1:
-                    race_results.append(tmp_race_handle.get_race_results())
+                    race_results.append(tmp_race_handle.get_race_results(compact=sim_opts["use_compact_results"]))
                 else:
                     race_results.append(tmp_race_handle)
 
@@ -112,8 +141,10 @@ def main(sim_opts: dict, race_pars_file: str, mcs_pars_file: str) -> list:
 
     # MULTIPLE PROCESSES -----------------------------------------------------------------------------------------------
     else:
-        # set maximum number of jobs in the waiting queue at the same time -> limits RAM usage
-        max_no_concurrent_jobs = 200
+        # set maximum number of jobs in the waiting queue at the same time -> limits RAM usage (if a memory budget is
+        # set, the queue size is adapted as soon as the size of a race object is known)
+        max_no_concurrent_jobs = 200 if sim_opts["max_memory_mb"] is None else sim_opts["no_workers"]
+        race_nbytes = None
 
         # create executor instance (pool of processes available for parallel calculations)
         with futures.ProcessPoolExecutor(max_workers=sim_opts["no_workers"]) as executor:
@@ -129,18 +160,33 @@ def main(sim_opts: dict, race_pars_file: str, mcs_pars_file: str) -> list:
                                                      pars_in,
                                                      sim_opts['use_prob_infl'],
                                                      sim_opts['create_rand_events'],
-                                                     vse_paths))
+                                                     vse_paths,
+                                                     sim_opts['use_cache'],
+                                                     sim_opts['use_timing'],
+                                                     ctr_submitted % sim_opts["check_every_kth_run"] == 0))
                     no_sim_runs_left -= 1
+                    ctr_submitted += 1
 
                 # collect results as soon as they are available
                 for job_handle in futures.as_completed(job_queue):
                     tmp_race_handle = job_handle.result()
 
+                    # size the job queue such that the in-flight race objects fit into half of the memory budget
+                    if sim_opts["max_memory_mb"] is not None and race_nbytes is None:
+                        race_nbytes = len(pickle.dumps(tmp_race_handle, protocol=pickle.HIGHEST_PROTOCOL))
+                        max_no_concurrent_jobs = \
+                            max(int(0.5 * sim_opts["max_memory_mb"] * 1024.0 ** 2 / race_nbytes),
+                                sim_opts["no_workers"] + 1)
+
+                    if timing is not None:
+                        racesim.src.timing.add_timing(timing_tot=timing, timing=tmp_race_handle.timing)
+
                     # CASE 1: result is valid
                     if tmp_race_handle.result_status == 0:
                         # save race object for later evaluation (single race) or simple race results (MCS)
                         if sim_opts["no_sim_runs"] > 1:
-                            race_results.append(tmp_race_handle.get_race_results())
+                            race_results.append(
+                                tmp_race_handle.get_race_results(compact=sim_opts["use_compact_results"]))
                         else:
                             race_results.append(tmp_race_handle)
 
@@ -169,12 +215,20 @@ def main(sim_opts: dict, race_pars_file: str, mcs_pars_file: str) -> list:
     if sim_opts["use_print"]:
         print("INFO: There were %i invalid races!" % ctr_invalid)
 
+    if type(race_results) is racesim.src.result_store.ResultStore and race_results.spill_files \
+            and sim_opts["use_print"]:
+        print("INFO: %i results were spilled to %s!" % (len(race_results) - len(race_results.results), spill_path))
+
     # print runtime into console window
     if sim_opts["use_print"]:
         runtime = time.perf_counter() - t_start
         print("INFO: Simulation runtime: {:.3f}s ({:.3f}ms per race)".format(runtime,
                                                                              runtime / sim_opts["no_sim_runs"] * 1000))
 
+    # print timing report (invalid races are included since they were simulated as well)
+    if timing is not None and sim_opts["use_print"]:
+        racesim.src.timing.print_timing(timing=timing, no_races=sim_opts["no_sim_runs"] + ctr_invalid)
+
     # ------------------------------------------------------------------------------------------------------------------
     # POSTPROCESSING ---------------------------------------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
@@ -222,7 +276,12 @@ def main(sim_opts: dict, race_pars_file: str, mcs_pars_file: str) -> list:
     if sim_opts["use_print"]:
         print("INFO: Simulation finished successfully!")
 
-    return race_results  # return required in case of CI testing
+    # return required in case of CI testing (timing dict is returned additionally if timing is activated) -> if the
+    # results are returned as ResultStore, remove_spill_files() must be called as soon as they are not required anymore
+    if timing is not None:
+        return race_results, timing
+    else:
+        return race_results
 
 
 # ----------------------------------------------------------------------------------------------------------------------
@@ -247,6 +306,19 @@ if __name__ == '__main__':
     #                       contain empty lists, otherwise the file entries are used
     # use_vse:              determines if the VSE (virtual strategy engineer) is used to take tire change decisions
     #                       -> the VSE type is defined in the parameter file (VSE_PARS)
+    # use_cache:            determines if deterministic races (use_prob_infl and create_rand_events deactivated) are
+    #                       loaded from the result cache (racesim/output/result_cache) if they were simulated before
+    #                       with the same parameters and VSE models, new results are saved in the cache
+    # use_timing:           activates the timing instrumentation of the lap simulation phases, the accumulated timing is
+    #                       printed and returned in addition to the results
+    # use_compact_results:  store the MCS results with compact dtypes (float32 race times, int8 positions, packed bits
+    #                       for bool_driving), the race simulation itself always uses float64
+    # max_memory_mb:        memory budget in MB for the MCS results and the in-flight jobs (None -> unlimited), results
+    #                       exceeding the budget are spilled to disk (racesim/output/result_spill) and removed at the
+    #                       end of the script
+    # check_every_kth_run:  the plausibility of the results is only checked for every k-th simulated race (1 -> every
+    #                       race is checked), unchecked races are considered valid unless the simulation itself marks
+    #                       them invalid
     # no_sim_runs:          number of (valid) races to simulate
     # no_workers:           defines number of workers for multiprocess calculations, 1 for single process, >1 for
     #                       multi-process (you can use print(multiprocessing.cpu_count()) to determine the max. number)
@@ -256,6 +328,11 @@ if __name__ == '__main__':
     sim_opts_ = {"use_prob_infl": False,
                  "create_rand_events": False,
                  "use_vse": False,
+                 "use_cache": False,
+                 "use_timing": False,
+                 "use_compact_results": False,
+                 "max_memory_mb": None,
+                 "check_every_kth_run": 1,
                  "no_sim_runs": 1,
                  "no_workers": 1,
                  "use_print": True,
@@ -266,6 +343,13 @@ if __name__ == '__main__':
     # SIMULATION CALL --------------------------------------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
 
-    main(sim_opts=sim_opts_,
-         race_pars_file=race_pars_file_,
-         mcs_pars_file=mcs_pars_file_)
+    race_results_ = main(sim_opts=sim_opts_,
+                         race_pars_file=race_pars_file_,
+                         mcs_pars_file=mcs_pars_file_)
+
+    # remove spilled results since they are not required anymore
+    if type(race_results_) is tuple:
+        race_results_ = race_results_[0]
+
+    if type(race_results_) is racesim.src.result_store.ResultStore:
+        race_results_.remove_spill_files()
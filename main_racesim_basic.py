@@ -1,5 +1,4 @@
 import numpy as np
-import itertools
 import time
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D  # noqa
@@ -30,6 +29,13 @@ Attention:
 # ----------------------------------------------------------------------------------------------------------------------
 
 def main(sim_opts: dict, pars_in: dict) -> tuple:
+    # set defaults of the optional simulation options such that option dicts without them (e.g. in the notebooks) can
+    # still be used
+    sim_opts = {"use_dp": False,
+                "no_fcy_scenarios": 0,
+                "fcy_risk_alpha": None,
+                **sim_opts}
+
     # ------------------------------------------------------------------------------------------------------------------
     # CREATE ALL POSSIBLE TIRE COMPOUND COMBINATIONS -------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
@@ -55,20 +61,24 @@ def main(sim_opts: dict, pars_in: dict) -> tuple:
     # ------------------------------------------------------------------------------------------------------------------
 
     if sim_opts["use_qp"]:
+        # calculate optimal stint lengths of all strategy combinations at once using the closed-form solution of the QP
+        opt_stint_lengths_all = racesim_basic.src.opt_strategy_basic. \
+            opt_strategies_basic_lin(tot_no_laps=pars_in['race_pars']['tot_no_laps'],
+                                     tire_pars=pars_in['driver_pars']["tire_pars"],
+                                     strategy_combinations=strategy_combinations,
+                                     start_age=sim_opts["start_age"])
+
         # iterate over all desired numbers of pitstops
         for cur_no_pitstops in range(sim_opts["min_no_pitstops"], sim_opts["max_no_pitstops"] + 1):
             # iterate over all possible strategy combinations with cur_no_pitstops
             t_race_fastest[cur_no_pitstops] = []
 
-            for cur_comp_strat in strategy_combinations[cur_no_pitstops]:
-                # calculate optimal stint lengths using the QP
+            for idx_comp_strat, cur_comp_strat in enumerate(strategy_combinations[cur_no_pitstops]):
+                # get optimal stint lengths of the QP
                 tires = [[comp, 0] for comp in cur_comp_strat]
                 tires[0][1] = sim_opts["start_age"]
 
-                opt_stint_lengths = racesim_basic.src.opt_strategy_basic. \
-                    opt_strategy_basic(tot_no_laps=pars_in['race_pars']['tot_no_laps'],
-                                       tire_pars=pars_in['driver_pars']["tire_pars"],
-                                       tires=tires)
+                opt_stint_lengths = opt_stint_lengths_all[cur_no_pitstops][idx_comp_strat]
 
                 # if no solution was found exit QP and use full factorial instead
                 if opt_stint_lengths is None:
@@ -131,11 +141,79 @@ def main(sim_opts: dict, pars_in: dict) -> tuple:
             for cur_no_pitstops in t_race_fastest:
                 t_race_fastest[cur_no_pitstops] = sorted(t_race_fastest[cur_no_pitstops], key=lambda x: x[1])
 
+    # ------------------------------------------------------------------------------------------------------------------
+    # CALCULATE RACE TIMES (DP) ----------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    if sim_opts["use_dp"]:
+        # determine optimal stint lengths and compounds for every number of pit stops at once
+        opt_strategies = racesim_basic.src.opt_strategy_dp.\
+            opt_strategy_dp(tot_no_laps=pars_in['race_pars']['tot_no_laps'],
+                            tire_pars=pars_in['driver_pars']["tire_pars"],
+                            available_compounds=pars_in['available_compounds'],
+                            min_no_pitstops=sim_opts["min_no_pitstops"],
+                            max_no_pitstops=sim_opts["max_no_pitstops"],
+                            enforce_diff_compounds=sim_opts["enforce_diff_compounds"],
+                            start_compound=sim_opts["start_compound"],
+                            start_age=sim_opts["start_age"])
+
+        for cur_no_pitstops, (opt_stint_lengths, cur_comp_strat) in opt_strategies.items():
+            # set up strategy and calculate final race time
+            laps_tmp = 0
+            strategy = []  # [[inlap, compound, age, refueling], ...]
+            strategy_stints = []  # [stint_length, compound, stint_length, compound, ...]
+
+            for i in range(cur_no_pitstops + 1):
+                strategy.append([laps_tmp,  # inlap
+                                 cur_comp_strat[i],  # set next compound
+                                 sim_opts["start_age"] if i == 0 else 0,  # [-] tire age
+                                 0.0])  # [kg or kWh] refueling during pit stop
+                strategy_stints.extend([opt_stint_lengths[i], cur_comp_strat[i]])
+                laps_tmp += opt_stint_lengths[i]
+
+            t_race_tmp = racesim_basic.src.calc_racetimes_basic. \
+                calc_racetimes_basic(t_base=pars_in['driver_pars']["t_base"],
+                                     tot_no_laps=pars_in['race_pars']["tot_no_laps"],
+                                     t_lap_sens_mass=pars_in['track_pars']["t_lap_sens_mass"],
+                                     t_pitdrive_inlap=pars_in['track_pars']["t_pitdrive_inlap"],
+                                     t_pitdrive_outlap=pars_in['track_pars']["t_pitdrive_outlap"],
+                                     t_pitdrive_inlap_fcy=pars_in['track_pars']["t_pitdrive_inlap_fcy"],
+                                     t_pitdrive_outlap_fcy=pars_in['track_pars']["t_pitdrive_outlap_fcy"],
+                                     t_pitdrive_inlap_sc=pars_in['track_pars']["t_pitdrive_inlap_sc"],
+                                     t_pitdrive_outlap_sc=pars_in['track_pars']["t_pitdrive_outlap_sc"],
+                                     t_pit_tirechange=pars_in['driver_pars']["t_pit_tirechange"],
+                                     pits_aft_finishline=pars_in['track_pars']["pits_aft_finishline"],
+                                     tire_pars=pars_in['driver_pars']["tire_pars"],
+                                     p_grid=pars_in['driver_pars']["p_grid"],
+                                     t_loss_pergridpos=pars_in['track_pars']["t_loss_pergridpos"],
+                                     t_loss_firstlap=pars_in['track_pars']["t_loss_firstlap"],
+                                     strategy=strategy,
+                                     drivetype=pars_in['driver_pars']["drivetype"],
+                                     m_fuel_init=pars_in['driver_pars']["m_fuel_init"],
+                                     b_fuel_perlap=pars_in['driver_pars']["b_fuel_perlap"],
+                                     t_pit_refuel_perkg=pars_in['driver_pars']["t_pit_refuel_perkg"],
+                                     t_pit_charge_perkwh=pars_in['driver_pars']["t_pit_charge_perkwh"],
+                                     fcy_phases=None,
+                                     t_lap_sc=pars_in['track_pars']["t_lap_sc"],
+                                     t_lap_fcy=pars_in['track_pars']["t_lap_fcy"])[0][-1]
+
+            # only the optimal strategy is determined for every number of pit stops
+            t_race_fastest[cur_no_pitstops] = [[tuple(strategy_stints), t_race_tmp]]
+
     # ------------------------------------------------------------------------------------------------------------------
     # CALCULATE RACE TIMES (FULL FACTORIAL) ----------------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
 
-    if not sim_opts["use_qp"] or exit_qp:
+    if not (sim_opts["use_qp"] or sim_opts["use_dp"]) or exit_qp:
+        # create bank of random FCY scenarios (same for all strategies) if desired
+        if sim_opts["no_fcy_scenarios"] > 0:
+            fcy_scenarios = racesim_basic.src.create_fcy_scenarios. \
+                create_fcy_scenarios(tot_no_laps=pars_in['race_pars']["tot_no_laps"],
+                                     fcy_scenario_pars=pars_in["fcy_scenario_pars"],
+                                     no_scenarios=sim_opts["no_fcy_scenarios"])
+        else:
+            fcy_scenarios = None
+
         # iterate over all desired numbers of pitstops
         for cur_no_pitstops in range(sim_opts["min_no_pitstops"], sim_opts["max_no_pitstops"] + 1):
             # create n-D array fitting for cur_no_pitstops: first dimension = first stop, second dimension = second stop
@@ -149,62 +227,98 @@ def main(sim_opts: dict, pars_in: dict) -> tuple:
             # iterate over all possible strategy combinations with cur_no_pitstops
             for cur_comp_strat in t_race_full_factorial[cur_no_pitstops]:
 
-                # iterate over all inlap combinations with cur_no_pitstops to calculate race time when doing the stop in
-                # the according laps (tot_no_laps - 1 is not included as race must not be finished in pit)
-                for idxs_cur_inlaps in itertools.product(range(pars_in['race_pars']["tot_no_laps"] - 1),
-                                                         repeat=cur_no_pitstops):
-                    # check if inlaps appear in a rising order
-                    if not all([x < y for x, y in zip(idxs_cur_inlaps, idxs_cur_inlaps[1:])]):
-                        t_race_full_factorial[cur_no_pitstops][cur_comp_strat][idxs_cur_inlaps] = np.nan
-                        continue
-
-                    # set up strategy and calculate final race time [[inlap, compound, age, refueling], ...]
-                    strategy = [[0, cur_comp_strat[0], sim_opts["start_age"], 0.0]]
-
-                    for i in range(cur_no_pitstops):
-                        strategy.append([idxs_cur_inlaps[i] + 1,  # inlap = idx + 1
-                                         cur_comp_strat[i + 1],  # set next compound
-                                         0,  # [-] tire age
-                                         0.0])  # [kg or kWh] refueling during pit stop
-
-                    t_race_full_factorial[cur_no_pitstops][cur_comp_strat][idxs_cur_inlaps] = racesim_basic.src. \
-                        calc_racetimes_basic.calc_racetimes_basic(t_base=pars_in['driver_pars']["t_base"],
-                                                                  tot_no_laps=pars_in['race_pars']["tot_no_laps"],
-                                                                  t_lap_sens_mass=pars_in['track_pars'][
-                                                                      "t_lap_sens_mass"],
-                                                                  t_pitdrive_inlap=pars_in['track_pars'][
-                                                                      "t_pitdrive_inlap"],
-                                                                  t_pitdrive_outlap=pars_in['track_pars'][
-                                                                      "t_pitdrive_outlap"],
-                                                                  t_pitdrive_inlap_fcy=pars_in['track_pars'][
-                                                                      "t_pitdrive_inlap_fcy"],
-                                                                  t_pitdrive_outlap_fcy=pars_in['track_pars'][
-                                                                      "t_pitdrive_outlap_fcy"],
-                                                                  t_pitdrive_inlap_sc=pars_in['track_pars'][
-                                                                      "t_pitdrive_inlap_sc"],
-                                                                  t_pitdrive_outlap_sc=pars_in['track_pars'][
-                                                                      "t_pitdrive_outlap_sc"],
-                                                                  pits_aft_finishline=pars_in['track_pars'][
-                                                                      "pits_aft_finishline"],
-                                                                  t_pit_tirechange=pars_in['driver_pars'][
-                                                                      "t_pit_tirechange"],
-                                                                  tire_pars=pars_in['driver_pars']["tire_pars"],
-                                                                  p_grid=pars_in['driver_pars']["p_grid"],
-                                                                  t_loss_pergridpos=pars_in['track_pars'][
-                                                                      "t_loss_pergridpos"],
-                                                                  t_loss_firstlap=pars_in['track_pars'][
-                                                                      "t_loss_firstlap"],
-                                                                  strategy=strategy,
-                                                                  drivetype=pars_in['driver_pars']["drivetype"],
-                                                                  m_fuel_init=pars_in['driver_pars']["m_fuel_init"],
-                                                                  b_fuel_perlap=pars_in['driver_pars']["b_fuel_perlap"],
-                                                                  t_pit_refuel_perkg=pars_in['driver_pars'][
-                                                                      "t_pit_refuel_perkg"],
-                                                                  t_pit_charge_perkwh=pars_in['driver_pars'][
-                                                                      "t_pit_charge_perkwh"],
-                                                                  fcy_phases=sim_opts["fcy_phases"],
-                                                                  t_lap_sc=pars_in['track_pars']["t_lap_sc"],
-                                                                  t_lap_fcy=pars_in['track_pars']["t_lap_fcy"])[0][-1]
+                # in case of random FCY scenarios the expected race times (or the conditional values at risk) of all
+                # inlap combinations are evaluated against the whole scenario bank
+                if fcy_scenarios is not None:
+                    t_race_full_factorial[cur_no_pitstops][cur_comp_strat] = racesim_basic.src. \
+                        calc_racetimes_fcy_scenarios. \
+                        calc_racetimes_fcy_scenarios(t_base=pars_in['driver_pars']["t_base"],
+                                                     tot_no_laps=pars_in['race_pars']["tot_no_laps"],
+                                                     t_lap_sens_mass=pars_in['track_pars']["t_lap_sens_mass"],
+                                                     t_pitdrive_inlap=pars_in['track_pars']["t_pitdrive_inlap"],
+                                                     t_pitdrive_outlap=pars_in['track_pars']["t_pitdrive_outlap"],
+                                                     t_pitdrive_inlap_fcy=pars_in['track_pars']["t_pitdrive_inlap_fcy"],
+                                                     t_pitdrive_outlap_fcy=pars_in['track_pars'][
+                                                         "t_pitdrive_outlap_fcy"],
+                                                     t_pitdrive_inlap_sc=pars_in['track_pars']["t_pitdrive_inlap_sc"],
+                                                     t_pitdrive_outlap_sc=pars_in['track_pars']["t_pitdrive_outlap_sc"],
+                                                     t_pit_tirechange=pars_in['driver_pars']["t_pit_tirechange"],
+                                                     pits_aft_finishline=pars_in['track_pars']["pits_aft_finishline"],
+                                                     tire_pars=pars_in['driver_pars']["tire_pars"],
+                                                     p_grid=pars_in['driver_pars']["p_grid"],
+                                                     t_loss_pergridpos=pars_in['track_pars']["t_loss_pergridpos"],
+                                                     t_loss_firstlap=pars_in['track_pars']["t_loss_firstlap"],
+                                                     comp_strat=cur_comp_strat,
+                                                     start_age=sim_opts["start_age"],
+                                                     drivetype=pars_in['driver_pars']["drivetype"],
+                                                     m_fuel_init=pars_in['driver_pars']["m_fuel_init"],
+                                                     b_fuel_perlap=pars_in['driver_pars']["b_fuel_perlap"],
+                                                     fcy_scenarios=fcy_scenarios,
+                                                     t_lap_sc=pars_in['track_pars']["t_lap_sc"],
+                                                     t_lap_fcy=pars_in['track_pars']["t_lap_fcy"],
+                                                     risk_alpha=sim_opts["fcy_risk_alpha"])
+                    continue
+
+                # without FCY phases the race times of all inlap combinations can be evaluated at once using cumulative
+                # stint cost tables
+                if not sim_opts["fcy_phases"]:
+                    t_race_full_factorial[cur_no_pitstops][cur_comp_strat] = racesim_basic.src. \
+                        calc_racetimes_full_factorial. \
+                        calc_racetimes_full_factorial(t_base=pars_in['driver_pars']["t_base"],
+                                                      tot_no_laps=pars_in['race_pars']["tot_no_laps"],
+                                                      t_lap_sens_mass=pars_in['track_pars']["t_lap_sens_mass"],
+                                                      t_pitdrive_inlap=pars_in['track_pars']["t_pitdrive_inlap"],
+                                                      t_pitdrive_outlap=pars_in['track_pars']["t_pitdrive_outlap"],
+                                                      t_pit_tirechange=pars_in['driver_pars']["t_pit_tirechange"],
+                                                      tire_pars=pars_in['driver_pars']["tire_pars"],
+                                                      p_grid=pars_in['driver_pars']["p_grid"],
+                                                      t_loss_pergridpos=pars_in['track_pars']["t_loss_pergridpos"],
+                                                      t_loss_firstlap=pars_in['track_pars']["t_loss_firstlap"],
+                                                      comp_strat=cur_comp_strat,
+                                                      start_age=sim_opts["start_age"],
+                                                      drivetype=pars_in['driver_pars']["drivetype"],
+                                                      m_fuel_init=pars_in['driver_pars']["m_fuel_init"],
+                                                      b_fuel_perlap=pars_in['driver_pars']["b_fuel_perlap"])
+                    continue
+
+                # evaluate all inlap combinations with cur_no_pitstops appearing in a rising order at once to calculate
+                # race time when doing the stop in the according laps
+                strategy_table, idxs_inlaps = racesim_basic.src.calc_racetimes_basic. \
+                    create_strategy_table_full_factorial(tot_no_laps=pars_in['race_pars']["tot_no_laps"],
+                                                         comp_strat=cur_comp_strat,
+                                                         start_age=sim_opts["start_age"])
+
+                t_race_lapwise = racesim_basic.src.calc_racetimes_basic. \
+                    calc_racetimes_basic_batch(t_base=pars_in['driver_pars']["t_base"],
+                                               tot_no_laps=pars_in['race_pars']["tot_no_laps"],
+                                               t_lap_sens_mass=pars_in['track_pars']["t_lap_sens_mass"],
+                                               t_pitdrive_inlap=pars_in['track_pars']["t_pitdrive_inlap"],
+                                               t_pitdrive_outlap=pars_in['track_pars']["t_pitdrive_outlap"],
+                                               t_pitdrive_inlap_fcy=pars_in['track_pars']["t_pitdrive_inlap_fcy"],
+                                               t_pitdrive_outlap_fcy=pars_in['track_pars']["t_pitdrive_outlap_fcy"],
+                                               t_pitdrive_inlap_sc=pars_in['track_pars']["t_pitdrive_inlap_sc"],
+                                               t_pitdrive_outlap_sc=pars_in['track_pars']["t_pitdrive_outlap_sc"],
+                                               pits_aft_finishline=pars_in['track_pars']["pits_aft_finishline"],
+                                               t_pit_tirechange=pars_in['driver_pars']["t_pit_tirechange"],
+                                               tire_pars=pars_in['driver_pars']["tire_pars"],
+                                               p_grid=pars_in['driver_pars']["p_grid"],
+                                               t_loss_pergridpos=pars_in['track_pars']["t_loss_pergridpos"],
+                                               t_loss_firstlap=pars_in['track_pars']["t_loss_firstlap"],
+                                               strategy_table=strategy_table,
+                                               drivetype=pars_in['driver_pars']["drivetype"],
+                                               m_fuel_init=pars_in['driver_pars']["m_fuel_init"],
+                                               b_fuel_perlap=pars_in['driver_pars']["b_fuel_perlap"],
+                                               t_pit_refuel_perkg=pars_in['driver_pars']["t_pit_refuel_perkg"],
+                                               t_pit_charge_perkwh=pars_in['driver_pars']["t_pit_charge_perkwh"],
+                                               fcy_phases=sim_opts["fcy_phases"],
+                                               t_lap_sc=pars_in['track_pars']["t_lap_sc"],
+                                               t_lap_fcy=pars_in['track_pars']["t_lap_fcy"])[0]
+
+                # inlap combinations not appearing in a rising order are set np.nan
+                idxs_flat = np.ravel_multi_index(tuple(idxs_inlaps.T), t_race_template.shape)
+
+                t_race_full_factorial[cur_no_pitstops][cur_comp_strat][...] = np.nan
+                np.put(t_race_full_factorial[cur_no_pitstops][cur_comp_strat], idxs_flat, t_race_lapwise[:, -1])
 
     # ------------------------------------------------------------------------------------------------------------------
     # POSTPROCESSING (FULL FACTORIAL) ----------------------------------------------------------------------------------
@@ -273,12 +387,22 @@ if __name__ == '__main__':
     # start_age:                age of start tire set
     # enforce_diff_compounds:   enforce that at least two different compounds must be used in the race
     # use_qp:                   activate quadratic optim. to determine the optimal inlaps -> requires linear model, is
-    #                           fast, reduced plotting
+    #                           fast (closed-form solution, cvxpy is not required), reduced plotting
+    # use_dp:                   activate dynamic programming to determine the optimal inlaps and compounds -> works for
+    #                           all tire models, is fast, determines only the optimal strategy per number of pit stops,
+    #                           reduced plotting
     # fcy_phases:               either None or [[start race progress, stop race progress, phase type], [...], ...]
-    #                           -> only considered in full factorial calculations, not in QP!
+    #                           -> only considered in full factorial calculations, not in QP or DP!
     #                           -> start and stop race progress must be in range [0.0, tot_no_laps] (e.g. if SC comes
     #                           at 30% of the first lap and leaves at the end of lap 2 it would be [[0.3, 2.0, 'SC']])
     #                           -> valid FCY phase types are 'SC' and 'VSC'
+    # no_fcy_scenarios:         number of random FCY scenarios (created like in the Monte Carlo race simulation) used to
+    #                           determine the strategy with the best expected race time (0 to deactivate)
+    #                           -> only considered in full factorial calculations, replaces fcy_phases!
+    #                           -> requires the race simulation parameter file of the race (same file name)
+    # fcy_risk_alpha:           None to minimize the expected race time over the FCY scenarios, otherwise confidence
+    #                           level in range [0.0, 1.0) to minimize the conditional value at risk (mean race time of
+    #                           the slowest (1 - fcy_risk_alpha) share of the scenarios)
 
     sim_opts_ = {"min_no_pitstops": 1,
                  "max_no_pitstops": 2,
@@ -286,7 +410,10 @@ if __name__ == '__main__':
                  "start_age": 0,
                  "enforce_diff_compounds": True,
                  "use_qp": False,
-                 "fcy_phases": None}
+                 "use_dp": False,
+                 "fcy_phases": None,
+                 "no_fcy_scenarios": 0,
+                 "fcy_risk_alpha": None}
 
     # use_plot:                 set if plotting should be used or not (will be shown up to max. 2 stops)
     # use_print:                set if prints to console should be used or not (does not suppress hints/warnings)
@@ -308,6 +435,11 @@ if __name__ == '__main__':
                                                                          race_pars_file=race_pars_file_,
                                                                          driver_initials=driver_initials_)
 
+    # load parameters required for random FCY scenarios
+    if sim_opts_["no_fcy_scenarios"] > 0:
+        pars_in_["fcy_scenario_pars"] = racesim_basic.src.import_ext_params.\
+            import_fcy_scenario_pars(use_print=use_print, race_pars_file=race_pars_file_)
+
     # check parameters
     racesim_basic.src.check_pars.check_pars(sim_opts=sim_opts_, pars_in=pars_in_, use_plot=use_plot)
 
@@ -392,7 +524,7 @@ if __name__ == '__main__':
         plt.show()
 
         # plot 1 stop strategies ---------------------------------------------------------------------------------------
-        if not sim_opts_["use_qp"]:
+        if not sim_opts_["use_qp"] and not sim_opts_["use_dp"]:
             for cur_comp_strat_ in t_race_full_factorial_[1]:
                 fig = plt.figure()
                 ax = fig.gca()
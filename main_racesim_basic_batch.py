@@ -0,0 +1,194 @@
+import racesim
+import racesim_basic
+import main_racesim_basic
+from concurrent import futures  # required for parallel computing
+from pathlib import Path
+import json
+import time
+import os
+
+"""
+.. description::
+This script determines the basic race strategies (without regarding traffic on the race track) of all participants of
+all given races in a batch, e.g. to fill the base_strategy entries of the VSE parameters (vse_pars) in the race
+parameter files. Every race parameter file is loaded only once, the basic race simulation parameters are derived for all
+participants of the race and the optimal 1, 2, ... stop strategies are determined using the DP (the fastest optimizer
+of the basic race simulation that works for all tire degradation models). The races are distributed across a process
+pool. The results are saved as results table (CSV file with one row per race, driver and number of pit stops) in
+racesim_basic/output. The strategy column is given in the base_strategy format of the VSE parameters.
+
+The script part required to run the batch is located at the bottom. Have a look there to insert the required user
+parameters.
+"""
+
+# ----------------------------------------------------------------------------------------------------------------------
+# MAIN FUNCTION --------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+def main(batch_opts: dict) -> list:
+    """
+    .. outputs::
+    :return results:    List with the rows of the results table [race_pars_file, driver initials, number of pit stops,
+                        race time, strategy in base_strategy format], sorted by race, driver and number of pit stops.
+    :rtype results:     list
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # INITIALIZATION ---------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # get repo path
+    repo_path = os.path.dirname(os.path.abspath(__file__))
+    pars_path = Path(repo_path) / "racesim" / "input" / "parameters"
+
+    # create output folder (if not existing)
+    output_path = os.path.join(repo_path, "racesim_basic", "output")
+    os.makedirs(output_path, exist_ok=True)
+
+    # determine race parameter files (all races if no files are given)
+    if batch_opts["race_pars_files"]:
+        race_pars_files = batch_opts["race_pars_files"]
+    else:
+        race_pars_files = sorted(x.name for x in pars_path.glob("pars_*.ini") if x.name != batch_opts["mcs_pars_file"])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # BATCH CALCULATION ------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    t_start = time.perf_counter()
+    results = []
+
+    # SINGLE PROCESS ---------------------------------------------------------------------------------------------------
+    if batch_opts["no_workers"] == 1:
+        for race_pars_file in race_pars_files:
+            results.extend(calc_base_strategies_race(race_pars_file=pars_path / race_pars_file,
+                                                     mcs_pars_file=pars_path / batch_opts["mcs_pars_file"],
+                                                     batch_opts=batch_opts))
+
+    # MULTIPLE PROCESSES -----------------------------------------------------------------------------------------------
+    else:
+        with futures.ProcessPoolExecutor(max_workers=batch_opts["no_workers"]) as executor:
+            job_queue = [executor.submit(calc_base_strategies_race,
+                                         pars_path / race_pars_file,
+                                         pars_path / batch_opts["mcs_pars_file"],
+                                         batch_opts)
+                         for race_pars_file in race_pars_files]
+
+            for job_handle in futures.as_completed(job_queue):
+                results.extend(job_handle.result())
+
+    results.sort(key=lambda x: (race_pars_files.index(x[0]), x[1], x[2]))
+
+    print("INFO: Calculated the basic strategies of %i races in %.3fs!"
+          % (len(race_pars_files), time.perf_counter() - t_start))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # SAVE RESULTS TABLE -----------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    results_file_path = os.path.join(output_path, "base_strategies_%s.csv" % time.strftime("%Y%m%d_%H%M%S"))
+
+    with open(results_file_path, 'w') as fh:
+        fh.write("race_pars_file;driver;no_pitstops;t_race;base_strategy\n")
+
+        for row in results:
+            fh.write("%s;%s;%i;%.3f;%s\n" % (row[0], row[1], row[2], row[3], json.dumps(row[4])))
+
+    print("INFO: Results table was saved to %s" % results_file_path)
+
+    return results
+
+
+def calc_base_strategies_race(race_pars_file: Path, mcs_pars_file: Path, batch_opts: dict) -> list:
+    """Load the race parameter file once and determine the optimal strategies for every number of pit stops of all
+    participants of the race. Races without at least two parameterized dry compounds are skipped. The returned rows are
+    described in main()."""
+
+    pars_in = racesim.src.import_pars.import_pars(use_print=False,
+                                                  use_vse=False,
+                                                  race_pars_file=race_pars_file,
+                                                  mcs_pars_file=mcs_pars_file)[0]
+
+    if len(pars_in['vse_pars']['param_dry_compounds']) < 2:
+        print("WARNING: Skipping %s since there are less than two dry compounds parameterized!" % race_pars_file.name)
+        return []
+
+    rows = []
+
+    for initials in pars_in['race_pars']['participants']:
+        # derive basic race simulation parameters for the current driver
+        pars_basic = racesim_basic.src.import_ext_params.convert_ext_params(pars_in=pars_in, driver_initials=initials)
+
+        # start on the tires of the real race (i.e. the tires used in qualifying) if they are a parameterized compound
+        start_stint = pars_in['vse_pars']['real_strategy'][initials][0]
+
+        if batch_opts["use_real_start_tires"] and start_stint[1] in pars_basic['available_compounds']:
+            start_compound = start_stint[1]
+            start_age = start_stint[2]
+        else:
+            start_compound = None
+            start_age = 0
+
+        sim_opts = {"min_no_pitstops": batch_opts["min_no_pitstops"],
+                    "max_no_pitstops": batch_opts["max_no_pitstops"],
+                    "start_compound": start_compound,
+                    "start_age": start_age,
+                    "enforce_diff_compounds": True,
+                    "use_qp": False,
+                    "use_dp": True,
+                    "fcy_phases": None,
+                    "no_fcy_scenarios": 0,
+                    "fcy_risk_alpha": None}
+
+        t_race_fastest = main_racesim_basic.main(sim_opts=sim_opts, pars_in=pars_basic)[0]
+
+        # convert strategy stints [stint_length, compound, stint_length, compound, ...] into the base_strategy format
+        # [[inlap, compound, tire age, refueling], ...]
+        for no_pitstops in sorted(t_race_fastest):
+            strategy_stints, t_race = t_race_fastest[no_pitstops][0]
+
+            base_strategy = []
+            inlap = 0
+
+            for idx_stint in range(no_pitstops + 1):
+                base_strategy.append([inlap,
+                                      strategy_stints[2 * idx_stint + 1],
+                                      start_age if idx_stint == 0 else 0,
+                                      0.0])
+                inlap += int(strategy_stints[2 * idx_stint])
+
+            rows.append([race_pars_file.name, initials, no_pitstops, float(t_race), base_strategy])
+
+    return rows
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# MAIN FUNCTION CALL ---------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # USER INPUT -------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # race_pars_files:          race parameter files (in racesim/input/parameters) -> empty list for all races
+    # mcs_pars_file:            MCS parameter file
+    # min_no_pitstops:          minimum number of pit stops
+    # max_no_pitstops:          maximum number of pit stops
+    # use_real_start_tires:     start on the compound and tire age of the real race (real_strategy in vse_pars),
+    #                           otherwise the start compound is free and the start tires are new
+    # no_workers:               number of workers (processes) the races are distributed across
+    batch_opts_ = {"race_pars_files": [],
+                   "mcs_pars_file": 'pars_mcs.ini',
+                   "min_no_pitstops": 1,
+                   "max_no_pitstops": 3,
+                   "use_real_start_tires": True,
+                   "no_workers": os.cpu_count()}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # BATCH CALL -------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    main(batch_opts=batch_opts_)
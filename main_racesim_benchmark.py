@@ -0,0 +1,501 @@
+import racesim
+from racesim.src.race import Race
+from racesim.src.race_handle import race_handle
+from concurrent import futures  # required for parallel computing
+from pathlib import Path
+import numpy as np
+import multiprocessing
+import tracemalloc
+import datetime
+import random
+import pickle
+import copy
+import json
+import time
+import os
+
+"""
+.. description::
+This file includes the benchmark suite of the race simulation. Race construction and simulate_race() are timed for a
+matrix of parameter files x use_prob_infl x create_rand_events x VSE types. For every case, the number of races per
+second, the cost per simulated lap and the peak memory (Python allocations during one race including the race object)
+are determined. The results are saved as JSON file and compared against a stored baseline such that engine
+optimizations can be proven and regressions are detected.
+
+The scaling benchmark (main_scaling) runs fixed MCS workloads on a process pool (as in main_racesim) for different
+numbers of workers, chunk sizes (races per job) and queue sizes (maximum number of jobs in the waiting queue). It
+records strong scaling (fixed total number of races) and weak scaling (fixed number of races per worker) curves, the
+IPC bytes per race, the worker idle time and the parent-side post-processing time (get_race_results()). The results are
+saved as JSON file such that the pool settings can be tuned per machine.
+
+The script part required to run the benchmarks is located at the bottom. Have a look there to insert the required user
+parameters.
+"""
+
+# ----------------------------------------------------------------------------------------------------------------------
+# MAIN FUNCTION --------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+
+def main(bench_opts: dict) -> tuple:
+    """
+    .. outputs::
+    :return results:        Dict with the benchmark results for every case, e.g. {"Spielberg_2019|False|False|none":
+                            {"races_per_s": ..., "t_construct_ms": ..., "t_lap_us": ..., "peak_mem_mb": ...}}
+    :rtype results:         dict
+    :return regressions:    List with the detected regressions in the form [case, metric, baseline value, value]
+    :rtype regressions:     list
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # INITIALIZATION ---------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # get repo path
+    repo_path = os.path.dirname(os.path.abspath(__file__))
+    pars_path = Path(repo_path) / "racesim" / "input" / "parameters"
+    vse_path = Path(repo_path) / "racesim" / "input" / "vse"
+
+    # create output folder (if not existing)
+    benchmark_path = os.path.join(repo_path, "racesim", "output", "benchmark")
+    os.makedirs(benchmark_path, exist_ok=True)
+
+    baseline_file_path = os.path.join(benchmark_path, bench_opts["baseline_file"])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # BENCHMARK --------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    results = {}
+
+    for race_pars_file in bench_opts["race_pars_files"]:
+        pars_in_file, _ = racesim.src.import_pars.import_pars(use_print=False,
+                                                              use_vse=False,
+                                                              race_pars_file=pars_path / race_pars_file,
+                                                              mcs_pars_file=pars_path / bench_opts["mcs_pars_file"])
+
+        for use_prob_infl in bench_opts["use_prob_infl"]:
+            for create_rand_events in bench_opts["create_rand_events"]:
+                for vse_type in bench_opts["vse_types"]:
+                    case = "%s_%i|%s|%s|%s" % (pars_in_file["track_pars"]["name"], pars_in_file["race_pars"]["season"],
+                                               use_prob_infl, create_rand_events, vse_type)
+
+                    # a case fails if the required VSE files are not available or the simulation raises an error
+                    try:
+                        pars_in, vse_paths = __prepare_pars(pars_in_file=pars_in_file,
+                                                            vse_type=vse_type,
+                                                            vse_path=vse_path)
+                        results[case] = __benchmark_case(pars_in=pars_in,
+                                                         vse_paths=vse_paths,
+                                                         use_prob_infl=use_prob_infl,
+                                                         create_rand_events=create_rand_events,
+                                                         no_races=bench_opts["no_races"],
+                                                         seed=bench_opts["seed"])
+                    except Exception as e:
+                        results[case] = {"error": "%s: %s" % (type(e).__name__, e)}
+
+                    __print_case(case=case, result=results[case])
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # POSTPROCESSING ---------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # save results
+    cur_time_str = time.strftime("%Y%m%d_%H%M%S")
+    results_file_path = os.path.join(benchmark_path, "benchmark_%s.json" % cur_time_str)
+
+    with open(results_file_path, 'w') as fh:
+        json.dump({"date": datetime.datetime.now().isoformat(), "bench_opts": bench_opts, "results": results},
+                  fh, indent=4)
+
+    print("INFO: Benchmark results were saved to %s" % results_file_path)
+
+    # compare against baseline
+    regressions = []
+
+    if os.path.isfile(baseline_file_path):
+        with open(baseline_file_path, 'r') as fh:
+            baseline = json.load(fh)["results"]
+
+        regressions = compare_to_baseline(results=results, baseline=baseline, thresholds=bench_opts["thresholds"])
+
+        for regression in regressions:
+            print("WARNING: Regression in case %s: %s changed from %.3f to %.3f!" % tuple(regression))
+
+        if not regressions:
+            print("RESULT: No regressions compared to the baseline!")
+
+    else:
+        print("INFO: No baseline available for comparison!")
+
+    # save results as new baseline if indicated
+    if bench_opts["save_baseline"]:
+        with open(baseline_file_path, 'w') as fh:
+            json.dump({"date": datetime.datetime.now().isoformat(), "bench_opts": bench_opts, "results": results},
+                      fh, indent=4)
+
+        print("INFO: Results were saved as new baseline!")
+
+    return results, regressions
+
+
+def main_scaling(scale_opts: dict) -> list:
+    """
+    .. description::
+    Runs the MCS workload for every combination of scaling type ('strong' and 'weak'), chunk size, queue size and
+    number of workers (see scale_opts in the script part at the bottom). Strong scaling keeps the total number of races
+    fixed (no_races_strong), weak scaling the number of races per worker (no_races_weak_per_worker). The speedup is the
+    ratio of the throughput (races per second) to the one of the reference configuration. The efficiency is the speedup
+    divided by the relative number of workers (strong) or the ratio of the wall times (weak), i.e. 1.0 is ideal in both
+    cases. A result line is printed per configuration. All results are saved together with the CPU count and the options
+    to racesim/output/benchmark/scaling_<date>_<time>.json.
+
+    .. outputs::
+    :return results:    List with a dict per measured configuration (see __run_mcs_workload()) with the additional
+                        entries "scaling" ('strong' or 'weak'), "speedup" and "efficiency" (both with regard to the
+                        configuration with the lowest number of workers and the same chunk and queue size).
+    :rtype results:     list
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # INITIALIZATION ---------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # get repo path
+    repo_path = os.path.dirname(os.path.abspath(__file__))
+    pars_path = Path(repo_path) / "racesim" / "input" / "parameters"
+
+    # create output folder (if not existing)
+    benchmark_path = os.path.join(repo_path, "racesim", "output", "benchmark")
+    os.makedirs(benchmark_path, exist_ok=True)
+
+    pars_in, vse_paths = racesim.src.import_pars.import_pars(use_print=False,
+                                                             use_vse=scale_opts["use_vse"],
+                                                             race_pars_file=pars_path / scale_opts["race_pars_file"],
+                                                             mcs_pars_file=pars_path / scale_opts["mcs_pars_file"],
+                                                             vse_path=Path(repo_path) / "racesim" / "input" / "vse")
+
+    no_workers_list = scale_opts["no_workers"] if scale_opts["no_workers"] \
+        else list(range(1, multiprocessing.cpu_count() + 1))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # BENCHMARK --------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    results = []
+
+    for scaling in ["strong", "weak"]:
+        for chunk_size in scale_opts["chunk_sizes"]:
+            for max_no_concurrent_jobs in scale_opts["max_no_concurrent_jobs"]:
+                results_ref = None
+
+                for no_workers in no_workers_list:
+                    no_races = scale_opts["no_races_strong"] if scaling == "strong" \
+                        else scale_opts["no_races_weak_per_worker"] * no_workers
+
+                    result = __run_mcs_workload(pars_in=pars_in,
+                                                vse_paths=vse_paths,
+                                                use_prob_infl=scale_opts["use_prob_infl"],
+                                                create_rand_events=scale_opts["create_rand_events"],
+                                                no_races=no_races,
+                                                no_workers=no_workers,
+                                                chunk_size=chunk_size,
+                                                max_no_concurrent_jobs=max_no_concurrent_jobs)
+
+                    if results_ref is None:
+                        results_ref = result
+
+                    # strong scaling: speedup of the wall time, weak scaling: speedup of the throughput
+                    result["scaling"] = scaling
+                    result["speedup"] = result["races_per_s"] / results_ref["races_per_s"]
+                    result["efficiency"] = result["speedup"] * results_ref["no_workers"] / no_workers \
+                        if scaling == "strong" else results_ref["t_wall"] / result["t_wall"]
+                    results.append(result)
+
+                    print("RESULT: %s scaling, %2i workers, chunk size %3i, queue size %4i: %8.2f races/s, speedup"
+                          " %5.2f, efficiency %4.2f, %8.0f IPC bytes per race, worker idle %5.1f%%, post-processing"
+                          " %6.3fs"
+                          % (scaling, no_workers, chunk_size, max_no_concurrent_jobs, result["races_per_s"],
+                             result["speedup"], result["efficiency"], result["ipc_bytes_per_race"],
+                             result["idle_fraction"] * 100.0, result["t_postproc"]))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # POSTPROCESSING ---------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    cur_time_str = time.strftime("%Y%m%d_%H%M%S")
+    results_file_path = os.path.join(benchmark_path, "scaling_%s.json" % cur_time_str)
+
+    with open(results_file_path, 'w') as fh:
+        json.dump({"date": datetime.datetime.now().isoformat(),
+                   "cpu_count": multiprocessing.cpu_count(),
+                   "scale_opts": scale_opts,
+                   "results": results},
+                  fh, indent=4)
+
+    print("INFO: Scaling benchmark results were saved to %s" % results_file_path)
+
+    return results
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# FUNCTIONS ------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+def compare_to_baseline(results: dict, baseline: dict, thresholds: dict) -> list:
+    """Compare the results against the baseline. thresholds contains the allowed relative deterioration per metric,
+    e.g. {"races_per_s": 0.1} (races per second may drop by 10%). Higher is better for races_per_s, lower is better for
+    the remaining metrics. Cases that are not available (or failed) in one of both are skipped."""
+
+    regressions = []
+
+    for case in results:
+        if case not in baseline or "error" in results[case] or "error" in baseline[case]:
+            continue
+
+        for metric, threshold in thresholds.items():
+            val = results[case][metric]
+            val_base = baseline[case][metric]
+
+            if metric == "races_per_s":
+                regression = val < val_base * (1.0 - threshold)
+            else:
+                regression = val > val_base * (1.0 + threshold)
+
+            if regression:
+                regressions.append([case, metric, val_base, val])
+
+    return regressions
+
+
+def __prepare_pars(pars_in_file: dict, vse_type: str, vse_path: Path) -> tuple:
+    """Set the VSE type for every driver (the VSE is not used if vse_type is 'none')."""
+
+    pars_in = copy.deepcopy(pars_in_file)
+
+    if vse_type == "none":
+        return pars_in, None
+
+    for initials in pars_in["vse_pars"]["vse_type"]:
+        pars_in["vse_pars"]["vse_type"][initials] = vse_type
+
+    vse_paths = racesim.src.import_pars.get_vse_paths(pars_in=pars_in, vse_path=vse_path)
+
+    return pars_in, vse_paths
+
+
+def __create_race(pars_in: dict, vse_paths: dict, use_prob_infl: bool, create_rand_events: bool) -> Race:
+    return Race(race_pars=pars_in["race_pars"],
+                driver_pars=pars_in["driver_pars"],
+                car_pars=pars_in["car_pars"],
+                tireset_pars=pars_in["tireset_pars"],
+                track_pars=pars_in["track_pars"],
+                vse_pars=pars_in["vse_pars"],
+                vse_paths=vse_paths,
+                use_prob_infl=use_prob_infl,
+                create_rand_events=create_rand_events,
+                monte_carlo_pars=pars_in["monte_carlo_pars"],
+                event_pars=pars_in["event_pars"])
+
+
+def __benchmark_case(pars_in: dict,
+                     vse_paths: dict,
+                     use_prob_infl: bool,
+                     create_rand_events: bool,
+                     no_races: int,
+                     seed: int) -> dict:
+
+    # seed random number generators such that every case simulates the same races in every benchmark run
+    random.seed(seed)
+    np.random.seed(seed)
+
+    # warm-up race (e.g. loading of the VSE models, first numpy calls)
+    race = __create_race(pars_in=pars_in, vse_paths=vse_paths, use_prob_infl=use_prob_infl,
+                         create_rand_events=create_rand_events)
+    race.simulate_race()
+
+    # timing -----------------------------------------------------------------------------------------------------------
+    t_construct = 0.0
+    t_simulate = 0.0
+    no_laps = 0
+
+    for _ in range(no_races):
+        t_start = time.perf_counter()
+        race = __create_race(pars_in=pars_in, vse_paths=vse_paths, use_prob_infl=use_prob_infl,
+                             create_rand_events=create_rand_events)
+        t_mid = time.perf_counter()
+        race.simulate_race()
+        t_end = time.perf_counter()
+
+        t_construct += t_mid - t_start
+        t_simulate += t_end - t_mid
+        no_laps += race.cur_lap
+
+    # peak memory (separate race since tracemalloc slows down the simulation) ------------------------------------------
+    tracemalloc.start()
+    race = __create_race(pars_in=pars_in, vse_paths=vse_paths, use_prob_infl=use_prob_infl,
+                         create_rand_events=create_rand_events)
+    race.simulate_race()
+    peak_mem = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"races_per_s": no_races / (t_construct + t_simulate),
+            "t_construct_ms": t_construct / no_races * 1000.0,
+            "t_lap_us": t_simulate / no_laps * 1e6,
+            "peak_mem_mb": peak_mem / 1024.0 ** 2}
+
+
+def __run_mcs_workload(pars_in: dict,
+                       vse_paths: dict,
+                       use_prob_infl: bool,
+                       create_rand_events: bool,
+                       no_races: int,
+                       no_workers: int,
+                       chunk_size: int,
+                       max_no_concurrent_jobs: int) -> dict:
+    """Simulate the given number of races on a process pool in the same way as main_racesim does (but with chunks of
+    races per job). Invalid races are not repeated such that every configuration simulates the same number of races."""
+
+    t_busy_workers = 0.0    # summed time the workers spent within the jobs
+    t_postproc = 0.0        # time the parent spent in get_race_results()
+    ipc_bytes = 0           # pickled size of the job arguments and the returned races
+    no_races_left = no_races
+
+    with futures.ProcessPoolExecutor(max_workers=no_workers) as executor:
+        # start worker processes before starting the time measurement
+        for job_handle in [executor.submit(time.sleep, 0.1) for _ in range(no_workers)]:
+            job_handle.result()
+
+        t_start = time.perf_counter()
+
+        while no_races_left > 0:
+            job_queue = []
+
+            while len(job_queue) <= max_no_concurrent_jobs and no_races_left > 0:
+                no_races_job = min(chunk_size, no_races_left)
+                job_args = (pars_in, use_prob_infl, create_rand_events, vse_paths, no_races_job)
+                ipc_bytes += len(pickle.dumps(job_args, protocol=pickle.HIGHEST_PROTOCOL))
+                job_queue.append(executor.submit(_simulate_chunk, *job_args))
+                no_races_left -= no_races_job
+
+            for job_handle in futures.as_completed(job_queue):
+                races, t_busy, no_bytes = job_handle.result()
+                t_busy_workers += t_busy
+                ipc_bytes += no_bytes
+
+                t_postproc_start = time.perf_counter()
+                for race in races:
+                    if race.result_status == 0:
+                        race.get_race_results()
+                t_postproc += time.perf_counter() - t_postproc_start
+
+        t_wall = time.perf_counter() - t_start
+
+    return {"no_workers": no_workers,
+            "chunk_size": chunk_size,
+            "max_no_concurrent_jobs": max_no_concurrent_jobs,
+            "no_races": no_races,
+            "t_wall": t_wall,
+            "races_per_s": no_races / t_wall,
+            "ipc_bytes_per_race": ipc_bytes / no_races,
+            "t_idle_workers": no_workers * t_wall - t_busy_workers,
+            "idle_fraction": max(1.0 - t_busy_workers / (no_workers * t_wall), 0.0),
+            "t_postproc": t_postproc}
+
+
+def _simulate_chunk(pars_in: dict,
+                    use_prob_infl: bool,
+                    create_rand_events: bool,
+                    vse_paths: dict,
+                    no_races: int) -> tuple:
+    """Worker job: simulate a chunk of races, return them together with the busy time and their pickled size."""
+
+    t_start = time.perf_counter()
+    races = [race_handle(pars_in=pars_in,
+                         use_prob_infl=use_prob_infl,
+                         create_rand_events=create_rand_events,
+                         vse_paths=vse_paths) for _ in range(no_races)]
+    t_busy = time.perf_counter() - t_start
+
+    return races, t_busy, len(pickle.dumps(races, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def __print_case(case: str, result: dict) -> None:
+    if "error" in result:
+        print("RESULT: %-50s failed (%s)" % (case, result["error"]))
+    else:
+        print("RESULT: %-50s %8.2f races/s, construction %7.2fms, %8.1fus per lap, peak memory %6.2fMB"
+              % (case, result["races_per_s"], result["t_construct_ms"], result["t_lap_us"], result["peak_mem_mb"]))
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# MAIN FUNCTION CALL ---------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+if __name__ == '__main__':
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # USER INPUT -------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # set benchmark mode ('engine' -> benchmark suite of the race simulation, 'scaling' -> MCS scaling benchmark)
+    mode_ = 'engine'
+
+    # set benchmark options (engine)
+    # race_pars_files:      race parameter files (in racesim/input/parameters) that are benchmarked
+    # mcs_pars_file:        MCS parameter file
+    # use_prob_infl:        values of use_prob_infl that are benchmarked
+    # create_rand_events:   values of create_rand_events that are benchmarked
+    # vse_types:            VSE types that are benchmarked ('none' -> VSE not used, otherwise the VSE type is set for
+    #                       every driver: 'basestrategy', 'realstrategy', 'supervised', 'reinforcement')
+    # no_races:             number of timed races per case
+    # seed:                 seed of the random number generators (set at the beginning of every case)
+    # baseline_file:        baseline file name in racesim/output/benchmark
+    # save_baseline:        set if the results should be saved as new baseline
+    # thresholds:           allowed relative deterioration per metric before a regression is reported
+    bench_opts_ = {"race_pars_files": ['pars_Spielberg_2019.ini', 'pars_Shanghai_2019.ini', 'pars_MonteCarlo_2019.ini'],
+                   "mcs_pars_file": 'pars_mcs.ini',
+                   "use_prob_infl": [False, True],
+                   "create_rand_events": [False, True],
+                   "vse_types": ['none', 'basestrategy', 'realstrategy', 'supervised', 'reinforcement'],
+                   "no_races": 20,
+                   "seed": 0,
+                   "baseline_file": 'benchmark_baseline.json',
+                   "save_baseline": False,
+                   "thresholds": {"races_per_s": 0.10,
+                                  "t_construct_ms": 0.20,
+                                  "t_lap_us": 0.10,
+                                  "peak_mem_mb": 0.10}}
+
+    # set benchmark options (scaling)
+    # race_pars_file:               race parameter file (in racesim/input/parameters) used for the MCS workload
+    # mcs_pars_file:                MCS parameter file
+    # use_prob_infl:                activates probabilistic influences within the race simulation
+    # create_rand_events:           activates the random creation of FCY phases and retirements
+    # use_vse:                      determines if the VSE is used (VSE types as defined in the parameter file)
+    # no_workers:                   list with the numbers of workers to benchmark (empty list -> 1 to all cores)
+    # chunk_sizes:                  list with the numbers of races simulated per job
+    # max_no_concurrent_jobs:       list with the maximum numbers of jobs in the waiting queue (main_racesim: 200)
+    # no_races_strong:              total number of races for the strong scaling curves
+    # no_races_weak_per_worker:     number of races per worker for the weak scaling curves
+    scale_opts_ = {"race_pars_file": 'pars_Spielberg_2019.ini',
+                   "mcs_pars_file": 'pars_mcs.ini',
+                   "use_prob_infl": True,
+                   "create_rand_events": True,
+                   "use_vse": False,
+                   "no_workers": [],
+                   "chunk_sizes": [1, 10],
+                   "max_no_concurrent_jobs": [10, 200],
+                   "no_races_strong": 400,
+                   "no_races_weak_per_worker": 50}
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # BENCHMARK CALL ---------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    if mode_ == 'engine':
+        main(bench_opts=bench_opts_)
+    elif mode_ == 'scaling':
+        main_scaling(scale_opts=scale_opts_)
+    else:
+        raise RuntimeError("Unknown benchmark mode!")
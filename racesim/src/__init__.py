@@ -6,6 +6,10 @@ import racesim.src.race
 import racesim.src.race_reinftrain
 import racesim.src.tireset
 import racesim.src.track
+import racesim.src.timing
+import racesim.src.result_cache
+import racesim.src.presim_cache
+import racesim.src.result_store
 import racesim.src.race_handle
 import racesim.src.mcs_analysis
 import racesim.src.vse
@@ -15,3 +19,6 @@ import racesim.src.vse_basestrategy
 import racesim.src.vse_realstrategy
 import racesim.src.import_pars
 import racesim.src.check_pars
+import racesim.src.strategy_advisor
+import racesim.src.opt_strategy_sh
+import racesim.src.race_variants
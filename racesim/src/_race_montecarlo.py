@@ -2,6 +2,7 @@ import numpy as np
 import random
 import math
 import racesim_basic.src.calc_racetimes_basic
+import racesim.src.presim_cache
 
 
 class MonteCarlo(object):
@@ -33,7 +34,10 @@ class MonteCarlo(object):
     The race progress is within the range [0.0, tot_no_laps], where 0.0 corresponds to the start of the first lap.
     """
 
-    def create_random_events(self) -> tuple:
+    def create_random_events(self, prog_min: float = 0.0) -> tuple:
+        """prog_min can be set to limit the created events to the remaining race progress, e.g. when simulating the
+        remaining laps of an already (partly) simulated race. Events starting before prog_min are removed after the
+        creation, drivers that already retired are neither chosen for accidents nor for failures."""
 
         # initialization
         fcy_data = {"phases": [],
@@ -109,13 +113,14 @@ class MonteCarlo(object):
 
             for idx, cur_driver in enumerate(self.drivers_list):
                 choices.append(idx)
-                probs.append(cur_driver.p_accident)
+                probs.append(cur_driver.p_accident if self.bool_driving[self.cur_lap, idx] else 0.0)
 
             # determine one driver per SC phase involved into the accident
             for cur_phase in fcy_data["phases"]:
                 # check if there are drivers without an retirement left for the current phase (if we simulate only a
                 # small amount of drivers) and break otherwise
-                if all(True if x is not None else False for x in retire_data["retirements"]):
+                if all(True if x is not None or not self.bool_driving[self.cur_lap, idx] else False
+                       for idx, x in enumerate(retire_data["retirements"])):
                     break
 
                 # chose driver until a "free" driver is selected (who was not already selected for another phase)
@@ -136,8 +141,8 @@ class MonteCarlo(object):
 
         for idx, cur_driver in enumerate(self.drivers_list):
 
-            # if current driver is already involved in an accident continue to next driver
-            if retire_data["retirements"][idx] is not None:
+            # if current driver is already involved in an accident (or retired already) continue to next driver
+            if retire_data["retirements"][idx] is not None or not self.bool_driving[self.cur_lap, idx]:
                 continue
 
             # determine failure ----------------------------------------------------------------------------------------
@@ -193,6 +198,12 @@ class MonteCarlo(object):
         # sort FCY phase list by start race progress when finished
         fcy_data["phases"].sort(key=lambda x: x[0])
 
+        # remove events that lie before the given minimum race progress
+        if prog_min > 0.0:
+            fcy_data["phases"] = [x for x in fcy_data["phases"] if x[0] >= prog_min]
+            retire_data["retirements"] = [x if x is not None and x >= prog_min else None
+                                          for x in retire_data["retirements"]]
+
         return fcy_data, retire_data
 
     def check_fcyphase_intersection(self, fcy_data: dict) -> bool:
@@ -241,26 +252,195 @@ class MonteCarlo(object):
         if presim_driver is None:
             raise RuntimeError('Reference driver was not found, check driver initials!')
 
-        # determine basic strategy if VSE is used
-        if self.vse is not None:
-            strategy_info_tmp = \
-                self.vse.determine_basic_strategy(driver=presim_driver,
-                                                  tot_no_laps=self.race_pars["tot_no_laps"],
-                                                  fcy_phases=self.fcy_data["phases"],
-                                                  location=self.track.name,
-                                                  t_pit_tirechange_min=self.track.t_pit_tirechange_min,
-                                                  t_pitdrive_inlap=self.track.t_pitdrive_inlap,
-                                                  t_pitdrive_outlap=self.track.t_pitdrive_outlap,
-                                                  t_pitdrive_inlap_fcy=self.track.t_pitdrive_inlap_fcy,
-                                                  t_pitdrive_outlap_fcy=self.track.t_pitdrive_outlap_fcy,
-                                                  t_pitdrive_inlap_sc=self.track.t_pitdrive_inlap_sc,
-                                                  t_pitdrive_outlap_sc=self.track.t_pitdrive_outlap_sc,
-                                                  mult_tiredeg_fcy=presim_driver.tireset_pars["mult_tiredeg_fcy"],
-                                                  mult_tiredeg_sc=presim_driver.tireset_pars["mult_tiredeg_sc"])
+        # check pre-simulation cache (the results only depend on the parameters used below and the FCY phases)
+        presim_pars = {"tot_no_laps": self.race_pars["tot_no_laps"],
+                       "track": [self.track.name, self.track.t_q, self.track.t_gap_racepace,
+                                 self.track.t_lap_sens_mass, self.track.t_pit_tirechange_min,
+                                 self.track.t_pitdrive_inlap, self.track.t_pitdrive_outlap,
+                                 self.track.t_pitdrive_inlap_fcy, self.track.t_pitdrive_outlap_fcy,
+                                 self.track.t_pitdrive_inlap_sc, self.track.t_pitdrive_outlap_sc,
+                                 self.track.pits_aft_finishline, self.track.t_loss_pergridpos,
+                                 self.track.t_loss_firstlap, self.track.t_lap_sc, self.track.t_lap_fcy],
+                       "driver": [presim_driver.t_driver, presim_driver.p_grid, presim_driver.strategy_info,
+                                  presim_driver.tireset_pars],
+                       "car": [presim_driver.car.drivetype, presim_driver.car.t_car,
+                               presim_driver.car.t_pit_tirechange_add, presim_driver.car.m_fuel,
+                               presim_driver.car.b_fuel_perlap, presim_driver.car.t_pit_refuel_perkg,
+                               presim_driver.car.t_pit_charge_perkwh],
+                       "vse_pars": self.vse.vse_pars if self.vse is not None else None}
+
+        presim_cache_key = racesim.src.presim_cache.\
+            get_cache_key(presim_pars=presim_pars,
+                          ref_driver=presim_driver.initials,
+                          fcy_phases=self.fcy_data["phases"],
+                          vse_paths=self.vse.vse_paths if self.vse is not None else None)
+        presim_results = racesim.src.presim_cache.load_presim(cache_key=presim_cache_key)
+
+        # the cached results could have been determined for slightly different FCY phases (see presim_cache) -> the
+        # basic strategy is reused in any case, the converted FCY phases only if the phases are exactly equal
+        fcy_phases_exact = [list(x[:3]) for x in self.fcy_data["phases"]]
+
+        if presim_results is not None:
+            fcy_phases_cached, t_race_lapwise_tmp, fcy_phases_tmp, strategy_info_tmp = presim_results
+
+        else:
+            fcy_phases_cached = None
+
+            # determine basic strategy if VSE is used
+            if self.vse is not None:
+                strategy_info_tmp = \
+                    self.vse.determine_basic_strategy(driver=presim_driver,
+                                                      tot_no_laps=self.race_pars["tot_no_laps"],
+                                                      fcy_phases=self.fcy_data["phases"],
+                                                      location=self.track.name,
+                                                      t_pit_tirechange_min=self.track.t_pit_tirechange_min,
+                                                      t_pitdrive_inlap=self.track.t_pitdrive_inlap,
+                                                      t_pitdrive_outlap=self.track.t_pitdrive_outlap,
+                                                      t_pitdrive_inlap_fcy=self.track.t_pitdrive_inlap_fcy,
+                                                      t_pitdrive_outlap_fcy=self.track.t_pitdrive_outlap_fcy,
+                                                      t_pitdrive_inlap_sc=self.track.t_pitdrive_inlap_sc,
+                                                      t_pitdrive_outlap_sc=self.track.t_pitdrive_outlap_sc,
+                                                      mult_tiredeg_fcy=presim_driver.tireset_pars["mult_tiredeg_fcy"],
+                                                      mult_tiredeg_sc=presim_driver.tireset_pars["mult_tiredeg_sc"])
+            else:
+                strategy_info_tmp = presim_driver.strategy_info
+
+        if fcy_phases_cached != fcy_phases_exact:
+            # perform pre simulation
+            t_race_lapwise_tmp, fcy_phases_tmp = racesim_basic.src.calc_racetimes_basic.\
+                calc_racetimes_basic(t_base=(self.track.t_q + self.track.t_gap_racepace + presim_driver.t_driver
+                                             + presim_driver.car.t_car),
+                                     tot_no_laps=self.race_pars["tot_no_laps"],
+                                     t_lap_sens_mass=self.track.t_lap_sens_mass,
+                                     t_pitdrive_inlap=self.track.t_pitdrive_inlap,
+                                     t_pitdrive_outlap=self.track.t_pitdrive_outlap,
+                                     t_pitdrive_inlap_fcy=self.track.t_pitdrive_inlap_fcy,
+                                     t_pitdrive_outlap_fcy=self.track.t_pitdrive_outlap_fcy,
+                                     t_pitdrive_inlap_sc=self.track.t_pitdrive_inlap_sc,
+                                     t_pitdrive_outlap_sc=self.track.t_pitdrive_outlap_sc,
+                                     t_pit_tirechange=(self.track.t_pit_tirechange_min
+                                                       + presim_driver.car.t_pit_tirechange_add),
+                                     pits_aft_finishline=self.track.pits_aft_finishline,
+                                     tire_pars=presim_driver.tireset_pars,
+                                     p_grid=presim_driver.p_grid,
+                                     t_loss_pergridpos=self.track.t_loss_pergridpos,
+                                     t_loss_firstlap=self.track.t_loss_firstlap,
+                                     strategy=strategy_info_tmp,
+                                     drivetype=presim_driver.car.drivetype,
+                                     m_fuel_init=presim_driver.car.m_fuel,
+                                     b_fuel_perlap=presim_driver.car.b_fuel_perlap,
+                                     t_pit_refuel_perkg=presim_driver.car.t_pit_refuel_perkg,
+                                     t_pit_charge_perkwh=presim_driver.car.t_pit_charge_perkwh,
+                                     fcy_phases=self.fcy_data["phases"],
+                                     t_lap_sc=self.track.t_lap_sc,
+                                     t_lap_fcy=self.track.t_lap_fcy)
+
+            racesim.src.presim_cache.save_presim(cache_key=presim_cache_key,
+                                                 presim_results=(fcy_phases_exact, t_race_lapwise_tmp,
+                                                                 fcy_phases_tmp, strategy_info_tmp))
+
+        t_race_lapwise_tmp = np.insert(t_race_lapwise_tmp, 0, 0.0)  # add race time 0.0s for lap 0
+
+        # replace retirements race progress information by approximate race times
+        if self.retire_data["domain"] == 'progress':
+            for idx_retirement in range(len(self.retire_data["retirements"])):
+                # continue to next if current driver's retirement is None
+                if self.retire_data["retirements"][idx_retirement] is None:
+                    continue
+
+                # check if current retirement race progress matches any of the FCY phases
+                idx_fcyphase = next((i for i, x in enumerate(self.fcy_data["phases"])
+                                     if math.isclose(x[0], self.retire_data["retirements"][idx_retirement])), None)
+
+                if idx_fcyphase is not None:
+                    # CASE 1: retirement matches a FCY phase -> replace race progress by according race time
+                    self.retire_data["retirements"][idx_retirement] = fcy_phases_tmp[idx_fcyphase][0]
+
+                else:
+                    # CASE 2: retirement was created without a FCY phase -> interpolate according race time
+                    frac_tmp, lap_tmp = math.modf(self.retire_data["retirements"][idx_retirement])
+                    lap_tmp = int(lap_tmp)
+
+                    self.retire_data["retirements"][idx_retirement] = \
+                        (t_race_lapwise_tmp[lap_tmp]
+                         + frac_tmp * (t_race_lapwise_tmp[lap_tmp + 1] - t_race_lapwise_tmp[lap_tmp]))
+
+            self.retire_data["domain"] = 'time'
+            self.update_retirements_array()
+
+        # replace FCY phase race progress information by approximate race times
+        self.fcy_data["phases"] = fcy_phases_tmp
+        self.fcy_data["domain"] = 'time'
+
+        return t_race_lapwise_tmp[-1], strategy_info_tmp
+
+    def resample_remaining_events(self) -> None:
+        """This method replaces the pending FCY phases (i.e. phases that were not yet activated for any driver) and
+        retirements (i.e. retirements of drivers that are still driving) of a partly simulated race by random events
+        created for the remaining race progress. It is used to simulate the remaining laps of a given race state. New
+        events are converted into the time domain on the basis of a pre-simulation of the reference driver that is
+        shifted to his current race time."""
+
+        # --------------------------------------------------------------------------------------------------------------
+        # REMOVE PENDING EVENTS ----------------------------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
+
+        idx_first_pending = int(np.max(self.fcy_handling["idxs_next_phase"]))
+        del self.fcy_data["phases"][idx_first_pending:]
+        self.update_fcy_phase_arrays()
+
+        if not self.fcy_data["phases"]:
+            # the race was started without FCY phases -> the domain can be set freely
+            self.fcy_data["domain"] = 'time'
+
+        for idx_driver in range(self.no_drivers):
+            if self.bool_driving[self.cur_lap, idx_driver]:
+                self.retire_data["retirements"][idx_driver] = None
+
+        self.update_retirements_array()
+
+        # --------------------------------------------------------------------------------------------------------------
+        # CREATE NEW EVENTS --------------------------------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
+
+        fcy_data_tmp, retire_data_tmp = self.create_random_events(prog_min=float(self.cur_lap))
+
+        if not fcy_data_tmp["phases"] and all(True if x is None else False for x in retire_data_tmp["retirements"]):
+            return
+
+        # --------------------------------------------------------------------------------------------------------------
+        # CONVERT NEW EVENTS INTO THE TIME DOMAIN ----------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
+
+        # find pre simulation driver in drivers_list, use current leader if he retired already
+        idx_presim_driver = next((idx for idx, cur_driver in enumerate(self.drivers_list)
+                                  if cur_driver.initials == self.monte_carlo_pars['ref_driver']), None)
+
+        if idx_presim_driver is None:
+            raise RuntimeError('Reference driver was not found, check driver initials!')
+
+        if not self.bool_driving[self.cur_lap, idx_presim_driver]:
+            idx_presim_driver = int(np.argmax(self.positions[self.cur_lap] == 1))
+
+        presim_driver = self.drivers_list[idx_presim_driver]
+
+        # use the strategy of the reference driver for the whole race (the strategy info only contains past pit stops
+        # in case of the VSE)
+        if self.presim_info["base_strategy_vse"] is not None:
+            strategy_info_tmp = self.presim_info["base_strategy_vse"]
+        elif self.vse is not None:
+            strategy_info_tmp = self.vse.vse_pars["base_strategy"][presim_driver.initials]
         else:
             strategy_info_tmp = presim_driver.strategy_info
 
-        # perform pre simulation
+        # reconstruct initial fuel mass of the pre simulation driver (approximately, since fuel consumption is reduced
+        # during FCY phases)
+        if presim_driver.car.drivetype == 'combustion':
+            m_fuel_init_tmp = presim_driver.car.m_fuel + self.cur_lap * presim_driver.car.b_fuel_perlap
+        else:
+            m_fuel_init_tmp = presim_driver.car.m_fuel
+
+        # perform pre simulation (FCY phases are copied since they might be modified within the function)
         t_race_lapwise_tmp, fcy_phases_tmp = racesim_basic.src.calc_racetimes_basic.\
             calc_racetimes_basic(t_base=(self.track.t_q + self.track.t_gap_racepace + presim_driver.t_driver
                                          + presim_driver.car.t_car),
@@ -281,157 +461,221 @@ class MonteCarlo(object):
                                  t_loss_firstlap=self.track.t_loss_firstlap,
                                  strategy=strategy_info_tmp,
                                  drivetype=presim_driver.car.drivetype,
-                                 m_fuel_init=presim_driver.car.m_fuel,
+                                 m_fuel_init=m_fuel_init_tmp,
                                  b_fuel_perlap=presim_driver.car.b_fuel_perlap,
                                  t_pit_refuel_perkg=presim_driver.car.t_pit_refuel_perkg,
                                  t_pit_charge_perkwh=presim_driver.car.t_pit_charge_perkwh,
-                                 fcy_phases=self.fcy_data["phases"],
+                                 fcy_phases=[list(x) for x in fcy_data_tmp["phases"]],
                                  t_lap_sc=self.track.t_lap_sc,
                                  t_lap_fcy=self.track.t_lap_fcy)
 
         t_race_lapwise_tmp = np.insert(t_race_lapwise_tmp, 0, 0.0)  # add race time 0.0s for lap 0
 
-        # replace retirements race progress information by approximate race times
-        if self.retire_data["domain"] == 'progress':
-            for idx_retirement in range(len(self.retire_data["retirements"])):
-                # continue to next if current driver's retirement is None
-                if self.retire_data["retirements"][idx_retirement] is None:
-                    continue
+        # shift pre-simulation such that it matches the current race time of the pre simulation driver
+        t_offset = self.racetimes[self.cur_lap, idx_presim_driver] - t_race_lapwise_tmp[self.cur_lap]
+        t_race_lapwise_tmp += t_offset
 
-                # check if current retirement race progress matches any of the FCY phases
-                idx_fcyphase = next((i for i, x in enumerate(self.fcy_data["phases"])
-                                     if math.isclose(x[0], self.retire_data["retirements"][idx_retirement])), None)
+        # add new FCY phases if they do not intersect with the remaining phases of the race
+        for idx_fcyphase, cur_phase in enumerate(fcy_phases_tmp):
+            cur_phase[0] += t_offset
+            cur_phase[1] += t_offset
 
-                if idx_fcyphase is not None:
-                    # CASE 1: retirement matches a FCY phase -> replace race progress by according race time
-                    self.retire_data["retirements"][idx_retirement] = fcy_phases_tmp[idx_fcyphase][0]
+            self.fcy_data["phases"].append(cur_phase)
 
-                else:
-                    # CASE 2: retirement was created without a FCY phase -> interpolate according race time
-                    frac_tmp, lap_tmp = math.modf(self.retire_data["retirements"][idx_retirement])
-                    lap_tmp = int(lap_tmp)
+            if self.check_fcyphase_intersection(fcy_data=self.fcy_data):
+                del self.fcy_data["phases"][-1]
 
-                    self.retire_data["retirements"][idx_retirement] = \
-                        (t_race_lapwise_tmp[lap_tmp]
-                         + frac_tmp * (t_race_lapwise_tmp[lap_tmp + 1] - t_race_lapwise_tmp[lap_tmp]))
+                # retirement belonging to an SC phase (accident) is removed as well
+                for idx_driver, cur_retirement in enumerate(retire_data_tmp["retirements"]):
+                    if cur_retirement is not None \
+                            and math.isclose(cur_retirement, fcy_data_tmp["phases"][idx_fcyphase][0]):
+                        retire_data_tmp["retirements"][idx_driver] = None
 
-            self.retire_data["domain"] = 'time'
+        # set new retirements (in the progress domain they can be used directly)
+        for idx_driver, cur_retirement in enumerate(retire_data_tmp["retirements"]):
+            if cur_retirement is None:
+                continue
 
-        # replace FCY phase race progress information by approximate race times
-        self.fcy_data["phases"] = fcy_phases_tmp
-        self.fcy_data["domain"] = 'time'
+            if self.retire_data["domain"] == 'progress':
+                self.retire_data["retirements"][idx_driver] = cur_retirement
+                continue
 
-        return t_race_lapwise_tmp[-1], strategy_info_tmp
+            # check if current retirement race progress matches any of the FCY phases
+            idx_fcyphase = next((i for i, x in enumerate(fcy_data_tmp["phases"])
+                                 if math.isclose(x[0], cur_retirement)), None)
 
-    def check_fcyphase_activation(self, idx_driver: int) -> None:
-        # check for the activation of a FCY phase is only required if no FCY phase is active and if there is a FCY phase
-        # remaining
-        if self.fcy_handling["idxs_act_phase"][idx_driver] is None \
-                and self.fcy_handling["idxs_next_phase"][idx_driver] < len(self.fcy_data["phases"]):
+            if idx_fcyphase is not None:
+                # CASE 1: retirement matches a FCY phase -> replace race progress by according race time
+                self.retire_data["retirements"][idx_driver] = fcy_phases_tmp[idx_fcyphase][0]
+
+            else:
+                # CASE 2: retirement was created without a FCY phase -> interpolate according race time
+                frac_tmp, lap_tmp = math.modf(cur_retirement)
+                lap_tmp = int(lap_tmp)
+
+                self.retire_data["retirements"][idx_driver] = \
+                    (t_race_lapwise_tmp[lap_tmp]
+                     + frac_tmp * (t_race_lapwise_tmp[lap_tmp + 1] - t_race_lapwise_tmp[lap_tmp]))
 
-            # get required times
-            racetime_prev_lap = self.racetimes[self.cur_lap - 1, idx_driver]
-            laptime_cur_lap = self.laptimes[self.cur_lap, idx_driver]
+        self.update_fcy_phase_arrays()
+        self.update_retirements_array()
 
-            # assure that this function can skip phases that were already passed without activation (e.g. because of a
-            # extremly long lap time) which would otherwise block new activations
-            while self.fcy_data["phases"][self.fcy_handling["idxs_next_phase"][idx_driver]][1] <= racetime_prev_lap:
-                self.fcy_handling["idxs_next_phase"][idx_driver] += 1
+    def update_retirements_array(self) -> None:
+        """This method converts the retirements of retire_data into a float array (NaN if a driver does not retire) in
+        the same domain. It must be called whenever the retirements are changed from outside the retirement handling."""
 
-                if self.fcy_handling["idxs_next_phase"][idx_driver] >= len(self.fcy_data["phases"]):
-                    return
+        self.retirements = np.array([x if x is not None else np.nan for x in self.retire_data["retirements"]],
+                                    dtype=np.float64)
 
-            # check if the FCY phase ends after the start of the current lap and starts before the end of the current
-            # lap, i.e. if it somehow affects the current lap
-            check_phase = self.fcy_data["phases"][self.fcy_handling["idxs_next_phase"][idx_driver]]
+    def update_fcy_phase_arrays(self) -> None:
+        """This method converts the FCY phases into the arrays used for the (vectorized) FCY phase handling. It must be
+        called whenever phases are inserted or removed. The phases are sorted and do not intersect, i.e. start as well
+        as end race times are sorted in a rising order."""
 
-            if racetime_prev_lap < check_phase[1] and check_phase[0] < racetime_prev_lap + laptime_cur_lap:
-                # successful activation -> update phase indices
-                self.fcy_handling["idxs_act_phase"][idx_driver] = self.fcy_handling["idxs_next_phase"][idx_driver]
-                self.fcy_handling["idxs_next_phase"][idx_driver] += 1
+        phases = self.fcy_data["phases"]
 
-    def check_fcyphase_reset(self, idx_driver: int) -> None:
+        self.fcy_handling["phase_starts"] = np.array([x[0] for x in phases], dtype=np.float64)
+        self.fcy_handling["phase_ends"] = np.array([x[1] for x in phases], dtype=np.float64)
+        self.fcy_handling["phase_is_sc"] = np.array([x[2] == 'SC' for x in phases], dtype=bool)
+        self.fcy_handling["phase_sc_delays"] = np.array([x[3] if x[3] is not None else np.nan for x in phases],
+                                                        dtype=np.float64)
+        self.fcy_handling["phase_sc_durations"] = np.array([x[4] if x[4] is not None else np.nan for x in phases],
+                                                           dtype=np.float64)
+
+    def check_fcyphase_activation(self, idxs_driver: np.ndarray) -> None:
+        # check for the activation of a FCY phase is only required if no FCY phase is active and if there is a FCY phase
+        # remaining
+        no_phases = self.fcy_handling["phase_starts"].size
+
+        if no_phases == 0:
+            return
+
+        idxs_driver = idxs_driver[(self.fcy_handling["idxs_act_phase"][idxs_driver] < 0)
+                                  & (self.fcy_handling["idxs_next_phase"][idxs_driver] < no_phases)]
+
+        if idxs_driver.size == 0:
+            return
+
+        # get required times
+        racetimes_prev_lap = self.racetimes[self.cur_lap - 1, idxs_driver]
+        laptimes_cur_lap = self.laptimes[self.cur_lap, idxs_driver]
+
+        # nothing to do if the earliest next phase starts after all of the checked drivers finished the current lap (a
+        # phase that must be skipped ended before the start of the current lap, i.e. it started before its end as well)
+        if (self.fcy_handling["phase_starts"][self.fcy_handling["idxs_next_phase"][idxs_driver].min()]
+                >= (racetimes_prev_lap + laptimes_cur_lap).max()):
+            return
+
+        # assure that this function can skip phases that were already passed without activation (e.g. because of a
+        # extremly long lap time) which would otherwise block new activations -> the next phase is the first phase that
+        # ends after the start of the current lap (phase ends are sorted)
+        idxs_next_phase = np.maximum(self.fcy_handling["idxs_next_phase"][idxs_driver],
+                                     np.searchsorted(self.fcy_handling["phase_ends"], racetimes_prev_lap, side='right'))
+        self.fcy_handling["idxs_next_phase"][idxs_driver] = idxs_next_phase
+
+        # check if the FCY phase ends after the start of the current lap and starts before the end of the current lap,
+        # i.e. if it somehow affects the current lap
+        mask_remaining = idxs_next_phase < no_phases
+        idxs_driver = idxs_driver[mask_remaining]
+        idxs_next_phase = idxs_next_phase[mask_remaining]
+        racetimes_prev_lap = racetimes_prev_lap[mask_remaining]
+        laptimes_cur_lap = laptimes_cur_lap[mask_remaining]
+
+        mask_act = (racetimes_prev_lap < self.fcy_handling["phase_ends"][idxs_next_phase]) \
+            & (self.fcy_handling["phase_starts"][idxs_next_phase] < racetimes_prev_lap + laptimes_cur_lap)
+
+        # successful activation -> update phase indices
+        self.fcy_handling["idxs_act_phase"][idxs_driver[mask_act]] = idxs_next_phase[mask_act]
+        self.fcy_handling["idxs_next_phase"][idxs_driver[mask_act]] += 1
+
+    def check_fcyphase_reset(self, idxs_driver: np.ndarray) -> None:
         # check for the reset of a FCY phase if it was active during this lap
-        if self.fcy_handling["idxs_act_phase"][idx_driver] is not None:
-            cur_phase = self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx_driver]]
-
-            # active FCY phase is reseted if it ends until the end of this lap or if it is an SC phase and its duration
-            # is reached
-            if cur_phase[1] <= self.racetimes[self.cur_lap - 1, idx_driver] + self.laptimes[self.cur_lap, idx_driver] \
-                    or (self.fcy_handling["sc_ghost_laps"][idx_driver] is not None
-                        and self.fcy_handling["sc_ghost_laps"][idx_driver] >= cur_phase[4]):
-
-                # save actual SC end time for post-processing (end of SC phases differs from pre-calculation if the
-                # phase is aborted by the SC duration instead of the end race time or if the leader did not run up to
-                # the SC until it ends)
-                if cur_phase[2] == 'SC' and self.positions[self.cur_lap, idx_driver] == 1:
-                    t_race_sc_end_sim = (self.racetimes[self.cur_lap - 1, idx_driver]
-                                         + self.laptimes[self.cur_lap, idx_driver] - self.race_pars['min_t_dist_sc'])
-                    self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx_driver]].append(t_race_sc_end_sim)
-
-                # reset FCY phase
-                self.fcy_handling["idxs_act_phase"][idx_driver] = None
-                self.fcy_handling["sc_ghost_racetimes"][idx_driver] = None
-                self.fcy_handling["sc_ghost_laps"][idx_driver] = None
-                self.fcy_handling["start_end_prog"][idx_driver] = [None, None]
-
-            # save actual SC end time for post-processing also in the case that the phase will not be reseted because it
-            # runs until the end of the race
-            elif self.cur_lap == self.race_pars["tot_no_laps"] \
-                    and cur_phase[2] == 'SC' \
-                    and self.positions[self.cur_lap, idx_driver] == 1 \
-                    and math.isinf(cur_phase[1]):
-                self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx_driver]].append(math.inf)
-
-    def calc_lapfracs_fcyphase(self, idx_driver: int) -> tuple:
+        idxs_driver = idxs_driver[self.fcy_handling["idxs_act_phase"][idxs_driver] >= 0]
+
+        if idxs_driver.size == 0:
+            return
+
+        idxs_act_phase = self.fcy_handling["idxs_act_phase"][idxs_driver]
+        racetimes_cur_lap = self.racetimes[self.cur_lap - 1, idxs_driver] + self.laptimes[self.cur_lap, idxs_driver]
+        sc_ghost_laps = self.fcy_handling["sc_ghost_laps"][idxs_driver]
+
+        # active FCY phase is reseted if it ends until the end of this lap or if it is an SC phase and its duration is
+        # reached
+        mask_reset = (self.fcy_handling["phase_ends"][idxs_act_phase] <= racetimes_cur_lap) \
+            | ((sc_ghost_laps >= 0) & (sc_ghost_laps >= self.fcy_handling["phase_sc_durations"][idxs_act_phase]))
+
+        # save actual SC end time for post-processing (end of SC phases differs from pre-calculation if the phase is
+        # aborted by the SC duration instead of the end race time or if the leader did not run up to the SC until it
+        # ends) -> leader only
+        mask_leader_sc = self.fcy_handling["phase_is_sc"][idxs_act_phase] \
+            & (self.positions[self.cur_lap, idxs_driver] == 1)
+
+        for idx_rel in np.flatnonzero(mask_leader_sc & mask_reset):
+            t_race_sc_end_sim = racetimes_cur_lap[idx_rel] - self.race_pars['min_t_dist_sc']
+            self.fcy_data["phases"][idxs_act_phase[idx_rel]].append(float(t_race_sc_end_sim))
+
+        # save actual SC end time for post-processing also in the case that the phase will not be reseted because it
+        # runs until the end of the race
+        if self.cur_lap == self.race_pars["tot_no_laps"]:
+            for idx_rel in np.flatnonzero(mask_leader_sc & ~mask_reset):
+                if math.isinf(self.fcy_data["phases"][idxs_act_phase[idx_rel]][1]):
+                    self.fcy_data["phases"][idxs_act_phase[idx_rel]].append(math.inf)
+
+        # reset FCY phase
+        idxs_reset = idxs_driver[mask_reset]
+        self.fcy_handling["idxs_act_phase"][idxs_reset] = -1
+        self.fcy_handling["sc_ghost_racetimes"][idxs_reset] = np.nan
+        self.fcy_handling["sc_ghost_laps"][idxs_reset] = -1
+        self.fcy_handling["start_end_prog"][idxs_reset] = np.nan
+
+    def calc_lapfracs_fcyphase(self, idxs_driver: np.ndarray) -> tuple:
         """
-        This method determines the lap fraction driven with normal speed considering FCY phases if active. The method
-        check_fcyphase_activation should have been executed within this lap before performing this method!
+        This method determines the lap fractions driven with normal speed considering FCY phases if active. The method
+        check_fcyphase_activation should have been executed within this lap before performing this method! The returned
+        arrays contain one entry per given driver index.
         """
 
-        # calculate fractions if a phase is active
-        if self.fcy_handling["idxs_act_phase"][idx_driver] is not None:
-            # get currently active phase
-            cur_fcy_phase = self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx_driver]]
+        lap_fracs_normal = np.ones(idxs_driver.size)
+        lap_fracs_normal_bef = np.ones(idxs_driver.size)
 
-            # get required times
-            racetime_prev_lap = self.racetimes[self.cur_lap - 1, idx_driver]
-            laptime_cur_lap = self.laptimes[self.cur_lap, idx_driver]
+        # calculate fractions for the drivers with an active phase
+        mask_act = self.fcy_handling["idxs_act_phase"][idxs_driver] >= 0
 
-            # get lap fraction driven normally before FCY phase as well as remaining FCY duration
-            if racetime_prev_lap <= cur_fcy_phase[0] < racetime_prev_lap + laptime_cur_lap:
-                # CASE 1: phase starts within this lap
-                lap_frac_normal_bef = (cur_fcy_phase[0] - racetime_prev_lap) / laptime_cur_lap
-                remain_dur_fcy = cur_fcy_phase[1] - cur_fcy_phase[0]
-            else:
-                # CASE 2: phase started already before this lap
-                lap_frac_normal_bef = 0.0
-                remain_dur_fcy = cur_fcy_phase[1] - racetime_prev_lap
-
-            # calculate remaining FCY lap fraction (can be > 1.0)
-            if cur_fcy_phase[2] == 'SC':
-                # SC always runs until the end of a lap
-                lap_frac_normal_aft = 0.0
-            else:
-                lap_frac_fcy = remain_dur_fcy / self.track.t_lap_fcy
+        if not np.any(mask_act):
+            return lap_fracs_normal, lap_fracs_normal_bef
 
-                # get lap fraction driven normally after a FCY phase
-                if lap_frac_normal_bef + lap_frac_fcy >= 1.0:
-                    # CASE 1: phase lasts exactly until the end of the current lap or longer
-                    lap_frac_normal_aft = 0.0
-                else:
-                    # CASE 2: phase ends in current lap
-                    lap_frac_normal_aft = 1.0 - lap_frac_normal_bef - lap_frac_fcy
+        # get currently active phases
+        idxs_act_phase = self.fcy_handling["idxs_act_phase"][idxs_driver[mask_act]]
+        phase_starts = self.fcy_handling["phase_starts"][idxs_act_phase]
+        phase_ends = self.fcy_handling["phase_ends"][idxs_act_phase]
 
-            # get total fractions
-            lap_frac_normal = lap_frac_normal_bef + lap_frac_normal_aft
+        # get required times
+        racetimes_prev_lap = self.racetimes[self.cur_lap - 1, idxs_driver[mask_act]]
+        laptimes_cur_lap = self.laptimes[self.cur_lap, idxs_driver[mask_act]]
 
-            # check lap_frac_normal
-            if not 0.0 <= lap_frac_normal <= 1.0:
-                raise RuntimeError("lap_frac_normal is not within the range[0,1]!")
+        # get lap fraction driven normally before FCY phase as well as remaining FCY duration
+        # CASE 1: phase starts within this lap, CASE 2: phase started already before this lap
+        mask_start = (racetimes_prev_lap <= phase_starts) & (phase_starts < racetimes_prev_lap + laptimes_cur_lap)
+        lap_frac_normal_bef = np.where(mask_start, (phase_starts - racetimes_prev_lap) / laptimes_cur_lap, 0.0)
+        remain_dur_fcy = np.where(mask_start, phase_ends - phase_starts, phase_ends - racetimes_prev_lap)
 
-        else:
-            lap_frac_normal = 1.0
-            lap_frac_normal_bef = 1.0
+        # calculate remaining FCY lap fraction (can be > 1.0)
+        lap_frac_fcy = remain_dur_fcy / self.track.t_lap_fcy
+
+        # get lap fraction driven normally after a FCY phase (SC always runs until the end of a lap, other phases last
+        # until the end of the current lap or longer or end in the current lap)
+        mask_fcy_until_end = self.fcy_handling["phase_is_sc"][idxs_act_phase] \
+            | (lap_frac_normal_bef + lap_frac_fcy >= 1.0)
+        lap_frac_normal_aft = np.where(mask_fcy_until_end, 0.0, 1.0 - lap_frac_normal_bef - lap_frac_fcy)
+
+        # get total fractions
+        lap_frac_normal = lap_frac_normal_bef + lap_frac_normal_aft
+
+        # check lap_frac_normal
+        if not np.all((0.0 <= lap_frac_normal) & (lap_frac_normal <= 1.0)):
+            raise RuntimeError("lap_frac_normal is not within the range[0,1]!")
+
+        lap_fracs_normal[mask_act] = lap_frac_normal
+        lap_fracs_normal_bef[mask_act] = lap_frac_normal_bef
 
-        return lap_frac_normal, lap_frac_normal_bef
+        return lap_fracs_normal, lap_fracs_normal_bef
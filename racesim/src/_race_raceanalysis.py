@@ -55,9 +55,12 @@ class RaceAnalysis(object):
 
         return cur_lap, est_fraction, last_laptime, last_racetime
 
-    def get_race_results(self) -> dict:
+    def get_race_results(self, compact: bool = False) -> dict:
         """
-        Return a dict that contains all relevant states of the race for further analysis.
+        Return a dict that contains all relevant states of the race for further analysis. If compact is set, race times
+        are stored as float32, positions as int8 and bool_driving as packed bits (np.packbits(), use
+        racesim.src.result_store.unpack_bool_driving() to unpack) to reduce the memory of MCS results. The arrays are
+        copies in that case such that the (float64) arrays of the race object can be freed.
         """
 
         # check if race is finished and valid
@@ -69,6 +72,17 @@ class RaceAnalysis(object):
         # create results dict
         results = {'driverinfo': {}}
 
+        # arrays in the form [driver, lap] (compact arrays are copies such that the race object can be freed)
+        if compact:
+            results['compact'] = True
+            racetimes = self.racetimes.T.astype(np.float32)
+            positions = self.positions.T.astype(np.int8)
+            bool_driving = np.packbits(self.bool_driving.T, axis=1)
+        else:
+            racetimes = self.racetimes.T
+            positions = self.positions.T
+            bool_driving = self.bool_driving.T
+
         # add driver-specific information
         initials_list = [x.initials for x in self.drivers_list]
 
@@ -76,9 +90,9 @@ class RaceAnalysis(object):
             results['driverinfo'][initials] = {"carno": self.drivers_list[idx].carno,                   # int
                                                "strategy_info": self.drivers_list[idx].strategy_info,   # list of lists
                                                "team": self.drivers_list[idx].team,                     # str
-                                               "racetimes": self.racetimes[:, idx],                     # np.ndarray
-                                               "positions": self.positions[:, idx],                     # np.ndarray
-                                               "bool_driving": self.bool_driving[:, idx],               # np.ndarray
+                                               "racetimes": racetimes[idx],                             # np.ndarray
+                                               "positions": positions[idx],                             # np.ndarray
+                                               "bool_driving": bool_driving[idx],                       # np.ndarray
                                                "progress": float(self.progress[idx]),                   # float
                                                "retirements": self.retire_data["retirements"][idx]}     # None/float
 
@@ -14,6 +14,11 @@ def check_pars(sim_opts: dict, pars_in: dict) -> None:
     if sim_opts["no_sim_runs"] > 1000 and sim_opts["no_workers"] == 1:
         print("HINT: Think about increasing the number of workers when simulating a big amount of races!")
 
+    check_every_kth_run = sim_opts.get("check_every_kth_run", 1)
+
+    if not (type(check_every_kth_run) is int and check_every_kth_run >= 1):
+        raise RuntimeError("check_every_kth_run must be an integer >= 1!")
+
     p_grids = [pars_in["driver_pars"][initials]["p_grid"] for initials in pars_in["driver_pars"]]
     if not len(set(p_grids)) == len(p_grids):
         raise RuntimeError("Grid positions are not unique!")
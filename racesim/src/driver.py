@@ -1,7 +1,9 @@
 from racesim.src.combustioncar import CombustionCar
 from racesim.src.electriccar import ElectricCar
 from typing import List
+import numpy as np
 import random
+import helper_funcs.src.calc_tire_degradation
 
 
 class Driver(object):
@@ -167,6 +169,80 @@ class Driver(object):
             return (self.car.t_add_car(t_lap_sens_mass=t_lap_sens_mass)
                     + self.t_driver)
 
+    def calc_basic_timelosses(self,
+                              lap_start: int,
+                              tot_no_laps: int,
+                              pitstops: list,
+                              t_lap_sens_mass: float) -> np.ndarray:
+        """
+        Vectorized calculation of the basic time losses (without probabilistic influences) of the laps lap_start to
+        tot_no_laps, i.e. the "free-air" lap time parts that do not depend on the race situation. The calculation
+        starts from the current state of the car (which must be the state at the start of lap_start) and assumes that
+        no FCY phase is active. Tire degradation and fuel mass loss are calculated in the same way and order as by
+        drive_lap() and calc_basic_timeloss() such that the results are identical. pitstops contains the pending pit
+        stops [inlap, compound, tire age, refueling] with inlaps in the range [lap_start, tot_no_laps - 1].
+        """
+
+        no_laps = tot_no_laps - lap_start + 1
+        t_basic = np.zeros(no_laps)
+
+        # tire degradation (including cold tires in the first lap of a stint) for every stint
+        idxs_stint_start = [0] + [pitstop[0] + 1 - lap_start for pitstop in pitstops] + [no_laps]
+
+        for idx_stint in range(len(idxs_stint_start) - 1):
+            idx_start, idx_end = idxs_stint_start[idx_stint], idxs_stint_start[idx_stint + 1]
+
+            if idx_stint == 0:
+                tireset = self.car.tireset
+                compound, tire_pars, age_degr = tireset.compound, tireset.tireset_pars, tireset.age_degr
+                cold_tires = tireset.age_curstint == 0
+            else:
+                compound, tire_pars = pitstops[idx_stint - 1][1], self.tireset_pars
+                age_degr = float(pitstops[idx_stint - 1][2])
+                cold_tires = True
+
+            # tire age is increased lap by lap (accumulate adds sequentially as drive_lap())
+            tire_ages = np.ones(idx_end - idx_start)
+            tire_ages[0] = age_degr
+            t_basic[idx_start:idx_end] = helper_funcs.src.calc_tire_degradation.\
+                calc_tire_degradation_ages(tire_ages=np.add.accumulate(tire_ages),
+                                           compound=compound,
+                                           tire_pars=tire_pars)
+
+            if cold_tires:
+                t_basic[idx_start] += tire_pars["t_add_coldtires"]
+
+        t_basic += self.car.t_car
+
+        # fuel mass (the consumption adjustment depends on the fuel mass of the previous lap, i.e. it is calculated lap
+        # by lap)
+        if self.car.drivetype == 'combustion':
+            refuels = {pitstop[0]: pitstop[3] for pitstop in pitstops}
+            auto_consumption_adjust = self.car.auto_consumption_adjust
+            b_fuel_perlap = self.car.b_fuel_perlap
+            m_fuel = self.car.m_fuel
+            m_fuels = []
+
+            for cur_lap in range(lap_start, tot_no_laps + 1):
+                m_fuels.append(m_fuel)
+
+                if auto_consumption_adjust:
+                    m_fuel -= max(m_fuel / (tot_no_laps - (cur_lap - 1)), b_fuel_perlap)
+                else:
+                    m_fuel -= b_fuel_perlap
+
+                if m_fuel < 0.0:
+                    m_fuel = 0.0
+
+                if cur_lap in refuels:
+                    m_fuel += refuels[cur_lap]
+
+            t_basic += np.array(m_fuels) * t_lap_sens_mass
+
+        t_basic += self.t_driver
+
+        return t_basic
+
     def update_lap_influences(self, cur_lap: int, influence_type: str):
         if influence_type not in ["pitoutlap", "pitinlap", "sc", "vsc", "retiring"]:
             raise RuntimeError("Unknown influence type %s!" % influence_type)
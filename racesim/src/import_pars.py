@@ -108,61 +108,68 @@ def import_pars(
     # ------------------------------------------------------------------------------------------------------------------
 
     if use_vse:
-        vse_paths = {}
-        # SUPERVISED VSE------------------------------------------------------------------------------------------------
-        if "supervised" in [pars_in["vse_pars"]["vse_type"][x] for x in pars_in["vse_pars"]["vse_type"]]:
-            # SUPERVISED VSE (TIRE CHANGE DECISION) ------------------------------------------------------------------------
-            # preprocessor
-            preprocessor_supervised_tirechange_pkl = vse_path / "preprocessor_supervised_tirechange.pkl"
-            if preprocessor_supervised_tirechange_pkl.is_file():
-                raise RuntimeError(f"Preprocessor file is not available in the input path: {preprocessor_supervised_tirechange_pkl}")
-            else:
-                vse_paths["supervised_preprocessor_tc"] = str(preprocessor_supervised_tirechange_pkl)
-
-            # NN model
-            nn_supervised_tirechange_tflite = vse_path / "nn_supervised_tirechange.tflite"
-            if not nn_supervised_tirechange_tflite.is_file():
-                raise RuntimeError(f"NN model file is not available in the input path: {nn_supervised_tirechange_tflite}")
-            else:
-                vse_paths["supervised_nnmodel_tc"] = str(nn_supervised_tirechange_tflite)
-
-            # SUPERVISED VSE (COMPOUND CHOICE) -----------------------------------------------------------------------------
-            # preprocessor
-            preprocessor_supervised_compoundchoice_pkl = vse_path / "preprocessor_supervised_compoundchoice.pkl"
-            if not preprocessor_supervised_compoundchoice_pkl.is_file():
-                raise RuntimeError(f"Preprocessor file is not available in the input path: {preprocessor_supervised_compoundchoice_pkl}")
-            else:
-                vse_paths["supervised_preprocessor_cc"] = str(preprocessor_supervised_compoundchoice_pkl)
-
-            # NN model
-            nn_supervised_compoundchoice_tflite = vse_path / "nn_supervised_compoundchoice.tflite"
-            if not nn_supervised_compoundchoice_tflite.is_file():
-                raise RuntimeError(f"NN model file is not available in the input path: {nn_supervised_compoundchoice_tflite}")
-            else:
-                vse_paths["supervised_nnmodel_cc"] = str(nn_supervised_compoundchoice_tflite)
-
-        # REINFORCEMENT VSE --------------------------------------------------------------------------------------------
-        if "reinforcement" in [pars_in["vse_pars"]["vse_type"][x] for x in pars_in["vse_pars"]["vse_type"]]:
-            # preprocessor
-            preprocessor_pkl = vse_path / f"preprocessor_reinforcement_{pars_in['track_pars']['name']}_{pars_in['race_pars']['season']}.pkl"
-
-            if not preprocessor_pkl.is_file():
-                raise RuntimeError(
-                    f"""Preprocessor file is not available in the input path: ({preprocessor_pkl})!
-                        Was it possibly one of the 11 (partly) wet races (see readme)?""")
-            else:
-                vse_paths["reinf_preprocessor"] = str(preprocessor_pkl)
-
-            # NN model
-            nn_tflite = vse_path / f"nn_reinforcement_{pars_in['track_pars']['name']}_{pars_in['race_pars']['season']}.tflite"
-            if not nn_tflite.is_file():
-                raise RuntimeError(
-                    f"""Preprocessor file is not available in the input path: ({nn_tflite})!
-                        Was it possibly one of the 11 (partly) wet races (see readme)?""")
-            else:
-                vse_paths["reinf_nnmodel"] = str(nn_tflite)
-
+        vse_paths = get_vse_paths(pars_in=pars_in, vse_path=vse_path)
     else:
         vse_paths = None
 
     return pars_in, vse_paths
+
+
+def get_vse_paths(pars_in: dict, vse_path: Path) -> dict:
+    """Return the paths of the preprocessor and NN model files required by the VSE types set in the VSE parameters."""
+
+    vse_paths = {}
+    # SUPERVISED VSE ---------------------------------------------------------------------------------------------------
+    if "supervised" in [pars_in["vse_pars"]["vse_type"][x] for x in pars_in["vse_pars"]["vse_type"]]:
+        # SUPERVISED VSE (TIRE CHANGE DECISION) ------------------------------------------------------------------------
+        # preprocessor
+        preprocessor_supervised_tirechange_pkl = vse_path / "preprocessor_supervised_tirechange.pkl"
+        if not preprocessor_supervised_tirechange_pkl.is_file():
+            raise RuntimeError(f"Preprocessor file is not available in the input path: {preprocessor_supervised_tirechange_pkl}")
+        else:
+            vse_paths["supervised_preprocessor_tc"] = str(preprocessor_supervised_tirechange_pkl)
+
+        # NN model
+        nn_supervised_tirechange_tflite = vse_path / "nn_supervised_tirechange.tflite"
+        if not nn_supervised_tirechange_tflite.is_file():
+            raise RuntimeError(f"NN model file is not available in the input path: {nn_supervised_tirechange_tflite}")
+        else:
+            vse_paths["supervised_nnmodel_tc"] = str(nn_supervised_tirechange_tflite)
+
+        # SUPERVISED VSE (COMPOUND CHOICE) -----------------------------------------------------------------------------
+        # preprocessor
+        preprocessor_supervised_compoundchoice_pkl = vse_path / "preprocessor_supervised_compoundchoice.pkl"
+        if not preprocessor_supervised_compoundchoice_pkl.is_file():
+            raise RuntimeError(f"Preprocessor file is not available in the input path: {preprocessor_supervised_compoundchoice_pkl}")
+        else:
+            vse_paths["supervised_preprocessor_cc"] = str(preprocessor_supervised_compoundchoice_pkl)
+
+        # NN model
+        nn_supervised_compoundchoice_tflite = vse_path / "nn_supervised_compoundchoice.tflite"
+        if not nn_supervised_compoundchoice_tflite.is_file():
+            raise RuntimeError(f"NN model file is not available in the input path: {nn_supervised_compoundchoice_tflite}")
+        else:
+            vse_paths["supervised_nnmodel_cc"] = str(nn_supervised_compoundchoice_tflite)
+
+    # REINFORCEMENT VSE ------------------------------------------------------------------------------------------------
+    if "reinforcement" in [pars_in["vse_pars"]["vse_type"][x] for x in pars_in["vse_pars"]["vse_type"]]:
+        # preprocessor
+        preprocessor_pkl = vse_path / f"preprocessor_reinforcement_{pars_in['track_pars']['name']}_{pars_in['race_pars']['season']}.pkl"
+
+        if not preprocessor_pkl.is_file():
+            raise RuntimeError(
+                f"""Preprocessor file is not available in the input path: ({preprocessor_pkl})!
+                    Was it possibly one of the 11 (partly) wet races (see readme)?""")
+        else:
+            vse_paths["reinf_preprocessor"] = str(preprocessor_pkl)
+
+        # NN model
+        nn_tflite = vse_path / f"nn_reinforcement_{pars_in['track_pars']['name']}_{pars_in['race_pars']['season']}.tflite"
+        if not nn_tflite.is_file():
+            raise RuntimeError(
+                f"""Preprocessor file is not available in the input path: ({nn_tflite})!
+                    Was it possibly one of the 11 (partly) wet races (see readme)?""")
+        else:
+            vse_paths["reinf_nnmodel"] = str(nn_tflite)
+
+    return vse_paths
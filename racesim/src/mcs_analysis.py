@@ -1,6 +1,7 @@
 import numpy as np
 import matplotlib.pyplot as plt
 import pandas as pd
+from racesim.src.result_store import ResultStore
 
 
 def mcs_analysis(race_results: list,
@@ -18,7 +19,8 @@ def mcs_analysis(race_results: list,
     or box plots for these distributions if number of bunches is > 1.
 
     .. inputs:
-    :param race_results:        list containing the result dicts of the simulated races (from race.race_results())
+    :param race_results:        list (or ResultStore) containing the result dicts of the simulated races (from
+                                race.race_results())
     :type race_results:         list
     :param use_print_result:    determines if result prints to console should be created or not
     :type use_print_result:     bool
@@ -30,7 +32,7 @@ def mcs_analysis(race_results: list,
     # PREPROCESSING ----------------------------------------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
 
-    if not type(race_results) is list and type(race_results[0]) is dict:
+    if not type(race_results) in [list, ResultStore] or not type(race_results[0]) is dict:
         raise RuntimeError("List of dicts required as result_objs (list of results from race.race_results())!")
 
     no_sim_runs = len(race_results)
@@ -48,16 +50,17 @@ def mcs_analysis(race_results: list,
                                    columns=col_names,
                                    index=driver_initials)
 
-    # count number of positions for current driver
-    for initials in driver_initials:
-        tmp_pos_results = [0] * no_drivers
+    # count number of positions for every driver (results are iterated only once since they could be spilled to disk)
+    pos_results = np.zeros((no_drivers, no_drivers), dtype=np.int32)
 
-        for idx_race in range(no_sim_runs):
-            cur_result_pos = int(race_results[idx_race]["driverinfo"][initials]["positions"][-1])
-            tmp_pos_results[cur_result_pos - 1] += 1
+    for race_result in race_results:
+        for idx_driver, initials in enumerate(driver_initials):
+            cur_result_pos = int(race_result["driverinfo"][initials]["positions"][-1])
+            pos_results[idx_driver, cur_result_pos - 1] += 1
 
-        # add tmp_results to driver's row in pandas dataframe
-        race_results_df.loc[initials] = tmp_pos_results
+    # add position results to the drivers' rows in pandas dataframe
+    for idx_driver, initials in enumerate(driver_initials):
+        race_results_df.loc[initials] = pos_results[idx_driver]
 
     # ------------------------------------------------------------------------------------------------------------------
     # PRINT MEAN POSITIONS ---------------------------------------------------------------------------------------------
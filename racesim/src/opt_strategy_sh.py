@@ -0,0 +1,354 @@
+import helper_funcs.src.get_strat_combinations
+from racesim.src.race_handle import race_handle
+from concurrent import futures  # required for parallel computing
+import numpy as np
+import itertools
+import copy
+import math
+
+
+def create_strategy_candidates(tot_no_laps: int,
+                               available_compounds: list,
+                               start_compound: str,
+                               start_age: int,
+                               min_no_pitstops: int = 1,
+                               max_no_pitstops: int = 2,
+                               inlap_step: int = 2,
+                               min_stint_length: int = 5) -> list:
+    """
+    .. description::
+    This function creates the candidate strategies for the successive halving optimization. All compound sequences
+    starting with the start compound (see get_strat_combinations) are combined with all inlaps on a grid (inlap windows)
+    that keep the minimum stint length.
+
+    .. inputs::
+    :param tot_no_laps:         Number of laps in the race.
+    :type tot_no_laps:          int
+    :param available_compounds: Available compounds, e.g. ['A3', 'A4', 'A6']
+    :type available_compounds:  list
+    :param start_compound:      Compound used for the first stint.
+    :type start_compound:       str
+    :param start_age:           Tire age of the start tireset.
+    :type start_age:            int
+    :param min_no_pitstops:     Minimum number of pit stops.
+    :type min_no_pitstops:      int
+    :param max_no_pitstops:     Maximum number of pit stops.
+    :type max_no_pitstops:      int
+    :param inlap_step:          Step size between the possible inlaps.
+    :type inlap_step:           int
+    :param min_stint_length:    Minimum number of laps per stint.
+    :type min_stint_length:     int
+
+    .. outputs::
+    :return candidates:         List with a strategy info per candidate, e.g. [[0, 'A4', 2, 0.0], [30, 'A3', 0, 0.0]]
+    :rtype candidates:          list
+    """
+
+    inlaps_avail = list(range(min_stint_length, tot_no_laps - min_stint_length + 1, inlap_step))
+    candidates = []
+
+    for cur_no_pitstops in range(min_no_pitstops, max_no_pitstops + 1):
+        # all inlap combinations are sorted in ascending order, remove those with too short stints in between
+        inlaps_combinations = [inlaps for inlaps in itertools.combinations(inlaps_avail, r=cur_no_pitstops)
+                               if all(inlaps[idx + 1] - inlaps[idx] >= min_stint_length
+                                      for idx in range(cur_no_pitstops - 1))]
+
+        # compound sequences starting with the start compound are generated lazily
+        for compounds in helper_funcs.src.get_strat_combinations.\
+                iter_strat_combinations(available_compounds=available_compounds,
+                                        no_pitstops=cur_no_pitstops,
+                                        enforce_diff_compounds=True,
+                                        start_compound=start_compound,
+                                        all_orders=True):
+
+            for inlaps in inlaps_combinations:
+                candidates.append([[0, start_compound, start_age, 0.0]]
+                                  + [[inlap, compound, 0, 0.0] for inlap, compound in zip(inlaps, compounds[1:])])
+
+    return candidates
+
+
+def opt_strategy_sh(pars_in: dict,
+                    vse_paths: dict,
+                    initials: str,
+                    candidates: list,
+                    use_prob_infl: bool = True,
+                    create_rand_events: bool = True,
+                    no_sim_runs_init: int = 4,
+                    no_workers: int = 1,
+                    use_print: bool = True) -> list:
+    """
+    .. description::
+    This function searches the best race strategy of a driver amongst the candidate strategies using the full race
+    simulation (including opponents). Successive halving is applied: every candidate is simulated no_sim_runs_init times
+    in the first round, then the worse half of the candidates is dropped and the number of simulation runs is doubled
+    for the remaining candidates. This is repeated until a single candidate is left. Results of previous rounds are kept
+    such that every round adds the missing runs only. Every round after the first therefore adds about
+    no_candidates * no_sim_runs_init / 2 races, i.e. the total number of simulated races is at most about
+    no_candidates * no_sim_runs_init * (1 + log2(no_candidates) / 2). The last two candidates are compared on the basis
+    of no_sim_runs_final = no_sim_runs_init * 2 ** (ceil(log2(no_candidates)) - 1) (about no_sim_runs_init *
+    no_candidates / 2) races each. Simulating all candidates with no_sim_runs_final races would cost no_candidates *
+    no_sim_runs_final races. Successive halving is therefore cheaper as soon as no_sim_runs_final exceeds
+    no_sim_runs_init * (1 + log2(no_candidates) / 2), which is the case for more than two candidates (e.g. 160 instead
+    of 512 races for 16 candidates and no_sim_runs_init = 4). The saving results from the smaller number of races of
+    the bad candidates, the total cost still grows slightly faster than linear with the number of candidates.
+
+    The candidates are ranked by the mean final position of the driver, the mean race time is used as second criterion.
+    Invalid races are simulated again, a candidate is dropped if more races are invalid than required in the current
+    round.
+
+    .. inputs::
+    :param pars_in:             Parameters as returned by import_pars.
+    :type pars_in:              dict
+    :param vse_paths:           VSE paths as returned by import_pars (None if VSE is not used).
+    :type vse_paths:            dict
+    :param initials:            Initials of the driver whose strategy should be optimized.
+    :type initials:             str
+    :param candidates:          List with the candidate strategy infos (e.g. from create_strategy_candidates()).
+    :type candidates:           list
+    :param use_prob_infl:       Activates probabilistic influences within the race simulation.
+    :type use_prob_infl:        bool
+    :param create_rand_events:  Activates the random creation of FCY phases and retirements.
+    :type create_rand_events:   bool
+    :param no_sim_runs_init:    Number of (valid) races per candidate in the first round.
+    :type no_sim_runs_init:     int
+    :param no_workers:          Number of workers, 1 for single process, >1 for multi-process.
+    :type no_workers:           int
+    :param use_print:           Set if prints to console should be used or not.
+    :type use_print:            bool
+
+    .. outputs::
+    :return ranking:            List with a dict per candidate sorted from best to worst (candidates that were dropped
+                                in earlier rounds are sorted behind the remaining ones): {"strategy_info": list,
+                                "no_sim_runs": int, "no_invalid": int, "mean_position": float, "mean_racetime": float,
+                                "round_dropped": int or None}
+    :rtype ranking:             list
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # PREPARATION ------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    if initials not in pars_in["driver_pars"]:
+        raise RuntimeError("Driver %s does not participate in the race!" % initials)
+    if not candidates:
+        raise RuntimeError("At least one candidate strategy is required!")
+
+    # create a parameter set per candidate (the driver follows the candidate strategy, also if the VSE is used)
+    pars_cands = []
+
+    for strategy_info in candidates:
+        pars_tmp = copy.deepcopy(pars_in)
+        pars_tmp["driver_pars"][initials]["strategy_info"] = copy.deepcopy(strategy_info)
+
+        if vse_paths is not None:
+            pars_tmp["vse_pars"]["vse_type"][initials] = "realstrategy"
+            pars_tmp["vse_pars"]["real_strategy"][initials] = copy.deepcopy(strategy_info)
+
+        pars_cands.append(pars_tmp)
+
+    # results of every candidate in the form [final position, final race time] per valid race
+    results = [[] for _ in candidates]
+    no_invalid = [0] * len(candidates)
+    round_dropped = [None] * len(candidates)
+
+    idxs_remaining = list(range(len(candidates)))
+    no_sim_runs = no_sim_runs_init
+    cur_round = 0
+
+    # create executor instance (pool of processes available for parallel calculations)
+    executor = futures.ProcessPoolExecutor(max_workers=no_workers) if no_workers > 1 else None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # SUCCESSIVE HALVING -----------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    try:
+        while True:
+            if use_print:
+                print("INFO: Round %i: simulating %i candidates with %i races each..."
+                      % (cur_round, len(idxs_remaining), no_sim_runs))
+
+            # simulate missing races of the remaining candidates
+            __simulate_candidates(pars_cands=pars_cands,
+                                  vse_paths=vse_paths,
+                                  initials=initials,
+                                  idxs_cand=idxs_remaining,
+                                  no_sim_runs=no_sim_runs,
+                                  results=results,
+                                  no_invalid=no_invalid,
+                                  use_prob_infl=use_prob_infl,
+                                  create_rand_events=create_rand_events,
+                                  executor=executor)
+
+            # drop candidates that did not reach the required number of valid races
+            for idx_cand in idxs_remaining:
+                if len(results[idx_cand]) < no_sim_runs:
+                    round_dropped[idx_cand] = cur_round
+
+                    if use_print:
+                        print("WARNING: Candidate %i was dropped since too many races were invalid!" % idx_cand)
+
+            idxs_remaining = [idx_cand for idx_cand in idxs_remaining if round_dropped[idx_cand] is None]
+
+            if len(idxs_remaining) <= 1:
+                break
+
+            # keep better half of the candidates and double the number of races
+            idxs_remaining.sort(key=lambda idx: __get_score(results=results[idx]))
+
+            for idx_cand in idxs_remaining[math.ceil(len(idxs_remaining) / 2):]:
+                round_dropped[idx_cand] = cur_round
+
+            idxs_remaining = idxs_remaining[:math.ceil(len(idxs_remaining) / 2)]
+            no_sim_runs *= 2
+            cur_round += 1
+
+            # a single remaining candidate is the winner, it must not be simulated again
+            if len(idxs_remaining) == 1:
+                break
+
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # EVALUATION -------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    ranking = []
+
+    for idx_cand, strategy_info in enumerate(candidates):
+        mean_position, mean_racetime = __get_score(results=results[idx_cand])
+
+        ranking.append({"strategy_info": strategy_info,
+                        "no_sim_runs": len(results[idx_cand]),
+                        "no_invalid": no_invalid[idx_cand],
+                        "mean_position": mean_position,
+                        "mean_racetime": mean_racetime,
+                        "round_dropped": round_dropped[idx_cand]})
+
+    # candidates that survived longer are better, within the same round the score decides
+    ranking.sort(key=lambda x: (-x["round_dropped"] if x["round_dropped"] is not None else -math.inf,
+                                x["mean_position"],
+                                x["mean_racetime"]))
+
+    if use_print:
+        print("RESULT: Best strategy for %s after %i simulated races: %s (mean position %.2f, mean race time %.3fs)"
+              % (initials, sum(len(x) for x in results) + sum(no_invalid), ranking[0]["strategy_info"],
+                 ranking[0]["mean_position"], ranking[0]["mean_racetime"]))
+
+    return ranking
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# HELPER FUNCTIONS -----------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+def __simulate_candidates(pars_cands: list,
+                          vse_paths: dict,
+                          initials: str,
+                          idxs_cand: list,
+                          no_sim_runs: int,
+                          results: list,
+                          no_invalid: list,
+                          use_prob_infl: bool,
+                          create_rand_events: bool,
+                          executor: futures.ProcessPoolExecutor or None) -> None:
+    """Simulate races until every given candidate has no_sim_runs valid results or more invalid races than that. The
+    results and invalid counters are updated in place."""
+
+    # number of races left per candidate
+    no_sim_runs_left = {idx_cand: no_sim_runs - len(results[idx_cand]) for idx_cand in idxs_cand}
+
+    def __continue(idx_cand: int) -> bool:
+        return no_sim_runs_left[idx_cand] > 0 and no_invalid[idx_cand] <= no_sim_runs
+
+    # SINGLE PROCESS ---------------------------------------------------------------------------------------------------
+    if executor is None:
+        for idx_cand in idxs_cand:
+            while __continue(idx_cand=idx_cand):
+                result = _race_handle_eval(pars_in=pars_cands[idx_cand],
+                                           use_prob_infl=use_prob_infl,
+                                           create_rand_events=create_rand_events,
+                                           vse_paths=vse_paths,
+                                           initials=initials)
+                __save_result(result=result, idx_cand=idx_cand, results=results, no_invalid=no_invalid,
+                              no_sim_runs_left=no_sim_runs_left)
+
+    # MULTIPLE PROCESSES -----------------------------------------------------------------------------------------------
+    else:
+        # set maximum number of jobs in the waiting queue at the same time -> limits RAM usage
+        max_no_concurrent_jobs = 200
+
+        while any(__continue(idx_cand=idx_cand) for idx_cand in idxs_cand):
+            # reset job queue (dict containing current simulation jobs and the according candidate index)
+            job_queue = {}
+
+            # submit races of all candidates round-robin such that the workers are kept busy until the end of the round
+            while len(job_queue) <= max_no_concurrent_jobs \
+                    and any(__continue(idx_cand=idx_cand) for idx_cand in idxs_cand):
+                for idx_cand in idxs_cand:
+                    if __continue(idx_cand=idx_cand):
+                        job_queue[executor.submit(_race_handle_eval,
+                                                  pars_cands[idx_cand],
+                                                  use_prob_infl,
+                                                  create_rand_events,
+                                                  vse_paths,
+                                                  initials)] = idx_cand
+                        no_sim_runs_left[idx_cand] -= 1
+
+            # collect results as soon as they are available
+            for job_handle in futures.as_completed(job_queue):
+                idx_cand = job_queue[job_handle]
+                no_sim_runs_left[idx_cand] += 1  # counted again in __save_result()
+                __save_result(result=job_handle.result(), idx_cand=idx_cand, results=results, no_invalid=no_invalid,
+                              no_sim_runs_left=no_sim_runs_left)
+
+
+def __save_result(result: tuple, idx_cand: int, results: list, no_invalid: list, no_sim_runs_left: dict) -> None:
+    # CASE 1: result is valid
+    if result[0] == 0:
+        results[idx_cand].append(result[1:])
+        no_sim_runs_left[idx_cand] -= 1
+
+    # CASE 2: result is invalid -> race is simulated again
+    else:
+        no_invalid[idx_cand] += 1
+
+
+def __get_score(results: list) -> tuple:
+    # score in the form (mean final position, mean final race time), smaller is better
+    if not results:
+        return math.inf, math.inf
+
+    results_array = np.array(results)
+    racetimes = results_array[:, 1][~np.isnan(results_array[:, 1])]  # race time is not available for retired drivers
+
+    return float(np.mean(results_array[:, 0])), float(np.mean(racetimes)) if racetimes.size > 0 else math.inf
+
+
+def _race_handle_eval(pars_in: dict,
+                      use_prob_infl: bool,
+                      create_rand_events: bool,
+                      vse_paths: dict,
+                      initials: str) -> tuple:
+    """Simulate a race and return (result status, final position, final race time) of the given driver such that the
+    race object itself must not be transferred between the processes."""
+
+    race = race_handle(pars_in=pars_in,
+                       use_prob_infl=use_prob_infl,
+                       create_rand_events=create_rand_events,
+                       vse_paths=vse_paths)
+
+    idx_driver = next(idx for idx, driver in enumerate(race.drivers_list) if driver.initials == initials)
+
+    return race.result_status, int(race.positions[-1, idx_driver]), float(race.racetimes[-1, idx_driver])
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# TESTING --------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    pass
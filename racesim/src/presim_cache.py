@@ -0,0 +1,102 @@
+import collections
+import hashlib
+import json
+import copy
+
+"""
+.. description::
+In-memory cache for the pre-simulation that converts FCY phases (and retirements) from the race progress domain into
+the time domain, see MonteCarlo.convert_raceprog_to_racetimes(). The pre-simulation (and the determination of the VSE
+basic strategy) is a pure function of the parameters of the reference driver, the track, the VSE and the FCY phases.
+Since Monte Carlo runs often draw similar FCY scenarios, its results are cached per process (i.e. per worker of a
+process pool) and evicted in LRU order as soon as the maximum number of entries is exceeded.
+
+The key contains the exact FCY phases by default, i.e. a hit returns exactly the results of a new pre-simulation and
+seeded Monte Carlo results do not depend on the distribution of the races across the workers. Since the start and stop
+race progress of randomly created FCY phases are continuous, hits are mostly limited to races without or with identical
+FCY phases then. Setting PROG_RESOLUTION > 0.0 (opt-in) snaps the phases to a grid of PROG_RESOLUTION laps for the key,
+such that similar scenarios share an entry. Accuracy trade-off: the VSE basic strategy of a hit was determined for a
+scenario whose phases can differ by up to half the resolution, i.e. the VSE decision of a lap at the edge of an FCY
+phase can differ from the one for the exact phases (and the result depends on which scenario was cached first). The
+converted FCY phase times are only reused if the cached phases are exactly equal, otherwise the (cheap) basic race
+simulation is repeated with the exact phases and the cached basic strategy. The measured hit rate of the snapped keys
+is low (about 8% at 0.1 laps for 500 Spielberg races with VSE), snapping is therefore not used by default.
+
+The VSE model files are regarded by their paths only, i.e. clear_cache() must be called if they are replaced during
+runtime.
+"""
+
+# maximum number of entries per process (0 disables the cache)
+MAX_NO_ENTRIES = 256
+
+# [laps] grid resolution the race progress of the FCY phases is snapped to for the key (0.0 -> exact keys, opt-in since
+# the results of hits are approximate then, must be set before the worker processes are created)
+PROG_RESOLUTION = 0.0
+
+# cache entries in the form {key: (fcy_phases, t_race_lapwise, fcy_phases_conv, strategy_info)}, ordered from least to
+# most recently used
+_presim_cache = collections.OrderedDict()
+
+
+def get_cache_key(presim_pars: dict,
+                  ref_driver: str,
+                  fcy_phases: list,
+                  vse_paths: dict = None,
+                  prog_resolution: float = None) -> tuple:
+    """Return the key of a pre-simulation consisting of the hash of the parameters (canonical JSON representation) and
+    the VSE paths, the reference driver and the FCY phases (race progress domain) snapped to a grid of prog_resolution
+    laps (PROG_RESOLUTION if None)."""
+
+    hash_obj = hashlib.sha256()
+    hash_obj.update(json.dumps(presim_pars, sort_keys=True, separators=(',', ':'), default=str).encode())
+
+    if vse_paths is not None:
+        hash_obj.update(json.dumps(vse_paths, sort_keys=True, default=str).encode())
+
+    if prog_resolution is None:
+        prog_resolution = PROG_RESOLUTION
+
+    if prog_resolution > 0.0:
+        fcy_phases_key = tuple((round(x[0] / prog_resolution), round(x[1] / prog_resolution), x[2])
+                               for x in fcy_phases)
+    else:
+        fcy_phases_key = tuple((x[0], x[1], x[2]) for x in fcy_phases)
+
+    return hash_obj.hexdigest(), ref_driver, fcy_phases_key
+
+
+def load_presim(cache_key: tuple) -> tuple or None:
+    """Return a copy of the cached pre-simulation results (None if not available) and mark the entry as recently
+    used."""
+
+    if cache_key not in _presim_cache:
+        return None
+
+    _presim_cache.move_to_end(cache_key)
+
+    return copy.deepcopy(_presim_cache[cache_key])
+
+
+def save_presim(cache_key: tuple, presim_results: tuple, max_no_entries: int = MAX_NO_ENTRIES) -> None:
+    """Save a copy of the pre-simulation results in the cache and evict the least recently used entries if the cache is
+    full."""
+
+    if max_no_entries <= 0:
+        return
+
+    _presim_cache[cache_key] = copy.deepcopy(presim_results)
+    _presim_cache.move_to_end(cache_key)
+
+    while len(_presim_cache) > max_no_entries:
+        _presim_cache.popitem(last=False)
+
+
+def clear_cache() -> None:
+    """Remove all entries from the cache."""
+
+    _presim_cache.clear()
+
+
+# testing --------------------------------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    pass
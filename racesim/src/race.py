@@ -2,13 +2,14 @@
 from racesim.src.track import Track
 from racesim.src.driver import Driver
 from racesim.src.vse import VSE
+import racesim.src.timing
 
 # import general Python modules
 import numpy as np
 import random
-from typing import List, Iterator
+from typing import List
 import copy
-import math
+import time
 
 # import method classes that are outsourced to extra files
 from racesim.src._race_montecarlo import MonteCarlo
@@ -53,12 +54,16 @@ class Race(MonteCarlo, RaceAnalysis):
                  "__race_pars",             # contains race parameters such as t_overtake, drs_window, ...
                  "__monte_carlo_pars",      # parameters used for monte carlo method
                  "__pit_driver_idxs",       # create list for pitting drivers (set by checking their inlaps)
+                 "__pit_schedule",          # dict with the pit stops of the strategy info compiled into arrays
+                 "__laptimes_free",         # array with the precalculated basic ("free-air") time losses
+                 "__laptimes_free_outdated",  # bool array indicating drivers whose basic time losses must be updated
                  "__pit_outlap_losses",     # create array to save time losses due to pit stop (outlap) for DRS checks
                  # race state ------------------------------------------------------------------------------------------
                  "__laptimes",              # array with laptimes
                  "__racetimes",             # array with racetimes
                  "__positions",             # array with positions
                  "__bool_driving",          # bool array containining which drivers are driving (did not retire)
+                 "__idxs_driving",          # array with the indices of the drivers that are driving (did not retire)
                  "__progress",              # array with race progress in laps for every driver
                  # fcy related -----------------------------------------------------------------------------------------
                  "__fcy_data",              # dict with FCY data -> {"phases": [[start, end, type, SC delay (SC only),
@@ -68,14 +73,24 @@ class Race(MonteCarlo, RaceAnalysis):
                                             #                        "domain": 'time' or 'progress' (for start and end)}
                  "__retire_data",           # dict with retirement data -> {"retirements": [start driver 1, ...],
                                             #                               "domain": 'time' or 'progress' (for start)}
+                 "__retirements",           # float array with the retirements of retire_data (NaN if None, same
+                                            # domain, see update_retirements_array())
                  "__fcy_handling",          # dict containing everything required to handle the FCY phases correctly
+                                            # -> driver states as arrays (-1 or NaN if no phase is active) and the
+                                            # FCY phases as arrays (see update_fcy_phase_arrays())
                  "__overtake_allowed",      # bool array containing which drivers are allowed to overtake / be overtaken
+                 "__t_gap_overtake_tots",   # array with the required overtaking time advantage [idx_front, idx_back]
+                 "__t_gap_interaction",     # race time gap above which consecutive drivers cannot interact
                  "__presim_info",           # saves information from the pre-simulation (e.g. race duration)
                  # virtual strategy engineer ---------------------------------------------------------------------------
                  "__vse",                   # ML model handling pit stop decisions
                  # result arrays ---------------------------------------------------------------------------------------
                  "__flagstates",            # list with flag states of the race (with regard to the leader's lap)
-                 "__result_status")         # integer indicating if the result is valid or not (and why)
+                 "__result_status",         # integer indicating if the result is valid or not (and why)
+                 "__use_plausibility_check",  # flag indicating if the plausibility of the result is checked
+                 # timing instrumentation (optional) -------------------------------------------------------------------
+                 "__timing",                # dict with wall times and number of calls per lap phase (None if off)
+                 "__t_timing")              # perf counter at the end of the previous phase
 
     # ------------------------------------------------------------------------------------------------------------------
     # CONSTRUCTOR ------------------------------------------------------------------------------------------------------
@@ -92,7 +107,9 @@ class Race(MonteCarlo, RaceAnalysis):
                  use_prob_infl: bool,
                  create_rand_events: bool,
                  monte_carlo_pars: dict,
-                 event_pars: dict) -> None:
+                 event_pars: dict,
+                 use_timing: bool = False,
+                 use_plausibility_check: bool = True) -> None:
 
         # --------------------------------------------------------------------------------------------------------------
         # CREATE OTHER REQUIRED OBJECTS --------------------------------------------------------------------------------
@@ -146,17 +163,37 @@ class Race(MonteCarlo, RaceAnalysis):
         self.racetimes = np.zeros((self.race_pars["tot_no_laps"] + 1, self.no_drivers))
         self.positions = np.zeros((self.race_pars["tot_no_laps"] + 1, self.no_drivers), dtype=np.int32)
         self.bool_driving = np.full((self.race_pars["tot_no_laps"] + 1, self.no_drivers), True)
+        self.idxs_driving = np.arange(self.no_drivers)  # updated incrementally when drivers retire
         self.progress = np.zeros(self.no_drivers)
 
         # create FCY related arrays
         self.fcy_data = copy.deepcopy(event_pars["fcy_data"])  # create copy to avoid changing the original dict
         self.retire_data = copy.deepcopy(event_pars["retire_data"])  # create copy to avoid changing the original dict
-        self.fcy_handling = {"sc_ghost_racetimes": [None] * self.no_drivers,
-                             "sc_ghost_laps": [None] * self.no_drivers,
-                             "idxs_act_phase": [None] * self.no_drivers,
-                             "idxs_next_phase": [0] * self.no_drivers,
-                             "start_end_prog": [[None, None] for _ in range(self.no_drivers)]}
+        self.fcy_handling = {"sc_ghost_racetimes": np.full(self.no_drivers, np.nan),
+                             "sc_ghost_laps": np.full(self.no_drivers, -1, dtype=np.int32),
+                             "idxs_act_phase": np.full(self.no_drivers, -1, dtype=np.int32),
+                             "idxs_next_phase": np.zeros(self.no_drivers, dtype=np.int32),
+                             "start_end_prog": np.full((self.no_drivers, 2), np.nan)}
         self.overtake_allowed = np.full((self.race_pars["tot_no_laps"] + 1, self.no_drivers), True)
+
+        # calculate required overtaking time advantage for every driver pair (including the modifiers due to velocity
+        # delta and teamorder) and determine the race time gap above which two consecutive drivers can neither duel
+        # nor overtake nor violate the minimum distance (used to split the field into clusters)
+        self.t_gap_overtake_tots = np.zeros((self.no_drivers, self.no_drivers))
+
+        for idx_driver_cur, driver_cur in enumerate(self.drivers_list):
+            for idx_driver_back, driver_back in enumerate(self.drivers_list):
+                if driver_cur.team == driver_back.team:
+                    t_gap_overtake_mod_teamorder = driver_back.t_teamorder
+                else:
+                    t_gap_overtake_mod_teamorder = 0.0
+
+                t_gap_overtake_mod_vel = self.track.t_gap_overtake_vel * (driver_back.vel_max - driver_cur.vel_max)
+                self.t_gap_overtake_tots[idx_driver_cur, idx_driver_back] = \
+                    self.track.t_gap_overtake + t_gap_overtake_mod_vel + t_gap_overtake_mod_teamorder
+
+        self.t_gap_interaction = max(self.race_pars["min_t_dist"], -float(np.min(self.t_gap_overtake_tots)))
+
         self.presim_info = {"fcy_phases_progress": [],
                             "race_duration": None,
                             "base_strategy_vse": None}
@@ -164,6 +201,11 @@ class Race(MonteCarlo, RaceAnalysis):
         # create result arrays/lists
         self.flagstates = ["G"] * (self.race_pars["tot_no_laps"] + 1)
         self.result_status = -1  # initialize -1 (result not available)
+        self.use_plausibility_check = use_plausibility_check
+
+        # create timing dict if timing instrumentation is activated
+        self.timing = racesim.src.timing.create_timing() if use_timing else None
+        self.__t_timing = 0.0
 
         # --------------------------------------------------------------------------------------------------------------
         # SET INITIAL CONDITIONS ---------------------------------------------------------------------------------------
@@ -204,6 +246,25 @@ class Race(MonteCarlo, RaceAnalysis):
                 else:
                     driver.strategy_info = [driver.strategy_info[0]]
 
+        # create arrays for the basic time losses (calculated at the start of the first lap since they depend on the pit
+        # stop schedule)
+        self.laptimes_free = np.zeros((self.race_pars["tot_no_laps"] + 1, self.no_drivers))
+        self.laptimes_free_outdated = np.full(self.no_drivers, True)
+
+        # compile strategy info of every driver into the pit stop schedule arrays
+        self.pit_schedule = {"inlaps": np.full((self.race_pars["tot_no_laps"] + 1, self.no_drivers), False),
+                             "compound_ids": np.full((self.race_pars["tot_no_laps"] + 1, self.no_drivers), -1,
+                                                     dtype=np.int8),
+                             "tire_ages": np.zeros((self.race_pars["tot_no_laps"] + 1, self.no_drivers),
+                                                   dtype=np.int32),
+                             "refuels": np.zeros((self.race_pars["tot_no_laps"] + 1, self.no_drivers)),
+                             "no_pitstops": np.zeros(self.no_drivers, dtype=np.int32),
+                             "used_2compounds": np.full(self.no_drivers, False),
+                             "compounds": []}
+
+        for idx_driver in range(self.no_drivers):
+            self.compile_pit_schedule(idx_driver=idx_driver)
+
         # --------------------------------------------------------------------------------------------------------------
         # PREPARE FCY PHASES AND RETIREMENTS ---------------------------------------------------------------------------
         # --------------------------------------------------------------------------------------------------------------
@@ -264,6 +325,10 @@ class Race(MonteCarlo, RaceAnalysis):
             if self.vse is not None:
                 self.presim_info["base_strategy_vse"] = presim_info_tmp[1]
 
+        # convert FCY phases and retirements into the arrays used during the race simulation
+        self.update_fcy_phase_arrays()
+        self.update_retirements_array()
+
     # ------------------------------------------------------------------------------------------------------------------
     # GETTERS / SETTERS ------------------------------------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
@@ -308,6 +373,18 @@ class Race(MonteCarlo, RaceAnalysis):
     def __set_pit_driver_idxs(self, x: List[int]) -> None: self.__pit_driver_idxs = x
     pit_driver_idxs = property(__get_pit_driver_idxs, __set_pit_driver_idxs)
 
+    def __get_pit_schedule(self) -> dict: return self.__pit_schedule
+    def __set_pit_schedule(self, x: dict) -> None: self.__pit_schedule = x
+    pit_schedule = property(__get_pit_schedule, __set_pit_schedule)
+
+    def __get_laptimes_free(self) -> np.ndarray: return self.__laptimes_free
+    def __set_laptimes_free(self, x: np.ndarray) -> None: self.__laptimes_free = x
+    laptimes_free = property(__get_laptimes_free, __set_laptimes_free)
+
+    def __get_laptimes_free_outdated(self) -> np.ndarray: return self.__laptimes_free_outdated
+    def __set_laptimes_free_outdated(self, x: np.ndarray) -> None: self.__laptimes_free_outdated = x
+    laptimes_free_outdated = property(__get_laptimes_free_outdated, __set_laptimes_free_outdated)
+
     def __get_pit_outlap_losses(self) -> np.ndarray: return self.__pit_outlap_losses
     def __set_pit_outlap_losses(self, x: np.ndarray) -> None: self.__pit_outlap_losses = x
     pit_outlap_losses = property(__get_pit_outlap_losses, __set_pit_outlap_losses)
@@ -328,6 +405,10 @@ class Race(MonteCarlo, RaceAnalysis):
     def __set_bool_driving(self, x: np.ndarray) -> None: self.__bool_driving = x
     bool_driving = property(__get_bool_driving, __set_bool_driving)
 
+    def __get_idxs_driving(self) -> np.ndarray: return self.__idxs_driving
+    def __set_idxs_driving(self, x: np.ndarray) -> None: self.__idxs_driving = x
+    idxs_driving = property(__get_idxs_driving, __set_idxs_driving)
+
     def __get_progress(self) -> np.ndarray: return self.__progress
     def __set_progress(self, x: np.ndarray) -> None: self.__progress = x
     progress = property(__get_progress, __set_progress)
@@ -340,6 +421,10 @@ class Race(MonteCarlo, RaceAnalysis):
     def __set_retire_data(self, x: dict) -> None: self.__retire_data = x
     retire_data = property(__get_retire_data, __set_retire_data)
 
+    def __get_retirements(self) -> np.ndarray: return self.__retirements
+    def __set_retirements(self, x: np.ndarray) -> None: self.__retirements = x
+    retirements = property(__get_retirements, __set_retirements)
+
     def __get_fcy_handling(self) -> dict: return self.__fcy_handling
     def __set_fcy_handling(self, x: dict) -> None: self.__fcy_handling = x
     fcy_handling = property(__get_fcy_handling, __set_fcy_handling)
@@ -348,6 +433,14 @@ class Race(MonteCarlo, RaceAnalysis):
     def __set_overtake_allowed(self, x: np.ndarray) -> None: self.__overtake_allowed = x
     overtake_allowed = property(__get_overtake_allowed, __set_overtake_allowed)
 
+    def __get_t_gap_overtake_tots(self) -> np.ndarray: return self.__t_gap_overtake_tots
+    def __set_t_gap_overtake_tots(self, x: np.ndarray) -> None: self.__t_gap_overtake_tots = x
+    t_gap_overtake_tots = property(__get_t_gap_overtake_tots, __set_t_gap_overtake_tots)
+
+    def __get_t_gap_interaction(self) -> float: return self.__t_gap_interaction
+    def __set_t_gap_interaction(self, x: float) -> None: self.__t_gap_interaction = x
+    t_gap_interaction = property(__get_t_gap_interaction, __set_t_gap_interaction)
+
     def __get_presim_info(self) -> dict: return self.__presim_info
     def __set_presim_info(self, x: dict) -> None: self.__presim_info = x
     presim_info = property(__get_presim_info, __set_presim_info)
@@ -369,6 +462,14 @@ class Race(MonteCarlo, RaceAnalysis):
     def __set_result_status(self, x: int) -> None: self.__result_status = x
     result_status = property(__get_result_status, __set_result_status)
 
+    def __get_use_plausibility_check(self) -> bool: return self.__use_plausibility_check
+    def __set_use_plausibility_check(self, x: bool) -> None: self.__use_plausibility_check = x
+    use_plausibility_check = property(__get_use_plausibility_check, __set_use_plausibility_check)
+
+    def __get_timing(self) -> dict or None: return self.__timing
+    def __set_timing(self, x: dict or None) -> None: self.__timing = x
+    timing = property(__get_timing, __set_timing)
+
     # ------------------------------------------------------------------------------------------------------------------
     # METHODS (MAIN METHODS) -------------------------------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
@@ -400,8 +501,21 @@ class Race(MonteCarlo, RaceAnalysis):
         # when race is finished drivers are allowed to finish current lap -> laped drivers will not complete all laps
         self.__reset_invalid_laps_aft_race()
 
-        # check plausibility of result
-        self.__check_plausibility()
+        # check plausibility of result (can be deactivated, e.g. to validate only every k-th race of a MCS)
+        if self.use_plausibility_check:
+            self.__check_plausibility()
+
+    def simulate_laps(self, no_laps: int) -> None:
+        """
+        This method can be called from outside to simulate the given number of laps (at most until the end of the race)
+        without finishing the race. This way, the race state can be evaluated or modified in between (e.g. to take
+        strategy decisions) before continuing the simulation with simulate_laps() or simulate_race().
+        """
+
+        lap_end = min(self.cur_lap + no_laps, self.race_pars["tot_no_laps"])
+
+        while self.cur_lap < lap_end:
+            self.__simulate_lap()
 
     def __simulate_lap(self) -> None:
         """
@@ -412,36 +526,50 @@ class Race(MonteCarlo, RaceAnalysis):
         the age of tires and the fuel consumption is updated by one lap. Subsequently the timeloss due to the race-
         situation is calculated, e.g. due to yellow flags. Finally, the calculated laptime is added to get the total
         racetime. It is used as a basis for the overtaking method.
+
+        If timing instrumentation is activated, the wall time of every phase is measured by __stop_timing() (otherwise
+        the call returns immediately).
         """
 
         # increment current lap and copy positions from last lap
         self.cur_lap += 1
         self.positions[self.cur_lap] = self.positions[self.cur_lap - 1]
 
+        if self.__timing is not None:
+            self.__t_timing = time.perf_counter()
+
         # check for pitstop outlaps
         self.__handle_pitstop_outlap()
+        self.__stop_timing(phase="pitstop_outlap")
 
         # calculate current lap time for all drivers
         self.__calc_laptimes()
+        self.__stop_timing(phase="calc_laptimes")
 
         # handle fcy phases -> increase lap times, forbid overtaking etc. if driver is within a FCY phase
         self.__handle_fcy()
+        self.__stop_timing(phase="fcy")
 
         # increase car age (i.e. consider fuel mass loss and tire degradation)
         self.__increase_car_age()
+        self.__stop_timing(phase="car_aging")
 
         # check for driver retirements (must be done after calculating the lap times to obtain a valid race time
         # estimation)
         self.__handle_driver_retirements()
+        self.__stop_timing(phase="retirements")
 
         # check overtaking and modify positions and laptimes according to overtaking time losses
         self.__handle_overtaking_track()
+        self.__stop_timing(phase="overtaking")
 
         # if VSE (virtual strategy engineer) is used it has to take the strategy decisions here
         self.__handle_vse()
+        self.__stop_timing(phase="vse")
 
         # check for pitstop inlaps
         self.__handle_pitstop_inlap()
+        self.__stop_timing(phase="pitstop_inlap")
 
         # perform some actions related to FCY phases after final lap times are known for current lap
         self.__fcy_phase_checks_aft_final_laptimes()
@@ -450,6 +578,18 @@ class Race(MonteCarlo, RaceAnalysis):
         self.racetimes[self.cur_lap, self.bool_driving[self.cur_lap]] = \
             self.racetimes[self.cur_lap - 1, self.bool_driving[self.cur_lap]] \
             + self.laptimes[self.cur_lap, self.bool_driving[self.cur_lap]]
+        self.__stop_timing(phase="fcy_checks")
+
+    def __stop_timing(self, phase: str) -> None:
+        """Add the wall time since the end of the previous phase to the given phase (if timing is activated)."""
+
+        if self.__timing is None:
+            return
+
+        t_cur = time.perf_counter()
+        self.__timing[phase]["t"] += t_cur - self.__t_timing
+        self.__timing[phase]["no_calls"] += 1
+        self.__t_timing = t_cur
 
     # ------------------------------------------------------------------------------------------------------------------
     # METHODS (RACE SIMULATION PARTS) ----------------------------------------------------------------------------------
@@ -488,7 +628,7 @@ class Race(MonteCarlo, RaceAnalysis):
                 # determine pit driving outlap time loss -> modified time loss if it happens under an active FCY phase
                 t_pitdrive_outlap_tmp = self.track.t_pitdrive_outlap
 
-                if self.fcy_handling["idxs_act_phase"][idx] is not None:
+                if self.fcy_handling["idxs_act_phase"][idx] >= 0:
                     check_fcy_phase = self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx]]
                 elif self.fcy_handling["idxs_next_phase"][idx] < len(self.fcy_data["phases"]):
                     check_fcy_phase = self.fcy_data["phases"][self.fcy_handling["idxs_next_phase"][idx]]
@@ -535,9 +675,11 @@ class Race(MonteCarlo, RaceAnalysis):
         """This method returns the standstill time loss during a pit stop that is caused by tire change and refueling.
         The time loss must be added to the inlap or outlap lap time based on the location of the finish line."""
 
-        # get relevant pitstop of currently pitting driver
-        rel_pitstop = next((pitstop for pitstop in self.drivers_list[idx_driver].strategy_info if inlap == pitstop[0]),
-                           None)
+        # get relevant pitstop of currently pitting driver from the pit stop schedule
+        rel_pitstop = [inlap,
+                       self.pit_schedule["compounds"][self.pit_schedule["compound_ids"][inlap, idx_driver]],
+                       int(self.pit_schedule["tire_ages"][inlap, idx_driver]),
+                       float(self.pit_schedule["refuels"][inlap, idx_driver])]
 
         # perform pit stop (depending on the drivetype)
         if self.drivers_list[idx_driver].car.drivetype == 'combustion':
@@ -588,24 +730,41 @@ class Race(MonteCarlo, RaceAnalysis):
         self.laptimes[self.cur_lap, self.bool_driving[self.cur_lap]] += self.track.t_q + self.track.t_gap_racepace
 
         # --------------------------------------------------------------------------------------------------------------
-        # CONSIDER DRIVER SPECIFIC TIME DELTAS -------------------------------------------------------------------------
+        # BASIC TIME LOSSES, STARTING GRID AND START TIME LOSS ---------------------------------------------------------
         # --------------------------------------------------------------------------------------------------------------
 
-        for idx in self.__get_driver_iter():
-
-            # ----------------------------------------------------------------------------------------------------------
-            # BASIC TIME LOSSES (INCLUDING CAR AND DRIVER CAPABILITIES AS WELL AS FUEL MASS LOSS AND TIRE DEGRADATION) -
-            # ----------------------------------------------------------------------------------------------------------
-
-            self.laptimes[self.cur_lap, idx] += \
-                self.drivers_list[idx].calc_basic_timeloss(use_prob_infl=self.use_prob_infl,
-                                                           t_lap_sens_mass=self.track.t_lap_sens_mass)
-
-            # ----------------------------------------------------------------------------------------------------------
-            # STARTING GRID AND START TIME LOSS ------------------------------------------------------------------------
-            # ----------------------------------------------------------------------------------------------------------
+        # update the precalculated basic time losses of the remaining laps for drivers whose car state or strategy did
+        # not develop as assumed (e.g. due to FCY phases or pit stops inserted by the VSE) -> if a FCY phase is still
+        # active for a driver, only the current lap is calculated since the car state will deviate again in this lap
+        for idx in self.idxs_driving[self.laptimes_free_outdated[self.idxs_driving]].tolist():
+            if self.fcy_handling["idxs_act_phase"][idx] >= 0:
+                self.laptimes_free[self.cur_lap, idx] = \
+                    self.drivers_list[idx].calc_basic_timeloss(use_prob_infl=False,
+                                                               t_lap_sens_mass=self.track.t_lap_sens_mass)
+            else:
+                self.__calc_laptimes_free(idx_driver=idx)
+
+        # add basic time losses (the random part is drawn lap by lap in the order of the drivers, i.e. in the same order
+        # as before the precalculation was introduced)
+        if self.cur_lap > 1:
+            if self.use_prob_infl:
+                self.laptimes[self.cur_lap, self.idxs_driving] += \
+                    self.laptimes_free[self.cur_lap, self.idxs_driving] \
+                    + np.array([random.gauss(0.0, self.drivers_list[idx].t_lap_var_sigma)
+                                for idx in self.idxs_driving.tolist()])
+            else:
+                self.laptimes[self.cur_lap, self.idxs_driving] += self.laptimes_free[self.cur_lap, self.idxs_driving]
 
-            if self.cur_lap == 1:
+        # starting grid and start time loss are added directly afterwards for every driver in the first lap (random
+        # start performance is drawn after the random part of the basic time loss of the same driver)
+        else:
+            for idx in self.idxs_driving.tolist():
+                if self.use_prob_infl:
+                    self.laptimes[self.cur_lap, idx] += \
+                        self.laptimes_free[self.cur_lap, idx] \
+                        + random.gauss(0.0, self.drivers_list[idx].t_lap_var_sigma)
+                else:
+                    self.laptimes[self.cur_lap, idx] += self.laptimes_free[self.cur_lap, idx]
 
                 # timeloss at race start due to start from standstill
                 self.laptimes[self.cur_lap, idx] += self.track.t_loss_firstlap
@@ -619,40 +778,45 @@ class Race(MonteCarlo, RaceAnalysis):
                         random.gauss(self.drivers_list[idx].t_startperf["mean"],
                                      self.drivers_list[idx].t_startperf["sigma"])
 
-            # ----------------------------------------------------------------------------------------------------------
-            # DRS ------------------------------------------------------------------------------------------------------
-            # ----------------------------------------------------------------------------------------------------------
-
-            if self.race_pars["use_drs"] and self.cur_lap >= self.race_pars["drs_act_lap"][idx]:
-                # we assume that the first half of the DRS gain happens on the start finish straight, which is why we
-                # base the check on the race state before the pit stop outlap handling
-                if self.positions[self.cur_lap - 1, idx] > 1:
-                    # get bool array with driver in front of current driver at the end of the previous lap
-                    pos_front_b = self.positions[self.cur_lap - 1] == self.positions[self.cur_lap - 1, idx] - 1
-
-                    # skip DRS check if driver in front was in the pit lane
-                    pos_front_idx = np.argmax(pos_front_b)
-                    if pos_front_idx in self.pit_driver_idxs:
-                        continue
+        # --------------------------------------------------------------------------------------------------------------
+        # DRS ----------------------------------------------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
 
-                    # activate DRS (half effect) if driver was within the DRS window at the end of the previous lap
-                    if self.racetimes[self.cur_lap - 1, idx] - self.racetimes[self.cur_lap - 1, pos_front_b] \
-                            <= self.race_pars["drs_window"]:
-                        # t_drseffect is negative
-                        self.laptimes[self.cur_lap, idx] += self.track.t_drseffect / 2.0
-
-                # we assume that the second half of the DRS gain happens elsewhere on the track, which is why we base
-                # the check on the race state after the pit stop outlap handling
-                if self.positions[self.cur_lap, idx] > 1:
-                    # get bool array with driver in front of current driver after the pit stop outlap handling
-                    pos_front_b = self.positions[self.cur_lap] == self.positions[self.cur_lap, idx] - 1
-
-                    # activate DRS (half effect) if driver is within the DRS window after the pit stop outlap handling
-                    if (self.racetimes[self.cur_lap - 1, idx] + self.pit_outlap_losses[idx]) \
-                            - (self.racetimes[self.cur_lap - 1, pos_front_b] + self.pit_outlap_losses[pos_front_b]) \
-                            <= self.race_pars["drs_window"]:
-                        # t_drseffect is negative
-                        self.laptimes[self.cur_lap, idx] += self.track.t_drseffect / 2.0
+        if not self.race_pars["use_drs"]:
+            return
+
+        idxs_drs = self.idxs_driving[self.cur_lap >= np.asarray(self.race_pars["drs_act_lap"])[self.idxs_driving]]
+
+        # we assume that the first half of the DRS gain happens on the start finish straight, which is why we base the
+        # check on the race state before the pit stop outlap handling
+        idxs_at_pos = np.argsort(self.positions[self.cur_lap - 1])  # driver index for every position
+        bool_not_first = self.positions[self.cur_lap - 1, idxs_drs] > 1
+        idxs_front = idxs_at_pos[self.positions[self.cur_lap - 1, idxs_drs] - 2]  # invalid for leading driver
+
+        # skip DRS check (both halves) if driver in front was in the pit lane
+        bool_check = ~(bool_not_first & np.isin(idxs_front, self.pit_driver_idxs))
+        idxs_drs = idxs_drs[bool_check]
+        idxs_front = idxs_front[bool_check]
+        bool_not_first = bool_not_first[bool_check]
+
+        # activate DRS (half effect) if driver was within the DRS window at the end of the previous lap (t_drseffect is
+        # negative)
+        bool_window = bool_not_first & (self.racetimes[self.cur_lap - 1, idxs_drs]
+                                        - self.racetimes[self.cur_lap - 1, idxs_front]
+                                        <= self.race_pars["drs_window"])
+        self.laptimes[self.cur_lap, idxs_drs[bool_window]] += self.track.t_drseffect / 2.0
+
+        # we assume that the second half of the DRS gain happens elsewhere on the track, which is why we base the check
+        # on the race state after the pit stop outlap handling
+        idxs_at_pos = np.argsort(self.positions[self.cur_lap])
+        idxs_drs = idxs_drs[self.positions[self.cur_lap, idxs_drs] > 1]
+        idxs_front = idxs_at_pos[self.positions[self.cur_lap, idxs_drs] - 2]
+
+        # activate DRS (half effect) if driver is within the DRS window after the pit stop outlap handling
+        bool_window = (self.racetimes[self.cur_lap - 1, idxs_drs] + self.pit_outlap_losses[idxs_drs]) \
+            - (self.racetimes[self.cur_lap - 1, idxs_front] + self.pit_outlap_losses[idxs_front]) \
+            <= self.race_pars["drs_window"]
+        self.laptimes[self.cur_lap, idxs_drs[bool_window]] += self.track.t_drseffect / 2.0
 
     def __handle_fcy(self) -> None:
         """
@@ -676,79 +840,93 @@ class Race(MonteCarlo, RaceAnalysis):
         # CONSIDER FCY INDUCED LAP TIME INCREASE AND SAFETY CAR (CONSIDERED AS GHOST CAR) ------------------------------
         # --------------------------------------------------------------------------------------------------------------
 
-        for idx in self.__get_driver_iter():
-            # perform FCY phase activation
-            self.check_fcyphase_activation(idx_driver=idx)
+        # perform FCY phase activation for all driving drivers
+        idxs_driving = self.idxs_driving
+        self.check_fcyphase_activation(idxs_driver=idxs_driving)
 
-            # in case of an active FCY phase perform the further steps
-            if self.fcy_handling["idxs_act_phase"][idx] is not None:
-                # ------------------------------------------------------------------------------------------------------
-                # FCY PHASE PART ---------------------------------------------------------------------------------------
-                # ------------------------------------------------------------------------------------------------------
+        # in case of an active FCY phase perform the further steps (only for the affected drivers)
+        idxs_fcy = idxs_driving[self.fcy_handling["idxs_act_phase"][idxs_driving] >= 0]
 
-                # get current phase information
-                cur_fcy_phase = self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx]]
+        if idxs_fcy.size == 0:
+            return
 
-                # update lap_influences dict of affected driver
-                self.drivers_list[idx].update_lap_influences(cur_lap=self.cur_lap,
-                                                             influence_type=cur_fcy_phase[2].lower())
+        # --------------------------------------------------------------------------------------------------------------
+        # FCY PHASE PART -----------------------------------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
 
-                # determine lap fraction driven normally
-                lap_frac_normal, lap_frac_normal_bef = self.calc_lapfracs_fcyphase(idx_driver=idx)
+        # get current phase information
+        idxs_act_phase = self.fcy_handling["idxs_act_phase"][idxs_fcy]
+        mask_sc = self.fcy_handling["phase_is_sc"][idxs_act_phase]
 
-                # set FCY lap time for current driver
-                laptime_tmp = (lap_frac_normal * self.laptimes[self.cur_lap, idx]
-                               + (1.0 - lap_frac_normal) * self.track.t_lap_fcy)
+        # update lap_influences dict of affected drivers
+        for idx, is_sc in zip(idxs_fcy, mask_sc):
+            self.drivers_list[idx].update_lap_influences(cur_lap=self.cur_lap, influence_type='sc' if is_sc else 'vsc')
 
-                if self.laptimes[self.cur_lap, idx] < laptime_tmp:
-                    self.laptimes[self.cur_lap, idx] = laptime_tmp
+        # determine lap fractions driven normally
+        lap_frac_normal, lap_frac_normal_bef = self.calc_lapfracs_fcyphase(idxs_driver=idxs_fcy)
 
-                # determine if overtaking is allowed in current lap for current driver
-                if lap_frac_normal < 0.5 or cur_fcy_phase[2] == 'SC':
-                    # an SC always leads to forbidden overtaking for the whole lap (this would cause problems since
-                    # the safety car is handled before the overtaking and therefore positions changes could lead to
-                    # wrong minimum distances etc.), for VSC it is forbidden if at least half of the lap is affected
-                    self.overtake_allowed[self.cur_lap, idx] = False
+        # set FCY lap times for affected drivers
+        laptimes_cur_lap = self.laptimes[self.cur_lap, idxs_fcy]
+        laptimes_tmp = lap_frac_normal * laptimes_cur_lap + (1.0 - lap_frac_normal) * self.track.t_lap_fcy
+        self.laptimes[self.cur_lap, idxs_fcy] = np.where(laptimes_cur_lap < laptimes_tmp, laptimes_tmp,
+                                                         laptimes_cur_lap)
 
-                # set start and end progress information (used for VSE)
-                if self.fcy_handling["start_end_prog"][idx][0] is None:
-                    # start progress must only be set if phase was newly started
-                    self.fcy_handling["start_end_prog"][idx][0] = self.cur_lap - 1.0 + lap_frac_normal_bef
+        # determine if overtaking is allowed in current lap for affected drivers -> an SC always leads to forbidden
+        # overtaking for the whole lap (this would cause problems since the safety car is handled before the overtaking
+        # and therefore positions changes could lead to wrong minimum distances etc.), for VSC it is forbidden if at
+        # least half of the lap is affected
+        self.overtake_allowed[self.cur_lap, idxs_fcy[(lap_frac_normal < 0.5) | mask_sc]] = False
 
-                self.fcy_handling["start_end_prog"][idx][1] = self.cur_lap - (lap_frac_normal - lap_frac_normal_bef)
+        # set start and end progress information (used for VSE), start progress must only be set if phase was newly
+        # started
+        mask_new = np.isnan(self.fcy_handling["start_end_prog"][idxs_fcy, 0])
+        self.fcy_handling["start_end_prog"][idxs_fcy[mask_new], 0] = self.cur_lap - 1.0 + lap_frac_normal_bef[mask_new]
+        self.fcy_handling["start_end_prog"][idxs_fcy, 1] = self.cur_lap - (lap_frac_normal - lap_frac_normal_bef)
 
-                # ------------------------------------------------------------------------------------------------------
-                # SAFETY CAR PART --------------------------------------------------------------------------------------
-                # ------------------------------------------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
+        # SAFETY CAR PART ----------------------------------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
 
-                if cur_fcy_phase[2] == 'SC':
-                    # set ghost car race time (the same for all drivers in the same lap, minimum distance between
-                    # positions is considered afterwards) and lap counter
-                    if self.fcy_handling["sc_ghost_racetimes"][idx] is None:
-                        self.fcy_handling["sc_ghost_racetimes"][idx] = cur_fcy_phase[0]
-                        self.fcy_handling["sc_ghost_laps"][idx] = 0  # 0 equals start lap
-                    else:
-                        self.fcy_handling["sc_ghost_racetimes"][idx] += self.track.t_lap_sc
-                        self.fcy_handling["sc_ghost_laps"][idx] += 1
+        idxs_sc = idxs_fcy[mask_sc]
+
+        if idxs_sc.size == 0:
+            return
+
+        idxs_sc_phase = idxs_act_phase[mask_sc]
 
-                        # the SC ghost lap time is increased in its first lap such that the driver field runs up quicker
-                        # the according information was stored in the FCY phase after the pre simulation (SC delay)
-                        if self.fcy_handling["sc_ghost_laps"][idx] == 1:
-                            self.fcy_handling["sc_ghost_racetimes"][idx] += cur_fcy_phase[3]
+        # set ghost car race time (the same for all drivers in the same lap, minimum distance between positions is
+        # considered afterwards) and lap counter
+        sc_ghost_racetimes = self.fcy_handling["sc_ghost_racetimes"][idxs_sc]
+        sc_ghost_laps = self.fcy_handling["sc_ghost_laps"][idxs_sc]
+        mask_ghost_new = np.isnan(sc_ghost_racetimes)
 
-                    # increase the laptime if a driver would pass his designated position behind the ghost car (minimum
-                    # distance to ghost car / front driver is considered on the basis of the current position)
-                    racetime_incl_fcy = self.racetimes[self.cur_lap - 1, idx] + self.laptimes[self.cur_lap, idx]
-                    sc_ghost_incl_min_dist = (self.fcy_handling["sc_ghost_racetimes"][idx]
-                                              + self.positions[self.cur_lap, idx] * self.race_pars['min_t_dist_sc'])
+        sc_ghost_racetimes = np.where(mask_ghost_new, self.fcy_handling["phase_starts"][idxs_sc_phase],
+                                      sc_ghost_racetimes + self.track.t_lap_sc)
+        sc_ghost_laps = np.where(mask_ghost_new, 0, sc_ghost_laps + 1)  # 0 equals start lap
 
-                    if racetime_incl_fcy < sc_ghost_incl_min_dist:
-                        self.laptimes[self.cur_lap, idx] = (sc_ghost_incl_min_dist
-                                                            - self.racetimes[self.cur_lap - 1, idx])
+        # the SC ghost lap time is increased in its first lap such that the driver field runs up quicker, the according
+        # information was stored in the FCY phase after the pre simulation (SC delay)
+        mask_first_lap = sc_ghost_laps == 1
+        sc_ghost_racetimes[mask_first_lap] += self.fcy_handling["phase_sc_delays"][idxs_sc_phase[mask_first_lap]]
 
-                    # DRS usage is not allowed directly after an SC phase (+ 1 because current lap is still SC)
-                    if self.race_pars["use_drs"]:
-                        self.race_pars["drs_act_lap"][idx] = self.cur_lap + 1 + self.race_pars["drs_sc_delay"]
+        self.fcy_handling["sc_ghost_racetimes"][idxs_sc] = sc_ghost_racetimes
+        self.fcy_handling["sc_ghost_laps"][idxs_sc] = sc_ghost_laps
+
+        # increase the laptime if a driver would pass his designated position behind the ghost car (minimum distance to
+        # ghost car / front driver is considered on the basis of the current position)
+        racetimes_prev_lap = self.racetimes[self.cur_lap - 1, idxs_sc]
+        racetimes_incl_fcy = racetimes_prev_lap + self.laptimes[self.cur_lap, idxs_sc]
+        sc_ghost_incl_min_dist = (sc_ghost_racetimes
+                                  + self.positions[self.cur_lap, idxs_sc] * self.race_pars['min_t_dist_sc'])
+        mask_behind_sc = racetimes_incl_fcy < sc_ghost_incl_min_dist
+
+        self.laptimes[self.cur_lap, idxs_sc[mask_behind_sc]] = \
+            sc_ghost_incl_min_dist[mask_behind_sc] - racetimes_prev_lap[mask_behind_sc]
+
+        # DRS usage is not allowed directly after an SC phase (+ 1 because current lap is still SC)
+        if self.race_pars["use_drs"]:
+            for idx in idxs_sc:
+                self.race_pars["drs_act_lap"][idx] = self.cur_lap + 1 + self.race_pars["drs_sc_delay"]
 
     def __increase_car_age(self) -> None:
         """
@@ -757,20 +935,29 @@ class Race(MonteCarlo, RaceAnalysis):
         phase.
         """
 
-        for idx in self.__get_driver_iter():
-            if self.fcy_handling["idxs_act_phase"][idx] is None:
-                cur_fcy_type = None
-                lap_frac_normal = 1.0
-            else:
-                cur_fcy_type = self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx]][2]
-                lap_frac_normal = self.calc_lapfracs_fcyphase(idx_driver=idx)[0]
+        # determine FCY types and lap fractions driven normally (FCY phases active) for all driving drivers at once
+        idxs_driving = self.idxs_driving
+        cur_fcy_types = [None] * self.no_drivers
+        lap_fracs_normal = [1.0] * self.no_drivers
 
+        idxs_fcy = idxs_driving[self.fcy_handling["idxs_act_phase"][idxs_driving] >= 0]
+
+        if idxs_fcy.size > 0:
+            for idx, lap_frac_normal in zip(idxs_fcy.tolist(),
+                                            self.calc_lapfracs_fcyphase(idxs_driver=idxs_fcy)[0].tolist()):
+                cur_fcy_types[idx] = self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx]][2]
+                lap_fracs_normal[idx] = lap_frac_normal
+
+        for idx in idxs_driving.tolist():
             # remaining_laps must be inserted on the state before this lap to calculate the correct fuel consumption
             # (if the automatic consumption adjustment is activated)
-            self.drivers_list[idx].car.drive_lap(cur_fcy_type=cur_fcy_type,
-                                                 lap_frac_normal=lap_frac_normal,
+            self.drivers_list[idx].car.drive_lap(cur_fcy_type=cur_fcy_types[idx],
+                                                 lap_frac_normal=lap_fracs_normal[idx],
                                                  remaining_laps=self.race_pars["tot_no_laps"] - (self.cur_lap - 1))
 
+        # car aging under FCY phases differs from the precalculated basic time losses
+        self.laptimes_free_outdated[idxs_fcy] = True
+
     def __handle_driver_retirements(self) -> None:
         """
         This method checks for driver retirements in the current lap. If a driver retires he must be sorted to the end
@@ -783,66 +970,64 @@ class Race(MonteCarlo, RaceAnalysis):
         else:
             racetimes_tmp = None
 
-        # if driver retires update bool_driving and set estimated lap progress, else set lap progress until end of lap
-        for idx in self.__get_driver_iter():
-            if self.retire_data["retirements"][idx] is not None \
-                    and ((self.retire_data["domain"] == 'time'
-                          and racetimes_tmp[idx] > self.retire_data["retirements"][idx])
-                         or (self.retire_data["domain"] == 'progress'
-                             and self.cur_lap > self.retire_data["retirements"][idx])):
+        # determine retiring drivers (NaN entries never retire)
+        retirements_driving = self.retirements[self.idxs_driving]
 
-                # update bool_driving
-                self.bool_driving[self.cur_lap:, idx] = False
+        if self.retire_data["domain"] == 'time':
+            bool_retire = racetimes_tmp[self.idxs_driving] > retirements_driving
+        else:
+            bool_retire = self.cur_lap > retirements_driving
 
-                # update lap_influences dict of affected driver
-                self.drivers_list[idx].update_lap_influences(cur_lap=self.cur_lap, influence_type='retiring')
+        # drivers that will finish the current lap -> set according lap progress
+        self.progress[self.idxs_driving[~bool_retire]] = self.cur_lap
 
-                # set estimated lap progress until retirement based on the currently estimated lap time or the progress
-                if self.retire_data["domain"] == 'time':
-                    progress_tmp = (self.retire_data["retirements"][idx]
-                                    - self.racetimes[self.cur_lap - 1, idx]) / self.laptimes[self.cur_lap, idx]
-                else:
-                    progress_tmp = math.modf(self.retire_data["retirements"][idx])[0]
+        if not np.any(bool_retire):
+            return
 
-                    # convert retirement data domain to race time
-                    self.retire_data["retirements"][idx] = (self.racetimes[self.cur_lap - 1, idx]
-                                                            + progress_tmp * self.laptimes[self.cur_lap, idx])
+        idxs_retired = self.idxs_driving[bool_retire]
+        retirements_tmp = retirements_driving[bool_retire]
 
-                # if final race time of the previous lap changed after the execution of this function it could happen
-                # that a driver should have retired in the last lap already leading to a negative progress calculation
-                self.progress[idx] += max(progress_tmp, 0.0)
+        # update active driver indices and bool_driving
+        self.idxs_driving = self.idxs_driving[~bool_retire]
+        self.bool_driving[self.cur_lap:, idxs_retired] = False
 
-            else:
-                # driver will finish the current lap -> set according lap progress
-                self.progress[idx] = self.cur_lap
-
-        # set correct position for every retired driver, update racetimes and laptimes arrays and sort drivers
-        bool_retire_new = self.bool_driving[self.cur_lap] != self.bool_driving[self.cur_lap - 1]
-
-        if np.any(bool_retire_new):
-            # get indices of newly retired drivers
-            idxs_retired = np.flatnonzero(bool_retire_new)
-
-            # sort idxs_retired by ascending progress and descending positions (i.e. worst driver first) such that
-            # positions can be set in the correct order afterwards when going from back to front
-            sorted_idxs = np.lexsort((-self.positions[self.cur_lap, bool_retire_new], self.progress[bool_retire_new]))
-            idxs_retired_sorted = idxs_retired[sorted_idxs]
-
-            for idx in idxs_retired_sorted:
-                # determine last position of all drivers that were driving until now (driving_bool used instead
-                # self.bool_driving to also work if more than one driver retires in the same lap)
-                driving_bool = np.invert(np.isnan(self.racetimes[self.cur_lap]))
-                last_pos_driving = np.sum(driving_bool)
-
-                # set last position for retiring driver and nan for the lap times and race times
-                self.positions[self.cur_lap:, idx] = last_pos_driving
-                self.laptimes[self.cur_lap:, idx] = np.nan
-                self.racetimes[self.cur_lap:, idx] = np.nan
-
-            # if a new driver retired sort him to the end and sort actually driving drivers to the front using
-            # check_pos_changes_wo_timeloss. check_min_dist is not performed because the time deltas in between the cars
-            # do not change due to a retirement.
-            self.__check_pos_changes_wo_timeloss()
+        # update lap_influences dict of affected drivers
+        for idx in idxs_retired.tolist():
+            self.drivers_list[idx].update_lap_influences(cur_lap=self.cur_lap, influence_type='retiring')
+
+        # set estimated lap progress until retirement based on the currently estimated lap time or the progress
+        if self.retire_data["domain"] == 'time':
+            progress_tmp = (retirements_tmp - self.racetimes[self.cur_lap - 1, idxs_retired]) \
+                / self.laptimes[self.cur_lap, idxs_retired]
+        else:
+            progress_tmp = np.modf(retirements_tmp)[0]
+
+            # convert retirement data domain to race time
+            retirements_tmp = self.racetimes[self.cur_lap - 1, idxs_retired] \
+                + progress_tmp * self.laptimes[self.cur_lap, idxs_retired]
+            self.retirements[idxs_retired] = retirements_tmp
+
+            for idx, retirement in zip(idxs_retired.tolist(), retirements_tmp):
+                self.retire_data["retirements"][idx] = retirement
+
+        # if final race time of the previous lap changed after the execution of this function it could happen that a
+        # driver should have retired in the last lap already leading to a negative progress calculation
+        self.progress[idxs_retired] += np.maximum(progress_tmp, 0.0)
+
+        # sort idxs_retired by ascending progress and descending positions (i.e. worst driver first) and assign the last
+        # positions of all drivers that were driving until now from back to front, set nan for the lap and race times
+        idxs_retired_sorted = idxs_retired[np.lexsort((-self.positions[self.cur_lap, idxs_retired],
+                                                       self.progress[idxs_retired]))]
+        last_pos_driving = np.count_nonzero(~np.isnan(self.racetimes[self.cur_lap]))
+
+        self.positions[self.cur_lap:, idxs_retired_sorted] = last_pos_driving - np.arange(idxs_retired_sorted.size)
+        self.laptimes[self.cur_lap:, idxs_retired_sorted] = np.nan
+        self.racetimes[self.cur_lap:, idxs_retired_sorted] = np.nan
+
+        # if a new driver retired sort him to the end and sort actually driving drivers to the front using
+        # check_pos_changes_wo_timeloss. check_min_dist is not performed because the time deltas in between the cars do
+        # not change due to a retirement.
+        self.__check_pos_changes_wo_timeloss()
 
     def __handle_overtaking_track(self) -> None:
         """
@@ -855,6 +1040,9 @@ class Race(MonteCarlo, RaceAnalysis):
         # calculate racetimes based on the temporary laptimes
         racetimes_tmp = self.racetimes[self.cur_lap - 1] + self.laptimes[self.cur_lap]
 
+        # get driver indices sorted by position (updated if a position change occurs)
+        idxs_at_pos = np.argsort(self.positions[self.cur_lap]).tolist()
+
         # loop through overtaking check as long as there are position changes to allow multiple overtaking within a lap
         # (e.g. if a driver is so fast that he overtakes two drivers in front)
         pos_change_occured_b = True
@@ -865,6 +1053,9 @@ class Race(MonteCarlo, RaceAnalysis):
             ctr += 1  # increase loop counter
             pos_change_occured_b = False  # terminate if there is no position change in current iteration
 
+            if self.__timing is not None:
+                self.__timing["overtaking"]["no_sweeps"] += 1
+
             # detect and break possible infinite loop -> under certain circumstances (e.g. t_overtake_loser very small)
             # it could happen that drivers will overtake each other again and again leading to an infinite loop
             if ctr > 20:
@@ -873,23 +1064,45 @@ class Race(MonteCarlo, RaceAnalysis):
                 self.result_status = 10
                 break
 
+            """Split the field into clusters of drivers within interaction range: two consecutive drivers whose race
+            time gap is larger than t_gap_interaction can neither duel nor overtake nor violate the minimum distance,
+            i.e. only pairs within a cluster must be checked (NaN gaps, e.g. of retired drivers, do not separate). The
+            gap of a pair can only decrease within a sweep if the pair in front of it was checked since this can slow
+            down or exchange the front driver of the pair. Therefore, the gap is checked again in this case."""
+
+            bool_separated = (np.diff(racetimes_tmp[idxs_at_pos]) > self.t_gap_interaction).tolist()
+            check_gap = False
+
             # go through positions from front to back and check if driver is within overtake window
             for pos_iter in range(1, self.no_drivers):
-                # using bool vectors instead of indices as in __assure_min_dists since positions can change during the
-                # iterations
-                pos_cur_b = self.positions[self.cur_lap] == pos_iter          # bool vector current position
-                pos_back_b = self.positions[self.cur_lap] == pos_iter + 1     # bool vector backman position
+                idx_driver_cur = idxs_at_pos[pos_iter - 1]
+                idx_driver_back = idxs_at_pos[pos_iter]
 
                 # continue only if driver behind is still driving
-                if not self.bool_driving[self.cur_lap, pos_back_b]:
+                if not self.bool_driving[self.cur_lap, idx_driver_back]:
                     break
 
+                # skip pair if the drivers are in different clusters
+                if check_gap:
+                    if racetimes_tmp[idx_driver_back] - racetimes_tmp[idx_driver_cur] > self.t_gap_interaction:
+                        check_gap = False
+                        continue
+
+                elif bool_separated[pos_iter - 1]:
+                    continue
+
+                check_gap = True
+
+                if self.__timing is not None:
+                    self.__timing["overtaking"]["no_pairs"] += 1
+
                 # ------------------------------------------------------------------------------------------------------
                 # DETERMINE IF OVERTAKING IS ALLOWED -------------------------------------------------------------------
                 # ------------------------------------------------------------------------------------------------------
 
                 overtake_allowed = \
-                    self.overtake_allowed[self.cur_lap, pos_cur_b] and self.overtake_allowed[self.cur_lap, pos_back_b]
+                    self.overtake_allowed[self.cur_lap, idx_driver_cur] \
+                    and self.overtake_allowed[self.cur_lap, idx_driver_back]
 
                 # ------------------------------------------------------------------------------------------------------
                 # APPLY DUEL TIME LOSS ---------------------------------------------------------------------------------
@@ -897,58 +1110,38 @@ class Race(MonteCarlo, RaceAnalysis):
 
                 # apply t_duel if overtaking is allowed and drivers are in short distance -> once per driver and lap
                 if overtake_allowed \
-                        and racetimes_tmp[pos_cur_b] - racetimes_tmp[pos_back_b] > -self.race_pars["min_t_dist"]:
-                    if not t_duel_applied[pos_cur_b]:
-                        self.laptimes[self.cur_lap, pos_cur_b] += self.race_pars["t_duel"]
-                        racetimes_tmp[pos_cur_b] += self.race_pars["t_duel"]
-                        t_duel_applied[pos_cur_b] = True
-
-                    if not t_duel_applied[pos_back_b]:
-                        self.laptimes[self.cur_lap, pos_back_b] += self.race_pars["t_duel"]
-                        racetimes_tmp[pos_back_b] += self.race_pars["t_duel"]
-                        t_duel_applied[pos_back_b] = True
-
-                # ------------------------------------------------------------------------------------------------------
-                # CALCULATE T_GAP_OVERTAKE MODIFIERS -------------------------------------------------------------------
-                # ------------------------------------------------------------------------------------------------------
-
-                if overtake_allowed:
-                    # get t_gap_overtake modifier due to teamorder
-                    idx_driver_cur = int(np.argmax(pos_cur_b))
-                    idx_driver_back = int(np.argmax(pos_back_b))
-
-                    if self.drivers_list[idx_driver_cur].team == self.drivers_list[idx_driver_back].team:
-                        t_gap_overtake_mod_teamorder = self.drivers_list[idx_driver_back].t_teamorder
-                    else:
-                        t_gap_overtake_mod_teamorder = 0.0
-
-                    # calculate velocity-delta dependent modificiation of t_gap_overtake
-                    vel_delta = self.drivers_list[idx_driver_back].vel_max - self.drivers_list[
-                        idx_driver_cur].vel_max
-                    t_gap_overtake_mod_vel = self.track.t_gap_overtake_vel * vel_delta
-
-                    # get final required overtaking time advantage
-                    t_gap_overtake_tot = (self.track.t_gap_overtake + t_gap_overtake_mod_vel
-                                          + t_gap_overtake_mod_teamorder)
-
-                else:
-                    t_gap_overtake_tot = None
+                        and racetimes_tmp[idx_driver_cur] - racetimes_tmp[idx_driver_back] \
+                        > -self.race_pars["min_t_dist"]:
+                    if not t_duel_applied[idx_driver_cur]:
+                        self.laptimes[self.cur_lap, idx_driver_cur] += self.race_pars["t_duel"]
+                        racetimes_tmp[idx_driver_cur] += self.race_pars["t_duel"]
+                        t_duel_applied[idx_driver_cur] = True
+
+                    if not t_duel_applied[idx_driver_back]:
+                        self.laptimes[self.cur_lap, idx_driver_back] += self.race_pars["t_duel"]
+                        racetimes_tmp[idx_driver_back] += self.race_pars["t_duel"]
+                        t_duel_applied[idx_driver_back] = True
 
                 # ------------------------------------------------------------------------------------------------------
                 # CHECK FOR OVERTAKE MANEUVER AND SET MINIMUM DISTANCE OTHERWISE ---------------------------------------
                 # ------------------------------------------------------------------------------------------------------
 
-                # overtake if driver behind is fast enough and overtaking is allowed due to flags
-                if overtake_allowed and racetimes_tmp[pos_cur_b] - racetimes_tmp[pos_back_b] >= t_gap_overtake_tot:
+                # overtake if driver behind is fast enough (required time advantage including the modifiers due to
+                # velocity delta and teamorder, see t_gap_overtake_tots) and overtaking is allowed due to flags
+                if overtake_allowed \
+                        and racetimes_tmp[idx_driver_cur] - racetimes_tmp[idx_driver_back] \
+                        >= self.t_gap_overtake_tots[idx_driver_cur, idx_driver_back]:
 
                     # update positions
-                    self.positions[self.cur_lap, pos_cur_b] += 1
-                    self.positions[self.cur_lap, pos_back_b] -= 1
+                    self.positions[self.cur_lap, idx_driver_cur] += 1
+                    self.positions[self.cur_lap, idx_driver_back] -= 1
+                    idxs_at_pos[pos_iter - 1] = idx_driver_back
+                    idxs_at_pos[pos_iter] = idx_driver_cur
 
                     # increase lap time of overtaken driver because he usually could not drive on the raceline if he was
                     # overtaken -> eases multiple overtaking
-                    self.laptimes[self.cur_lap, pos_cur_b] += self.race_pars["t_overtake_loser"]
-                    racetimes_tmp[pos_cur_b] += self.race_pars["t_overtake_loser"]
+                    self.laptimes[self.cur_lap, idx_driver_cur] += self.race_pars["t_overtake_loser"]
+                    racetimes_tmp[idx_driver_cur] += self.race_pars["t_overtake_loser"]
 
                     """Depending on the race time gaps between the drivers it can temporarily happen that the minimum
                     temporal distance is not kept within this for-loop. Since we loop at least once more after an
@@ -960,12 +1153,12 @@ class Race(MonteCarlo, RaceAnalysis):
                 # if driver behind is faster than frontman, but not fast enough or if he is in a too short distance to
                 # him or if overtaking is not allowed due to flags: set laptime and racetime according to minimum
                 # distance min_t_dist
-                elif racetimes_tmp[pos_cur_b] - racetimes_tmp[pos_back_b] > -self.race_pars["min_t_dist"]:
+                elif racetimes_tmp[idx_driver_cur] - racetimes_tmp[idx_driver_back] > -self.race_pars["min_t_dist"]:
 
                     # keep minimum distance between front and rear driver
-                    self.laptimes[self.cur_lap, pos_back_b] += \
-                        racetimes_tmp[pos_cur_b] + self.race_pars["min_t_dist"] - racetimes_tmp[pos_back_b]
-                    racetimes_tmp[pos_back_b] = racetimes_tmp[pos_cur_b] + self.race_pars["min_t_dist"]
+                    self.laptimes[self.cur_lap, idx_driver_back] += \
+                        racetimes_tmp[idx_driver_cur] + self.race_pars["min_t_dist"] - racetimes_tmp[idx_driver_back]
+                    racetimes_tmp[idx_driver_back] = racetimes_tmp[idx_driver_cur] + self.race_pars["min_t_dist"]
 
     def __handle_vse(self) -> None:
         """This method handles the VSE (virtual strategy engineer) which is used to take race strategy related decisions
@@ -977,22 +1170,21 @@ class Race(MonteCarlo, RaceAnalysis):
             next_compound = self.vse.\
                 decide_pitstop(driver_initials=[driver.initials for driver in self.drivers_list],
                                cur_compounds=[driver.car.tireset.compound for driver in self.drivers_list],
-                               no_past_tirechanges=[len(driver.strategy_info) - 1 for driver in self.drivers_list],
+                               no_past_tirechanges=self.pit_schedule["no_pitstops"].tolist(),
                                tire_ages=[driver.car.tireset.age_degr for driver in self.drivers_list],
                                positions_prevlap=self.positions[self.cur_lap - 1],
                                pit_prevlap=[True if idx in self.pit_driver_idxs else False
                                             for idx in range(self.no_drivers)],
                                cur_lap=self.cur_lap,
                                tot_no_laps=self.race_pars["tot_no_laps"],
-                               fcy_types=[self.fcy_data["phases"][idx_phase][2] if idx_phase is not None
+                               fcy_types=[self.fcy_data["phases"][idx_phase][2] if idx_phase >= 0
                                           else None for idx_phase in self.fcy_handling["idxs_act_phase"]],
                                fcy_start_end_progs=self.fcy_handling["start_end_prog"],
                                bool_driving=self.bool_driving[self.cur_lap],
                                bool_driving_prevlap=self.bool_driving[self.cur_lap - 1],
                                racetimes_prevlap=self.racetimes[self.cur_lap - 1],
                                location=self.track.name,
-                               used_2compounds=[True if len({x[1] for x in driver.strategy_info}) > 1 else False
-                                                for driver in self.drivers_list],
+                               used_2compounds=self.pit_schedule["used_2compounds"].tolist(),
                                cur_positions=self.positions[self.cur_lap],
                                cur_racetimes_tmp=self.racetimes[self.cur_lap - 1] + self.laptimes[self.cur_lap],
                                t_pit_tirechange_min=self.track.t_pit_tirechange_min,
@@ -1004,10 +1196,10 @@ class Race(MonteCarlo, RaceAnalysis):
                                t_pitdrive_inlap_sc=self.track.t_pitdrive_inlap_sc,
                                t_pitdrive_outlap_sc=self.track.t_pitdrive_outlap_sc)
 
-            # update strategy info for affected drivers
+            # update strategy info (and pit stop schedule) for affected drivers
             for idx, compound in enumerate(next_compound):
                 if compound is not None:
-                    self.drivers_list[idx].strategy_info.append([self.cur_lap, compound, 0, 0.0])
+                    self.add_pitstop(idx_driver=idx, pitstop=[self.cur_lap, compound, 0, 0.0])
 
     def __handle_pitstop_inlap(self) -> None:
         """
@@ -1015,68 +1207,61 @@ class Race(MonteCarlo, RaceAnalysis):
         that drivers could have retired before they reach their pitstop lap.
         """
 
-        # reset pitstop information
-        self.pit_driver_idxs = []
-
-        # fill array with the indices belonging to the drivers that have an inlap this lap
-        for idx in self.__get_driver_iter():
-            # get boolean list if any of the pitstop inlaps matches the current lap
-            pit_b = [True if self.cur_lap == pitstop[0] else False for pitstop in self.drivers_list[idx].strategy_info]
+        # fill list with the indices belonging to the driving drivers that have an inlap this lap
+        self.pit_driver_idxs = \
+            self.idxs_driving[self.pit_schedule["inlaps"][self.cur_lap, self.idxs_driving]].tolist()
 
-            if any(pit_b):
-                # save index of pitting driver
-                self.pit_driver_idxs.append(idx)
+        for idx in self.pit_driver_idxs:
+            # update lap_influences dict of affected driver
+            self.drivers_list[idx].update_lap_influences(cur_lap=self.cur_lap, influence_type='pitinlap')
 
-                # update lap_influences dict of affected driver
-                self.drivers_list[idx].update_lap_influences(cur_lap=self.cur_lap, influence_type='pitinlap')
-
-                # create variable to save pit time loss
-                timeloss_pit = 0.0
+            # create variable to save pit time loss
+            timeloss_pit = 0.0
 
-                # if pits are located in front of the finish line add standstill time loss to inlap here
-                if not self.track.pits_aft_finishline:
-                    timeloss_pit += self.__perform_pitstop_standstill(idx_driver=idx, inlap=self.cur_lap)
+            # if pits are located in front of the finish line add standstill time loss to inlap here
+            if not self.track.pits_aft_finishline:
+                timeloss_pit += self.__perform_pitstop_standstill(idx_driver=idx, inlap=self.cur_lap)
 
-                # determine pit driving inlap time loss -> modified time loss if it happens under an active FCY phase
-                t_pitdrive_inlap_tmp = self.track.t_pitdrive_inlap
+            # determine pit driving inlap time loss -> modified time loss if it happens under an active FCY phase
+            t_pitdrive_inlap_tmp = self.track.t_pitdrive_inlap
 
-                if self.fcy_handling["idxs_act_phase"][idx] is not None:
-                    check_fcy_phase = self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx]]
-                elif self.fcy_handling["idxs_next_phase"][idx] < len(self.fcy_data["phases"]):
-                    check_fcy_phase = self.fcy_data["phases"][self.fcy_handling["idxs_next_phase"][idx]]
-                else:
-                    check_fcy_phase = None
-
-                if check_fcy_phase is not None:
-                    if check_fcy_phase[2] == 'VSC' \
-                            and (check_fcy_phase[0]
-                                 <= self.racetimes[self.cur_lap - 1, idx] + self.laptimes[self.cur_lap, idx]) \
-                            and (self.racetimes[self.cur_lap - 1, idx] + self.laptimes[self.cur_lap, idx]
-                                 + self.track.t_pitdrive_inlap_fcy < check_fcy_phase[1]):
-                        # CASE 1: VSC phase (considered if the FCY phase fully covers the pit stop inlap part)
+            if self.fcy_handling["idxs_act_phase"][idx] >= 0:
+                check_fcy_phase = self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx]]
+            elif self.fcy_handling["idxs_next_phase"][idx] < len(self.fcy_data["phases"]):
+                check_fcy_phase = self.fcy_data["phases"][self.fcy_handling["idxs_next_phase"][idx]]
+            else:
+                check_fcy_phase = None
+
+            if check_fcy_phase is not None:
+                if check_fcy_phase[2] == 'VSC' \
+                        and (check_fcy_phase[0]
+                             <= self.racetimes[self.cur_lap - 1, idx] + self.laptimes[self.cur_lap, idx]) \
+                        and (self.racetimes[self.cur_lap - 1, idx] + self.laptimes[self.cur_lap, idx]
+                             + self.track.t_pitdrive_inlap_fcy < check_fcy_phase[1]):
+                    # CASE 1: VSC phase (considered if the FCY phase fully covers the pit stop inlap part)
+                    t_pitdrive_inlap_tmp = self.track.t_pitdrive_inlap_fcy
+
+                elif check_fcy_phase[2] == 'SC' \
+                        and (check_fcy_phase[0]
+                             <= self.racetimes[self.cur_lap - 1, idx] + self.laptimes[self.cur_lap, idx]) \
+                        and self.racetimes[self.cur_lap - 1, idx] < check_fcy_phase[1]:
+                    # CASE 2: SC phase (considered if the FCY phase starts before entering the pit and if it ends
+                    # after the start of the current lap, i.e. if it somehow reaches into the current lap (since SC
+                    # stays until the end of the lap no matter if the FCY phase ends earlier))
+
+                    if check_fcy_phase[0] < self.racetimes[self.cur_lap - 1, idx]:
+                        # CASE 2a: SC phase started before this lap already -> drivers should have run up to it
+                        t_pitdrive_inlap_tmp = self.track.t_pitdrive_inlap_sc
+                    else:
+                        # CASE 2b: SC phase started within this pit inlap -> no driver ran up to the SC already
+                        # -> time loss is equal to a FCY phase instead
                         t_pitdrive_inlap_tmp = self.track.t_pitdrive_inlap_fcy
 
-                    elif check_fcy_phase[2] == 'SC' \
-                            and (check_fcy_phase[0]
-                                 <= self.racetimes[self.cur_lap - 1, idx] + self.laptimes[self.cur_lap, idx]) \
-                            and self.racetimes[self.cur_lap - 1, idx] < check_fcy_phase[1]:
-                        # CASE 2: SC phase (considered if the FCY phase starts before entering the pit and if it ends
-                        # after the start of the current lap, i.e. if it somehow reaches into the current lap (since SC
-                        # stays until the end of the lap no matter if the FCY phase ends earlier))
-
-                        if check_fcy_phase[0] < self.racetimes[self.cur_lap - 1, idx]:
-                            # CASE 2a: SC phase started before this lap already -> drivers should have run up to it
-                            t_pitdrive_inlap_tmp = self.track.t_pitdrive_inlap_sc
-                        else:
-                            # CASE 2b: SC phase started within this pit inlap -> no driver ran up to the SC already
-                            # -> time loss is equal to a FCY phase instead
-                            t_pitdrive_inlap_tmp = self.track.t_pitdrive_inlap_fcy
-
-                # save t_pitdrive part
-                timeloss_pit += t_pitdrive_inlap_tmp
+            # save t_pitdrive part
+            timeloss_pit += t_pitdrive_inlap_tmp
 
-                # add timeloss to current laptime
-                self.laptimes[self.cur_lap, idx] += timeloss_pit
+            # add timeloss to current laptime
+            self.laptimes[self.cur_lap, idx] += timeloss_pit
 
         # check for position changes (without overtaking timeloss) only if there are pit drivers
         if self.pit_driver_idxs:
@@ -1095,47 +1280,118 @@ class Race(MonteCarlo, RaceAnalysis):
         driver catches up to the SC during its first lap.
         """
 
-        for idx in self.__get_driver_iter():
-            # update race flag state if current driver is the leader
-            if self.positions[self.cur_lap, idx] == 1 and self.fcy_handling["idxs_act_phase"][idx] is not None:
-                self.flagstates[self.cur_lap] = self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx]][2]
-
-            # reset FCY phases that ended within the current lap
-            self.check_fcyphase_reset(idx_driver=idx)
-
-            # check if another phase should have started within the current lap but did not since the simulation can
-            # currently only handle one phase per lap -> race flag state is not updated in this case since it should
-            # show which phase was really considered within the lap
-            self.check_fcyphase_activation(idx_driver=idx)
-
-            # if a new FCY phase was started set start and end progress information (used for VSE)
-            if self.fcy_handling["idxs_act_phase"][idx] is not None \
-                    and self.fcy_handling["start_end_prog"][idx][0] is None:
-                # get lap fractions
-                lap_frac_normal, lap_frac_normal_bef = self.calc_lapfracs_fcyphase(idx_driver=idx)
+        idxs_driving = self.idxs_driving
 
-                # set progress information
-                self.fcy_handling["start_end_prog"][idx][0] = self.cur_lap - 1.0 + lap_frac_normal_bef
-                self.fcy_handling["start_end_prog"][idx][1] = self.cur_lap - (lap_frac_normal - lap_frac_normal_bef)
-
-            # if a new SC phase was started now we have to set the SC ghost data accordingly
-            if self.fcy_handling["idxs_act_phase"][idx] is not None \
-                    and self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx]][2] == 'SC' \
-                    and self.fcy_handling["sc_ghost_racetimes"][idx] is None:
-
-                # set SC ghost data
-                self.fcy_handling["sc_ghost_racetimes"][idx] = \
-                    self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx]][0]
-                self.fcy_handling["sc_ghost_laps"][idx] = 0  # 0 equals start lap
+        # update race flag state if the leader is within an active FCY phase
+        for idx in idxs_driving[self.positions[self.cur_lap, idxs_driving] == 1]:
+            if self.fcy_handling["idxs_act_phase"][idx] >= 0:
+                self.flagstates[self.cur_lap] = self.fcy_data["phases"][self.fcy_handling["idxs_act_phase"][idx]][2]
 
-                # DRS usage is not allowed directly after an SC phase (+ 1 because current lap is still SC)
-                if self.race_pars["use_drs"]:
+        # reset FCY phases that ended within the current lap
+        self.check_fcyphase_reset(idxs_driver=idxs_driving)
+
+        # check if another phase should have started within the current lap but did not since the simulation can
+        # currently only handle one phase per lap -> race flag state is not updated in this case since it should show
+        # which phase was really considered within the lap
+        self.check_fcyphase_activation(idxs_driver=idxs_driving)
+
+        # if a new FCY phase was started set start and end progress information (used for VSE)
+        idxs_new = idxs_driving[(self.fcy_handling["idxs_act_phase"][idxs_driving] >= 0)
+                                & np.isnan(self.fcy_handling["start_end_prog"][idxs_driving, 0])]
+
+        if idxs_new.size > 0:
+            # get lap fractions
+            lap_frac_normal, lap_frac_normal_bef = self.calc_lapfracs_fcyphase(idxs_driver=idxs_new)
+
+            # set progress information
+            self.fcy_handling["start_end_prog"][idxs_new, 0] = self.cur_lap - 1.0 + lap_frac_normal_bef
+            self.fcy_handling["start_end_prog"][idxs_new, 1] = self.cur_lap - (lap_frac_normal - lap_frac_normal_bef)
+
+        # if a new SC phase was started now we have to set the SC ghost data accordingly
+        idxs_fcy = idxs_driving[self.fcy_handling["idxs_act_phase"][idxs_driving] >= 0]
+        idxs_act_phase = self.fcy_handling["idxs_act_phase"][idxs_fcy]
+        mask_sc_new = self.fcy_handling["phase_is_sc"][idxs_act_phase] \
+            & np.isnan(self.fcy_handling["sc_ghost_racetimes"][idxs_fcy])
+
+        if np.any(mask_sc_new):
+            # set SC ghost data
+            self.fcy_handling["sc_ghost_racetimes"][idxs_fcy[mask_sc_new]] = \
+                self.fcy_handling["phase_starts"][idxs_act_phase[mask_sc_new]]
+            self.fcy_handling["sc_ghost_laps"][idxs_fcy[mask_sc_new]] = 0  # 0 equals start lap
+
+            # DRS usage is not allowed directly after an SC phase (+ 1 because current lap is still SC)
+            if self.race_pars["use_drs"]:
+                for idx in idxs_fcy[mask_sc_new]:
                     self.race_pars["drs_act_lap"][idx] = self.cur_lap + 1 + self.race_pars["drs_sc_delay"]
 
     # ------------------------------------------------------------------------------------------------------------------
     # METHODS (HELPERS) ------------------------------------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
 
+    def compile_pit_schedule(self, idx_driver: int) -> None:
+        """This method compiles the strategy info of a driver into the pit stop schedule arrays. It must be called
+        whenever the strategy info of a driver is replaced or modified from outside (pit stops that are appended during
+        the race should be inserted using add_pitstop())."""
+
+        strategy_info = self.drivers_list[idx_driver].strategy_info
+
+        self.pit_schedule["inlaps"][:, idx_driver] = False
+        self.pit_schedule["compound_ids"][:, idx_driver] = -1
+        self.pit_schedule["tire_ages"][:, idx_driver] = 0
+        self.pit_schedule["refuels"][:, idx_driver] = 0.0
+        self.pit_schedule["no_pitstops"][idx_driver] = len(strategy_info) - 1
+        self.laptimes_free_outdated[idx_driver] = True
+        self.pit_schedule["used_2compounds"][idx_driver] = len({x[1] for x in strategy_info}) > 1
+
+        # strategy_info[1:] is used to avoid considering the start tire information
+        for pitstop in strategy_info[1:]:
+            self.__insert_pitstop(idx_driver=idx_driver, pitstop=pitstop)
+
+    def add_pitstop(self, idx_driver: int, pitstop: list) -> None:
+        """This method appends a pit stop [inlap, compound, tire age, refueling] to the strategy info of a driver and
+        updates the pit stop schedule incrementally."""
+
+        strategy_info = self.drivers_list[idx_driver].strategy_info
+        strategy_info.append(pitstop)
+
+        self.pit_schedule["no_pitstops"][idx_driver] += 1
+        self.laptimes_free_outdated[idx_driver] = True
+        self.pit_schedule["used_2compounds"][idx_driver] = self.pit_schedule["used_2compounds"][idx_driver] \
+            or pitstop[1] != strategy_info[0][1]
+        self.__insert_pitstop(idx_driver=idx_driver, pitstop=pitstop)
+
+    def __insert_pitstop(self, idx_driver: int, pitstop: list) -> None:
+        # inlaps outside of the race are never reached, the first pit stop is relevant in the case of multiple pit stops
+        # within the same inlap
+        if not 0 < pitstop[0] <= self.race_pars["tot_no_laps"] or self.pit_schedule["inlaps"][pitstop[0], idx_driver]:
+            return
+
+        if pitstop[1] not in self.pit_schedule["compounds"]:
+            self.pit_schedule["compounds"].append(pitstop[1])
+
+        self.pit_schedule["inlaps"][pitstop[0], idx_driver] = True
+        self.pit_schedule["compound_ids"][pitstop[0], idx_driver] = self.pit_schedule["compounds"].index(pitstop[1])
+        self.pit_schedule["tire_ages"][pitstop[0], idx_driver] = pitstop[2]
+        self.pit_schedule["refuels"][pitstop[0], idx_driver] = pitstop[3]
+
+    def __calc_laptimes_free(self, idx_driver: int) -> None:
+        """This method updates the precalculated basic time losses of a driver for the remaining laps (starting with
+        the current lap) based on the current state of his car and his pending pit stops."""
+
+        inlaps = np.flatnonzero(self.pit_schedule["inlaps"][self.cur_lap:self.race_pars["tot_no_laps"], idx_driver]) \
+            + self.cur_lap
+        pitstops = [[inlap,
+                     self.pit_schedule["compounds"][self.pit_schedule["compound_ids"][inlap, idx_driver]],
+                     int(self.pit_schedule["tire_ages"][inlap, idx_driver]),
+                     float(self.pit_schedule["refuels"][inlap, idx_driver])] for inlap in inlaps.tolist()]
+
+        self.laptimes_free[self.cur_lap:, idx_driver] = \
+            self.drivers_list[idx_driver].calc_basic_timelosses(lap_start=self.cur_lap,
+                                                                tot_no_laps=self.race_pars["tot_no_laps"],
+                                                                pitstops=pitstops,
+                                                                t_lap_sens_mass=self.track.t_lap_sens_mass)
+        self.laptimes_free_outdated[idx_driver] = False
+
     def __check_pos_changes_wo_timeloss(self,
                                         t_lap_tmp: np.ndarray = None) -> None:
         """
@@ -1204,17 +1460,15 @@ class Race(MonteCarlo, RaceAnalysis):
 
         return last_compl_lap
 
-    def __get_driver_iter(self) -> Iterator:
-        """This method returns an iterator for the driver indices of those drivers that did not retire."""
+    def get_last_compl_laps(self) -> np.ndarray:
+        """This method returns the lap numbers of the last completed (i.e. not NaN) laps of all drivers (vectorized
+        version of get_last_compl_lap())."""
 
-        # get driver indices for drivers that did not retire
-        driving_drivers = list(np.arange(self.no_drivers)[self.bool_driving[self.cur_lap]])
+        # argmax of the NaN array returns the first NaN lap (lap 0 is never NaN), the final lap is used if a driver
+        # finished all laps
+        bool_nan = np.isnan(self.racetimes)
 
-        return iter(driving_drivers)
-
-    # ------------------------------------------------------------------------------------------------------------------
-    # METHODS (PROCESS RESULTS) ----------------------------------------------------------------------------------------
-    # ------------------------------------------------------------------------------------------------------------------
+        return np.where(bool_nan[-1], np.argmax(bool_nan, axis=0) - 1, self.race_pars['tot_no_laps'])
 
     def __reset_invalid_laps_aft_race(self) -> None:
         """
@@ -1239,86 +1493,85 @@ class Race(MonteCarlo, RaceAnalysis):
                   " invalid!" % last_compl_lap_winner)
             self.result_status = 1  # this seems to be no valid result
 
-        # loop through the drivers
-        for idx in range(self.no_drivers):
+        # get index of first lap that has a race time greater than t_race_winner for every driver (only laps until the
+        # last completed lap are considered) -> returns 0 if no lap is found
+        laps = np.arange(self.race_pars["tot_no_laps"] + 1)
+        idxs_first_nan = self.get_last_compl_laps() + 1
+
+        with np.errstate(invalid='ignore'):  # errors must be ignored here due to warnings from nan comparison
+            racetime_comp_b = (self.racetimes > t_race_winner) & (laps[:, None] < idxs_first_nan)
+
+        idxs_greater_t_race_winner = np.argmax(racetime_comp_b, axis=0)
 
-            # jump over current driver if he is the race winner
-            if self.positions[-1, idx] == 1:
-                continue
+        # if idx_greater_t_race_winner is not zero and is reached before last lap we have to modify the result (the race
+        # winner is skipped)
+        idxs_mod = np.flatnonzero((0 < idxs_greater_t_race_winner)
+                                  & (idxs_greater_t_race_winner < self.race_pars["tot_no_laps"])
+                                  & (self.positions[-1] != 1))
 
-            # get index of first lap that has a race time greater than t_race_winner -> returns 0 if no lap is found
-            idx_first_nan = self.get_last_compl_lap(idx=idx) + 1
-            racetime_comp_b = self.racetimes[:idx_first_nan, idx] > t_race_winner
-            idx_greater_t_race_winner = int(np.argmax(racetime_comp_b))
+        if idxs_mod.size > 0:
+            laps_mod = idxs_greater_t_race_winner[idxs_mod]
+            bool_mod = laps[:, None] > laps_mod
 
-            # if idx_greater_t_race_winner is not zero and is reached before last lap we have to modify the result
-            if 0 < idx_greater_t_race_winner < self.race_pars["tot_no_laps"]:
-                self.positions[idx_greater_t_race_winner + 1:, idx] = self.positions[idx_greater_t_race_winner, idx]
-                self.laptimes[idx_greater_t_race_winner + 1:, idx] = np.nan
-                self.racetimes[idx_greater_t_race_winner + 1:, idx] = np.nan
-                self.progress[idx] = idx_greater_t_race_winner
+            self.positions[:, idxs_mod] = np.where(bool_mod, self.positions[laps_mod, idxs_mod],
+                                                   self.positions[:, idxs_mod])
+            self.laptimes[:, idxs_mod] = np.where(bool_mod, np.nan, self.laptimes[:, idxs_mod])
+            self.racetimes[:, idxs_mod] = np.where(bool_mod, np.nan, self.racetimes[:, idxs_mod])
+            self.progress[idxs_mod] = laps_mod
 
         # --------------------------------------------------------------------------------------------------------------
         # CORRECT POSITIONS ARRAY --------------------------------------------------------------------------------------
         # --------------------------------------------------------------------------------------------------------------
 
-        # loop through all laps of the race and set new positions
-        for lap_tmp in range(1, self.race_pars['tot_no_laps'] + 1):
-            # sort positions by racetimes, progress and original positions -> idea is to sort all driving drivers in
-            # front, then to add the drivers who retired during the current lap (progress X.5), then to add drivers
-            # who did not start the current lap due to the previous step (progress X.0) and finally to add drivers who
-            # retired earlier or did not even start earlier laps. Within every of those steps the original positions
-            # should be kept.
-            sorted_idxs = np.lexsort((self.positions[lap_tmp], -self.progress, self.racetimes[lap_tmp]))
-            self.positions[lap_tmp, sorted_idxs] = np.arange(1, self.no_drivers + 1)
+        # sort positions of every lap by racetimes, progress and original positions -> idea is to sort all driving
+        # drivers in front, then to add the drivers who retired during the current lap (progress X.5), then to add
+        # drivers who did not start the current lap due to the previous step (progress X.0) and finally to add drivers
+        # who retired earlier or did not even start earlier laps. Within every of those steps the original positions
+        # should be kept.
+        sorted_idxs = np.lexsort((self.positions[1:],
+                                  np.broadcast_to(-self.progress, self.positions[1:].shape),
+                                  self.racetimes[1:]), axis=-1)
+        np.put_along_axis(self.positions[1:], sorted_idxs,
+                          np.broadcast_to(np.arange(1, self.no_drivers + 1, dtype=self.positions.dtype),
+                                          sorted_idxs.shape),
+                          axis=1)
 
     def __check_plausibility(self):
         """This method performs some simple checks on the simulation result."""
 
-        # check if laptimes sum up to total racetime of every driver ---------------------------------------------------
-        for idx in range(self.no_drivers):
+        # check if laptimes sum up to total racetime of every driver (last valid racetime) -----------------------------
+        racetimes_final = self.racetimes[self.get_last_compl_laps(), np.arange(self.no_drivers)]
 
-            # find last valid racetime of driver
-            last_compl_lap = self.get_last_compl_lap(idx=idx)
-
-            if not np.isclose(np.nansum(self.laptimes[:, idx]), self.racetimes[last_compl_lap, idx]):
-                print("WARNING: Summed laptime of driver %s does not equal his total racetime, race will be marked as"
-                      " invalid!" % self.drivers_list[idx].initials)
-                self.result_status = 11
+        for idx in np.flatnonzero(~np.isclose(np.nansum(self.laptimes, axis=0), racetimes_final)):
+            print("WARNING: Summed laptime of driver %s does not equal his total racetime, race will be marked as"
+                  " invalid!" % self.drivers_list[idx].initials)
+            self.result_status = 11
 
         # check if every position exists only once for every lap -------------------------------------------------------
-        ref_positions = np.arange(1, self.no_drivers + 1)
-
-        for cur_lap in range(self.race_pars["tot_no_laps"] + 1):
-            positions_sorted = np.sort(self.positions[cur_lap])
+        bool_invalid_laps = np.any(np.sort(self.positions, axis=1) != np.arange(1, self.no_drivers + 1), axis=1)
 
-            if not np.all(ref_positions == positions_sorted):
-                print("WARNING: Positions are not plausible in lap %i, race will be marked as invalid!" % cur_lap)
-                self.result_status = 12
+        for cur_lap in np.flatnonzero(bool_invalid_laps):
+            print("WARNING: Positions are not plausible in lap %i, race will be marked as invalid!" % cur_lap)
+            self.result_status = 12
 
         # check if minimum distance between drivers is always kept (consider that pitstop inlaps can lead to "invalid"
         # distances when another driver has an almost equal race time on the track at the start finish line)
-        # (strategy_info[1:] is used to avoid considering the start tire information) ----------------------------------
-        pit_inlaps = [[pitstop[0] for pitstop in driver.strategy_info[1:]] for driver in self.drivers_list]
+        # (pit stop schedule does not contain the start tire information) ----------------------------------------------
         racetimes_sorted = np.sort(self.racetimes[1:], axis=1)
 
         with np.errstate(invalid='ignore'):  # errors must be ignored here due to warnings from nan comparison
             # get bool array containing invalid distances between drivers
             invalid_dists = np.diff(racetimes_sorted, axis=1) + 1e-7 < self.race_pars["min_t_dist"]
 
-            # loop through all pitstop inlaps and set according entries in the bool array False
-            for idx, inlaps in enumerate(pit_inlaps):
-                for inlap in inlaps:
-                    # get driver position in the inlap
-                    pos = self.positions[inlap, idx]
+            # set entries of all pitstop inlaps in the bool array False
+            inlaps, idxs_driver = np.nonzero(self.pit_schedule["inlaps"])
+            pos = self.positions[inlaps, idxs_driver]
 
-                    # distance to driver in front and driver in the back can both be wrong
-                    # inlap - 1 because invalid_dists starts in lap 1
-                    # pos - 2 because positions start with 1 and we want the difference to position in front of driver
-                    if pos > 1:
-                        invalid_dists[inlap - 1, pos - 2] = False
-                    if pos < self.no_drivers:
-                        invalid_dists[inlap - 1, pos - 1] = False
+            # distance to driver in front and driver in the back can both be wrong
+            # inlap - 1 because invalid_dists starts in lap 1
+            # pos - 2 because positions start with 1 and we want the difference to position in front of driver
+            invalid_dists[inlaps[pos > 1] - 1, pos[pos > 1] - 2] = False
+            invalid_dists[inlaps[pos < self.no_drivers] - 1, pos[pos < self.no_drivers] - 1] = False
 
             # check if there are invalid distances remaining
             if np.any(invalid_dists):
@@ -1331,12 +1584,10 @@ class Race(MonteCarlo, RaceAnalysis):
             self.result_status = 14
 
         # check if every driver used at least two different compounds --------------------------------------------------
-        for idx_driver, driver in enumerate(self.drivers_list):
-            if self.bool_driving[-1, idx_driver]\
-                    and not len({x[1] for x in driver.strategy_info}) > 1\
-                    and idx_driver not in self.vse.idxs_driver_reinf_training:
+        for idx_driver in np.flatnonzero(self.bool_driving[-1] & ~self.pit_schedule["used_2compounds"]):
+            if self.vse is None or idx_driver not in self.vse.idxs_driver_reinf_training:
                 print("WARNING: %s did not use two different compounds during the race, race will be marked as"
-                      " invalid!" % driver.initials)
+                      " invalid!" % self.drivers_list[idx_driver].initials)
                 self.result_status = 15
 
 
@@ -1,4 +1,6 @@
 from racesim.src.race import Race
+import racesim.src.result_cache
+import racesim.src.timing
 
 """
 author:
@@ -9,10 +11,33 @@ date:
 
 .. description::
 The handle is required for multiprocess calculations such that every executor gets his own instances of the classes.
+If use_cache is set, deterministic races (no probabilistic influences, no random events) are loaded from the result
+cache if they were simulated before with the same parameters. If use_timing is set, the wall time of the phases of
+every simulated lap is measured (see racesim.src.timing). The plausibility check of the result can be deactivated using
+use_plausibility_check (e.g. to validate only a sample of the races of a MCS).
 """
 
 
-def race_handle(pars_in: dict, use_prob_infl: bool, create_rand_events: bool, vse_paths: dict) -> Race:
+def race_handle(pars_in: dict,
+                use_prob_infl: bool,
+                create_rand_events: bool,
+                vse_paths: dict,
+                use_cache: bool = False,
+                use_timing: bool = False,
+                use_plausibility_check: bool = True) -> Race:
+    # check result cache (deterministic races only)
+    use_cache = use_cache and not use_prob_infl and not create_rand_events
+
+    if use_cache:
+        cache_key = racesim.src.result_cache.get_cache_key(pars_in=pars_in, vse_paths=vse_paths)
+        race = racesim.src.result_cache.load_race(cache_key=cache_key)
+
+        if race is not None:
+            # nothing was simulated
+            race.timing = racesim.src.timing.create_timing() if use_timing else None
+
+            return race
+
     # create race object
     race = Race(race_pars=pars_in["race_pars"],
                 driver_pars=pars_in["driver_pars"],
@@ -24,7 +49,9 @@ def race_handle(pars_in: dict, use_prob_infl: bool, create_rand_events: bool, vs
                 use_prob_infl=use_prob_infl,
                 create_rand_events=create_rand_events,
                 monte_carlo_pars=pars_in["monte_carlo_pars"],
-                event_pars=pars_in["event_pars"])
+                event_pars=pars_in["event_pars"],
+                use_timing=use_timing,
+                use_plausibility_check=use_plausibility_check)
 
     # simulate race
     race.simulate_race()
@@ -33,4 +60,8 @@ def race_handle(pars_in: dict, use_prob_infl: bool, create_rand_events: bool, vs
     # multiprocessing
     race.vse = None
 
+    # save result in cache
+    if use_cache:
+        racesim.src.result_cache.save_race(race=race, cache_key=cache_key)
+
     return race
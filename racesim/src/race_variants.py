@@ -0,0 +1,155 @@
+from racesim.src.race import Race
+import pickle
+import copy
+
+"""
+.. description::
+Deterministic simulation of many strategy variants of a single driver. Laps before the first inlap in which two variants
+differ are identical for both variants if probabilistic influences and random events are deactivated. Therefore, the
+variants are organized as a trie over their pit stops: the common prefix of the variants is simulated only once and the
+race is forked (copied) in the lap before the first differing inlap.
+"""
+
+
+def simulate_strategy_variants(pars_in: dict, initials: str, variants: list) -> list:
+    """
+    .. inputs::
+    :param pars_in:     Parameters as returned by import_pars (VSE is not supported since the driver must follow the
+                        variants).
+    :type pars_in:      dict
+    :param initials:    Initials of the driver whose strategy variants should be simulated.
+    :type initials:     str
+    :param variants:    List with strategy infos of the driver, e.g. [[[0, 'A4', 2, 0.0], [30, 'A3', 0, 0.0]], ...]
+    :type variants:     list
+
+    .. outputs::
+    :return races:      List with the simulated race object for every variant (same order as variants, identical
+                        variants share the same race object).
+    :rtype races:       list
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CHECK INPUTS -----------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    if initials not in pars_in["driver_pars"]:
+        raise RuntimeError("Driver %s does not participate in the race!" % initials)
+
+    for strategy_info in variants:
+        inlaps = [x[0] for x in strategy_info]
+
+        if not inlaps or not inlaps[0] == 0:
+            raise RuntimeError("Strategy info of every variant must start with the start information (lap 0)!")
+        if any(inlaps[idx + 1] <= inlaps[idx] for idx in range(len(inlaps) - 1)) \
+                or inlaps[-1] >= pars_in["race_pars"]["tot_no_laps"]:
+            raise RuntimeError("Inlaps must be in ascending order and within the race!", strategy_info)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CREATE TRIE ------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # every node contains its child nodes (key: pit stop entry) and the indices of the variants ending in the node
+    roots = {}
+
+    for idx_variant, strategy_info in enumerate(variants):
+        key = tuple(strategy_info[0])
+
+        if key not in roots:
+            roots[key] = {"children": {}, "idxs_variant": []}
+
+        cur_node = roots[key]
+
+        for entry in strategy_info[1:]:
+            cur_node = cur_node["children"].setdefault(tuple(entry), {"children": {}, "idxs_variant": []})
+
+        cur_node["idxs_variant"].append(idx_variant)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # SIMULATE VARIANTS ------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    races = [None] * len(variants)
+
+    for key, root in roots.items():
+        race = __create_race(pars_in=pars_in, initials=initials, strategy_info=[list(key)])
+
+        # if the driver is the reference driver of the pre-simulation (conversion of FCY phases from race progress to
+        # race time), the race is influenced by his complete strategy from the beginning -> no prefix can be shared
+        if race.presim_info["fcy_phases_progress"] and initials == pars_in["monte_carlo_pars"]["ref_driver"]:
+            for idx_variant, strategy_info in enumerate(variants):
+                if tuple(strategy_info[0]) == key:
+                    race = __create_race(pars_in=pars_in, initials=initials, strategy_info=strategy_info)
+                    races[idx_variant] = __finish_race(race=race)
+
+            continue
+
+        idx_driver = next(idx for idx, driver in enumerate(race.drivers_list) if driver.initials == initials)
+        __simulate_node(race=race, idx_driver=idx_driver, node=root, races=races)
+
+    return races
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# HELPER FUNCTIONS -----------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+def __create_race(pars_in: dict, initials: str, strategy_info: list) -> Race:
+    driver_pars = copy.deepcopy(pars_in["driver_pars"])
+    driver_pars[initials]["strategy_info"] = copy.deepcopy(strategy_info)
+
+    return Race(race_pars=pars_in["race_pars"],
+                driver_pars=driver_pars,
+                car_pars=pars_in["car_pars"],
+                tireset_pars=pars_in["tireset_pars"],
+                track_pars=pars_in["track_pars"],
+                vse_pars=pars_in["vse_pars"],
+                vse_paths=None,
+                use_prob_infl=False,
+                create_rand_events=False,
+                monte_carlo_pars=pars_in["monte_carlo_pars"],
+                event_pars=pars_in["event_pars"])
+
+
+def __finish_race(race: Race) -> Race:
+    race.simulate_race()
+
+    # remove VSE such that the race objects can be serialized (same as in race_handle)
+    race.vse = None
+
+    return race
+
+
+def __simulate_node(race: Race, idx_driver: int, node: dict, races: list) -> None:
+    """The race contains the strategy prefix of the node and is simulated at most until the lap before the first inlap
+    of the child nodes. It is forked for every child node and finished for the variants ending in the node."""
+
+    children = sorted(node["children"].items(), key=lambda x: x[0][0])
+    strategy_prefix = race.drivers_list[idx_driver].strategy_info
+
+    for idx_child, (entry, child) in enumerate(children):
+        # simulate laps that are identical for all remaining children (and the variants ending in the node)
+        race.simulate_laps(entry[0] - 1 - race.cur_lap)
+
+        # fork race for the child (the last child can continue with the race itself if no variant ends in this node)
+        if idx_child == len(children) - 1 and not node["idxs_variant"]:
+            race_child = race
+        else:
+            race_child = pickle.loads(pickle.dumps(race, protocol=pickle.HIGHEST_PROTOCOL))  # faster than deepcopy
+
+        race_child.drivers_list[idx_driver].strategy_info = copy.deepcopy(strategy_prefix)
+        race_child.add_pitstop(idx_driver=idx_driver, pitstop=list(entry))
+        __simulate_node(race=race_child, idx_driver=idx_driver, node=child, races=races)
+
+    if node["idxs_variant"]:
+        __finish_race(race=race)
+
+        for idx_variant in node["idxs_variant"]:
+            races[idx_variant] = race
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# TESTING --------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,161 @@
+from racesim.src.race import Race
+import hashlib
+import pickle
+import json
+import time
+import os
+
+"""
+.. description::
+Content-addressed on-disk cache for deterministic race simulations (no probabilistic influences, no random events). In
+that case, the simulated race is a pure function of the parameters and the VSE model files. The key of a cache entry is
+a canonical hash of the parameters, the digests of the VSE files and the digest of the simulator source files (such
+that races pickled by a different code version, e.g. with a different object layout, are never returned). Entries are
+evicted in LRU order (the modification time of an entry file is updated on every hit) as soon as the maximum number of
+entries is exceeded.
+"""
+
+# increase if the simulation behavior changes such that previously cached races are not used anymore
+CACHE_VERSION = 1
+
+# default cache location and size
+CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "output", "result_cache")
+MAX_NO_ENTRIES = 1000
+
+# source folders of the simulator code that is pickled or used to simulate the cached races
+SOURCE_PATHS = [os.path.dirname(os.path.abspath(__file__))] \
+    + [os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), x, "src")
+       for x in ("racesim_basic", "helper_funcs")]
+
+# digests of the VSE and source files in the form {file path: (modification time, size, digest)} -> files are hashed
+# only once
+_file_digests = {}
+
+
+def get_cache_key(pars_in: dict, vse_paths: dict) -> str:
+    """Return the hash of the parameters (canonical JSON representation) and the VSE files (file digests)."""
+
+    hash_obj = hashlib.sha256()
+    hash_obj.update(str(CACHE_VERSION).encode())
+    hash_obj.update(__get_source_digest().encode())
+
+    # drs_act_lap is inserted into the race parameters by the race object itself (and reset at the start of every race)
+    # -> it must not influence the key
+    pars_hash = dict(pars_in)
+    pars_hash["race_pars"] = {key: val for key, val in pars_in["race_pars"].items() if not key == "drs_act_lap"}
+    hash_obj.update(json.dumps(pars_hash, sort_keys=True, separators=(',', ':'), default=str).encode())
+
+    if vse_paths is not None:
+        for key in sorted(vse_paths):
+            hash_obj.update(key.encode())
+            hash_obj.update(__get_file_digest(file_path=vse_paths[key]).encode())
+
+    return hash_obj.hexdigest()
+
+
+def load_race(cache_key: str, cache_path: str = CACHE_PATH) -> Race or None:
+    """Return the cached race (None if not available) and mark the entry as recently used."""
+
+    file_path = os.path.join(cache_path, cache_key + ".pkl")
+
+    try:
+        with open(file_path, 'rb') as fh:
+            race = pickle.load(fh)
+    except FileNotFoundError:
+        return None
+    except Exception:
+        # entries that cannot be unpickled (e.g. incomplete or incompatible files) are regarded as a cache miss and
+        # removed
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+        return None
+
+    # update modification time for LRU eviction (entry could have been evicted by another process in the meantime)
+    try:
+        os.utime(file_path)
+    except FileNotFoundError:
+        pass
+
+    return race
+
+
+def save_race(race: Race, cache_key: str, cache_path: str = CACHE_PATH, max_no_entries: int = MAX_NO_ENTRIES) -> None:
+    """Save the race in the cache and evict the least recently used entries if the cache is full."""
+
+    os.makedirs(cache_path, exist_ok=True)
+    file_path = os.path.join(cache_path, cache_key + ".pkl")
+
+    # write to a temporary file first such that other processes never read incomplete entries
+    file_path_tmp = file_path + ".%i_%i.tmp" % (os.getpid(), time.perf_counter_ns())
+
+    with open(file_path_tmp, 'wb') as fh:
+        pickle.dump(race, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+    os.replace(file_path_tmp, file_path)
+
+    # evict least recently used entries
+    entries = [entry for entry in os.scandir(cache_path) if entry.name.endswith(".pkl")]
+
+    if len(entries) > max_no_entries:
+        entries.sort(key=lambda entry: entry.stat().st_mtime)
+
+        for entry in entries[:len(entries) - max_no_entries]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                pass
+
+
+def clear_cache(cache_path: str = CACHE_PATH) -> None:
+    """Remove all entries from the cache."""
+
+    if not os.path.isdir(cache_path):
+        return
+
+    for entry in os.scandir(cache_path):
+        if entry.name.endswith(".pkl"):
+            os.remove(entry.path)
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# HELPER FUNCTIONS -----------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+def __get_source_digest() -> str:
+    hash_obj = hashlib.sha256()
+
+    for source_path in SOURCE_PATHS:
+        for file_name in sorted(os.listdir(source_path)):
+            if file_name.endswith(".py"):
+                hash_obj.update(file_name.encode())
+                hash_obj.update(__get_file_digest(file_path=os.path.join(source_path, file_name)).encode())
+
+    return hash_obj.hexdigest()
+
+
+def __get_file_digest(file_path: str) -> str:
+    file_stat = os.stat(file_path)
+
+    if file_path in _file_digests and _file_digests[file_path][:2] == (file_stat.st_mtime_ns, file_stat.st_size):
+        return _file_digests[file_path][2]
+
+    hash_obj = hashlib.sha256()
+
+    with open(file_path, 'rb') as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b''):
+            hash_obj.update(chunk)
+
+    _file_digests[file_path] = (file_stat.st_mtime_ns, file_stat.st_size, hash_obj.hexdigest())
+
+    return _file_digests[file_path][2]
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# TESTING --------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    pass
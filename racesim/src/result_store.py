@@ -0,0 +1,207 @@
+import numpy as np
+import pickle
+import os
+
+"""
+.. description::
+Memory-budgeted storage for the result dicts of a MCS (see Race.get_race_results()). Results are kept in memory as long
+as their estimated size stays below the memory budget. As soon as the budget is exceeded, the results in memory are
+pickled into a spill file and removed from memory. The store can be iterated and indexed like a list, spilled results
+are loaded chunk by chunk (only one spilled chunk is kept in memory at the same time).
+
+The spill files are not removed automatically since the store is usually returned to the caller. remove_spill_files()
+must therefore be called as soon as the results are not required anymore, alternatively the store can be used as a
+context manager that removes the spill files on exit.
+"""
+
+
+class ResultStore(object):
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # SLOTS ------------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    __slots__ = ("__max_nbytes",
+                 "__spill_path",
+                 "__spill_files",
+                 "__spill_lens",
+                 "__results",
+                 "__nbytes",
+                 "__chunk_cache")
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CONSTRUCTOR ------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    def __init__(self, max_memory_mb: float, spill_path: str) -> None:
+        """
+        .. inputs::
+        :param max_memory_mb:   maximum memory of the results kept in memory in MB (estimated)
+        :type max_memory_mb:    float
+        :param spill_path:      folder for the spill files (created on first spill)
+        :type spill_path:       str
+        """
+
+        self.max_nbytes = max_memory_mb * 1024.0 ** 2
+        self.spill_path = spill_path
+        self.spill_files = []           # paths of the spill files
+        self.spill_lens = []            # number of results per spill file
+        self.results = []               # results kept in memory
+        self.nbytes = 0                 # estimated size of the results kept in memory
+        self.chunk_cache = (None, [])   # (index, results) of the last loaded spill file
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # GETTERS / SETTERS ------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    def __get_max_nbytes(self) -> float: return self.__max_nbytes
+    def __set_max_nbytes(self, x: float) -> None: self.__max_nbytes = x
+    max_nbytes = property(__get_max_nbytes, __set_max_nbytes)
+
+    def __get_spill_path(self) -> str: return self.__spill_path
+    def __set_spill_path(self, x: str) -> None: self.__spill_path = x
+    spill_path = property(__get_spill_path, __set_spill_path)
+
+    def __get_spill_files(self) -> list: return self.__spill_files
+    def __set_spill_files(self, x: list) -> None: self.__spill_files = x
+    spill_files = property(__get_spill_files, __set_spill_files)
+
+    def __get_spill_lens(self) -> list: return self.__spill_lens
+    def __set_spill_lens(self, x: list) -> None: self.__spill_lens = x
+    spill_lens = property(__get_spill_lens, __set_spill_lens)
+
+    def __get_results(self) -> list: return self.__results
+    def __set_results(self, x: list) -> None: self.__results = x
+    results = property(__get_results, __set_results)
+
+    def __get_nbytes(self) -> int: return self.__nbytes
+    def __set_nbytes(self, x: int) -> None: self.__nbytes = x
+    nbytes = property(__get_nbytes, __set_nbytes)
+
+    def __get_chunk_cache(self) -> tuple: return self.__chunk_cache
+    def __set_chunk_cache(self, x: tuple) -> None: self.__chunk_cache = x
+    chunk_cache = property(__get_chunk_cache, __set_chunk_cache)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # METHODS ----------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.remove_spill_files()
+
+    def __len__(self) -> int:
+        return sum(self.spill_lens) + len(self.results)
+
+    def __iter__(self):
+        for idx_file in range(len(self.spill_files)):
+            yield from self.__load_chunk(idx_file=idx_file)
+
+        yield from self.results
+
+    def __getitem__(self, idx: int) -> dict:
+        if idx < 0:
+            idx += len(self)
+
+        if not 0 <= idx < len(self):
+            raise IndexError("Result index out of range!")
+
+        for idx_file, no_results in enumerate(self.spill_lens):
+            if idx < no_results:
+                return self.__load_chunk(idx_file=idx_file)[idx]
+
+            idx -= no_results
+
+        return self.results[idx]
+
+    def append(self, result: dict) -> None:
+        self.results.append(result)
+        self.nbytes += get_result_nbytes(result=result)
+
+        if self.nbytes > self.max_nbytes:
+            self.spill()
+
+    def spill(self) -> None:
+        """Write the results kept in memory into a new spill file."""
+
+        if not self.results:
+            return
+
+        os.makedirs(self.spill_path, exist_ok=True)
+        file_path = os.path.join(self.spill_path, "results_%i.pkl" % len(self.spill_files))
+
+        with open(file_path, 'wb') as fh:
+            pickle.dump(self.results, fh, protocol=pickle.HIGHEST_PROTOCOL)
+
+        self.spill_files.append(file_path)
+        self.spill_lens.append(len(self.results))
+        self.results = []
+        self.nbytes = 0
+
+    def remove_spill_files(self) -> None:
+        """Remove the spill files and the spill folder (if empty afterwards), the spilled results are lost."""
+
+        for file_path in self.spill_files:
+            os.remove(file_path)
+
+        if self.spill_files and not os.listdir(self.spill_path):
+            os.rmdir(self.spill_path)
+
+        self.spill_files = []
+        self.spill_lens = []
+        self.chunk_cache = (None, [])
+
+    def __load_chunk(self, idx_file: int) -> list:
+        if not self.chunk_cache[0] == idx_file:
+            with open(self.spill_files[idx_file], 'rb') as fh:
+                self.chunk_cache = (idx_file, pickle.load(fh))
+
+        return self.chunk_cache[1]
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# FUNCTIONS ------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+def get_result_nbytes(result: dict) -> int:
+    """Estimate the memory of a result dict (arrays that are views are counted with the size of their base array once
+    since the view keeps the base array alive)."""
+
+    nbytes = 0
+    bases = set()
+
+    for driverinfo in result["driverinfo"].values():
+        nbytes += 1024  # rough estimate for the dict and the remaining entries
+
+        for key in ("racetimes", "positions", "bool_driving"):
+            arr = driverinfo[key]
+
+            if arr.base is not None:
+                if id(arr.base) not in bases:
+                    bases.add(id(arr.base))
+                    nbytes += arr.base.nbytes
+            else:
+                nbytes += arr.nbytes
+
+    return nbytes
+
+
+def unpack_bool_driving(result: dict, initials: str) -> np.ndarray:
+    """Return the bool_driving array of a driver as bool array (also for compact results containing packed bits)."""
+
+    driverinfo = result["driverinfo"][initials]
+
+    if result.get("compact", False):
+        return np.unpackbits(driverinfo["bool_driving"], count=driverinfo["racetimes"].size).astype(bool)
+    else:
+        return driverinfo["bool_driving"]
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# TESTING --------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    pass
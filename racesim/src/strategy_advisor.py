@@ -0,0 +1,477 @@
+from racesim.src.race import Race
+from racesim.src.vse import VSE
+from concurrent import futures  # required for parallel computing
+import numpy as np
+import contextlib
+import random
+import pickle
+import copy
+import math
+import time
+import io
+
+# VSE of the current worker process (created once per worker since loading the NN models takes a while)
+_vse_worker = None
+
+# attributes that describe the state of a VSE during a race (the NN models themselves cannot be serialized)
+_VSE_STATE_ATTRS = ("idxs_driver_supervised",
+                    "idxs_driver_reinf",
+                    "idxs_driver_reinf_training",
+                    "idxs_driver_base",
+                    "idxs_driver_real",
+                    "no_drivers",
+                    "cache_tireageprogress_corr_prevlap",
+                    "cache_position_preprevlap",
+                    "cache_ahead_preprevlap",
+                    "cache_position_bef_pit_prevlap")
+
+
+class StrategyAdvisor(object):
+    """
+    .. description::
+    The strategy advisor is used during a live race to evaluate the strategy options of a driver at the end of the
+    current lap: stay out or pit in the next lap onto one of the available compounds. For every candidate action, the
+    remaining laps are simulated as Monte Carlo rollouts starting from the given race state. Opponents are controlled by
+    the VSE (virtual strategy engineer) if the race uses one, otherwise they follow their strategy info. Random events
+    (FCY phases and retirements) are created for the remaining race progress only.
+
+    The rollouts are spread across a process pool that is created once in the constructor (such that the VSE models
+    are loaded only once per worker) and are submitted until the latency budget is used up. The same random seeds are
+    used for the rollouts of all candidate actions (common random numbers) to reduce the variance of the comparison.
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # SLOTS ------------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    __slots__ = ("__pars_in",
+                 "__vse_paths",
+                 "__no_workers",
+                 "__use_prob_infl",
+                 "__create_rand_events",
+                 "__executor",
+                 "__pending_jobs")
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CONSTRUCTOR ------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    def __init__(self,
+                 pars_in: dict,
+                 vse_paths: dict,
+                 no_workers: int,
+                 use_prob_infl: bool = True,
+                 create_rand_events: bool = True) -> None:
+
+        self.pars_in = pars_in
+        self.vse_paths = vse_paths
+        self.no_workers = no_workers
+        self.use_prob_infl = use_prob_infl
+        self.create_rand_events = create_rand_events
+
+        # create executor instance (pool of processes available for parallel calculations)
+        if self.no_workers > 1:
+            self.executor = futures.ProcessPoolExecutor(max_workers=self.no_workers,
+                                                        initializer=_init_worker,
+                                                        initargs=(self.pars_in, self.vse_paths))
+        else:
+            self.executor = None
+
+        # jobs of the last call of advise() that were not finished within the latency budget
+        self.pending_jobs = []
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # GETTERS / SETTERS ------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    def __get_pars_in(self) -> dict: return self.__pars_in
+    def __set_pars_in(self, x: dict) -> None: self.__pars_in = x
+    pars_in = property(__get_pars_in, __set_pars_in)
+
+    def __get_vse_paths(self) -> dict: return self.__vse_paths
+    def __set_vse_paths(self, x: dict) -> None: self.__vse_paths = x
+    vse_paths = property(__get_vse_paths, __set_vse_paths)
+
+    def __get_no_workers(self) -> int: return self.__no_workers
+
+    def __set_no_workers(self, x: int) -> None:
+        if not 0 < x < 1000:
+            raise RuntimeError("Unreasonable value!", x)
+        self.__no_workers = x
+    no_workers = property(__get_no_workers, __set_no_workers)
+
+    def __get_use_prob_infl(self) -> bool: return self.__use_prob_infl
+    def __set_use_prob_infl(self, x: bool) -> None: self.__use_prob_infl = x
+    use_prob_infl = property(__get_use_prob_infl, __set_use_prob_infl)
+
+    def __get_create_rand_events(self) -> bool: return self.__create_rand_events
+    def __set_create_rand_events(self, x: bool) -> None: self.__create_rand_events = x
+    create_rand_events = property(__get_create_rand_events, __set_create_rand_events)
+
+    def __get_executor(self) -> futures.ProcessPoolExecutor: return self.__executor
+    def __set_executor(self, x: futures.ProcessPoolExecutor) -> None: self.__executor = x
+    executor = property(__get_executor, __set_executor)
+
+    def __get_pending_jobs(self) -> list: return self.__pending_jobs
+    def __set_pending_jobs(self, x: list) -> None: self.__pending_jobs = x
+    pending_jobs = property(__get_pending_jobs, __set_pending_jobs)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # METHODS ----------------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    def shutdown(self) -> None:
+        """This method shuts down the process pool, it must be called as soon as the advisor is not required anymore."""
+
+        if self.executor is not None:
+            # cancel jobs that did not start so far (shutdown() supports cancel_futures only from Python 3.9 on)
+            for job_handle in self.pending_jobs:
+                job_handle.cancel()
+
+            self.pending_jobs = []
+            self.executor.shutdown(wait=False)
+            self.executor = None
+
+    def advise(self,
+               race: Race,
+               initials: str,
+               t_budget: float = 5.0,
+               no_rollouts_max: int = 1000,
+               compounds: list = None,
+               seed: int = None) -> list:
+        """
+        .. inputs::
+        :param race:                Race object that was simulated until the end of the current lap (e.g. using
+                                    simulate_laps()), it is not modified.
+        :type race:                 Race
+        :param initials:            Initials of the driver to advise.
+        :type initials:             str
+        :param t_budget:            [s] Latency budget, no further rollouts are started afterwards and rollouts that
+                                    are not finished until then are discarded.
+        :type t_budget:             float
+        :param no_rollouts_max:     Maximum number of rollouts per candidate action.
+        :type no_rollouts_max:      int
+        :param compounds:           Compounds to consider for a pit stop, the parameterized dry compounds are used if
+                                    None.
+        :type compounds:            list
+        :param seed:                Seed for the random numbers of the rollouts (random if None).
+        :type seed:                 int
+
+        .. outputs::
+        :return actions:            List with a dict per candidate action, sorted from best to worst mean final
+                                    position (infeasible actions last): {"action": 'stay_out' or 'pit_<compound>',
+                                    "compound": None or compound, "feasible": bool (False if any rollout was invalid),
+                                    "no_rollouts": int, "no_invalid": int, "mean_position": float, "ci_position":
+                                    [lower, upper] (95% confidence interval of the mean), "position_probs": np.ndarray
+                                    (probability of every final position), "mean_racetime": float (mean final race time
+                                    of the rollouts in which the driver finished the race)}
+        :rtype actions:             list
+        """
+
+        # --------------------------------------------------------------------------------------------------------------
+        # PREPARATION --------------------------------------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
+
+        t_start = time.perf_counter()
+
+        idx_driver = next((idx for idx, driver in enumerate(race.drivers_list) if driver.initials == initials), None)
+
+        if idx_driver is None:
+            raise RuntimeError("Driver %s does not participate in the race!" % initials)
+        if race.cur_lap >= race.race_pars["tot_no_laps"]:
+            raise RuntimeError("Race is already finished, there is nothing to advise!")
+        if not race.bool_driving[race.cur_lap, idx_driver]:
+            raise RuntimeError("Driver %s retired already, there is nothing to advise!" % initials)
+
+        if compounds is None:
+            compounds = self.pars_in["vse_pars"]["param_dry_compounds"]
+
+        actions = [None] + list(compounds)  # None = stay out
+
+        # serialize race state once (the VSE cannot be serialized and is therefore handled separately)
+        vse_tmp = race.vse
+        race.vse = None
+        race_state = pickle.dumps(race)
+        race.vse = vse_tmp
+
+        vse_state = _get_vse_state(vse=race.vse) if race.vse is not None else None
+
+        # every rollout number gets its own seed that is used for all the actions
+        rng = random.Random(seed)
+        seeds = [rng.randrange(2 ** 32) for _ in range(no_rollouts_max)]
+
+        # [status, final position, final race time] per seed and action (None if the rollout was not finished)
+        results_seeds = [[None] * len(actions) for _ in seeds]
+
+        # --------------------------------------------------------------------------------------------------------------
+        # ROLLOUTS (SINGLE PROCESS) ------------------------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
+
+        if self.executor is None:
+            for idx_seed, cur_seed in enumerate(seeds):
+                if time.perf_counter() - t_start > t_budget:
+                    break
+
+                for idx_action, compound in enumerate(actions):
+                    race_tmp = pickle.loads(race_state)
+
+                    if vse_tmp is not None:
+                        race_tmp.vse = vse_tmp
+                        _set_vse_state(vse=vse_tmp, vse_state=vse_state)
+
+                    results_seeds[idx_seed][idx_action] = \
+                        _simulate_rollout(race=race_tmp,
+                                          idx_driver=idx_driver,
+                                          compound=compound,
+                                          use_prob_infl=self.use_prob_infl,
+                                          create_rand_events=self.create_rand_events,
+                                          seed=cur_seed)
+
+            # restore state of the VSE of the original race
+            if vse_tmp is not None:
+                _set_vse_state(vse=vse_tmp, vse_state=vse_state)
+
+        # --------------------------------------------------------------------------------------------------------------
+        # ROLLOUTS (MULTIPLE PROCESSES) --------------------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
+
+        else:
+            # keep a limited number of jobs in the waiting queue such that no larger amount of jobs must be cancelled
+            # when the latency budget is used up
+            max_no_concurrent_jobs = 2 * self.no_workers
+            idx_seed = 0
+            job_queue = {}
+
+            while (job_queue or idx_seed < len(seeds)) and time.perf_counter() - t_start < t_budget:
+                # submit jobs as long as the waiting queue is not full (rollouts of all actions for the same seed)
+                while len(job_queue) < max_no_concurrent_jobs and idx_seed < len(seeds):
+                    for idx_action, compound in enumerate(actions):
+                        job_queue[self.executor.submit(_rollout,
+                                                       race_state,
+                                                       vse_state,
+                                                       idx_driver,
+                                                       compound,
+                                                       self.use_prob_infl,
+                                                       self.create_rand_events,
+                                                       seeds[idx_seed])] = (idx_seed, idx_action)
+                    idx_seed += 1
+
+                # collect results as soon as they are available
+                done, _ = futures.wait(list(job_queue.keys()),
+                                       timeout=max(t_budget - (time.perf_counter() - t_start), 0.0),
+                                       return_when=futures.FIRST_COMPLETED)
+
+                for job_handle in done:
+                    idx_seed_job, idx_action = job_queue.pop(job_handle)
+                    results_seeds[idx_seed_job][idx_action] = job_handle.result()
+
+            # cancel jobs that did not start within the latency budget (running jobs cannot be stopped, they are kept
+            # such that shutdown() can also cancel them in case they are still waiting)
+            for job_handle in job_queue:
+                job_handle.cancel()
+
+            self.pending_jobs = [job_handle for job_handle in job_queue if not job_handle.done()]
+
+        # --------------------------------------------------------------------------------------------------------------
+        # EVALUATION ---------------------------------------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
+
+        # use only the seeds whose rollouts were finished for every action such that common random numbers are kept
+        results_seeds = [x for x in results_seeds if all(y is not None for y in x)]
+        results = [[x[idx_action] for x in results_seeds] for idx_action in range(len(actions))]
+        no_rollouts = len(results_seeds)
+
+        if no_rollouts == 0:
+            raise RuntimeError("No rollout was finished within the latency budget, increase t_budget!")
+
+        actions_eval = []
+
+        for idx_action, compound in enumerate(actions):
+            results_valid = [x for x in results[idx_action] if x[0] == 0]
+            positions = np.array([x[1] for x in results_valid], dtype=np.int32)
+            racetimes = np.array([x[2] for x in results_valid])
+            racetimes = racetimes[~np.isnan(racetimes)]
+
+            if positions.size > 0:
+                mean_position = float(np.mean(positions))
+                ci_halfwidth = 1.96 * float(np.std(positions, ddof=1)) / math.sqrt(positions.size) \
+                    if positions.size > 1 else math.inf
+                position_probs = np.bincount(positions - 1, minlength=race.no_drivers) / positions.size
+            else:
+                mean_position = math.inf
+                ci_halfwidth = math.inf
+                position_probs = np.zeros(race.no_drivers)
+
+            actions_eval.append({"action": 'stay_out' if compound is None else 'pit_' + compound,
+                                 "compound": compound,
+                                 "feasible": positions.size == no_rollouts,
+                                 "no_rollouts": no_rollouts,
+                                 "no_invalid": no_rollouts - positions.size,
+                                 "mean_position": mean_position,
+                                 "ci_position": [mean_position - ci_halfwidth, mean_position + ci_halfwidth]
+                                 if positions.size > 0 else [math.inf, math.inf],
+                                 "position_probs": position_probs,
+                                 "mean_racetime": float(np.mean(racetimes)) if racetimes.size > 0 else math.nan})
+
+        # rank feasible actions by mean final position, use the mean race time as second criterion -> infeasible actions
+        # (i.e. actions leading to invalid races in at least one rollout, e.g. due to the compound rule) are put last
+        actions_eval.sort(key=lambda x: (not x["feasible"],
+                                         x["mean_position"],
+                                         x["mean_racetime"] if not math.isnan(x["mean_racetime"]) else math.inf))
+
+        return actions_eval
+
+    def print_advice(self, actions: list) -> None:
+        """This method prints the ranked actions returned by advise(), infeasible actions are not ranked."""
+
+        for cur_action in actions:
+            if not cur_action["feasible"]:
+                print("RESULT: %-10s infeasible, %i of %i rollouts invalid (e.g. compound rule violated)"
+                      % (cur_action["action"], cur_action["no_invalid"], cur_action["no_rollouts"]))
+                continue
+
+            print("RESULT: %-10s mean position %5.2f (95%% CI [%5.2f, %5.2f]), mean race time %9.3fs, %i rollouts"
+                  " (%i invalid)"
+                  % (cur_action["action"], cur_action["mean_position"], cur_action["ci_position"][0],
+                     cur_action["ci_position"][1], cur_action["mean_racetime"], cur_action["no_rollouts"],
+                     cur_action["no_invalid"]))
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# HELPER FUNCTIONS (MUST BE LOCATED ON MODULE LEVEL SUCH THAT THEY CAN BE USED BY THE WORKER PROCESSES) ----------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+def _init_worker(pars_in: dict, vse_paths: dict) -> None:
+    """Create the VSE of the current worker process (if the race uses a VSE)."""
+
+    global _vse_worker
+
+    if vse_paths is not None:
+        _vse_worker = VSE(vse_paths=vse_paths,
+                          vse_pars=copy.deepcopy(pars_in["vse_pars"]),
+                          location=pars_in["track_pars"]["name"],
+                          ref_driver=pars_in["monte_carlo_pars"]["ref_driver"])
+
+
+def _get_vse_state(vse: VSE) -> dict:
+    """Return a copy of the race dependent state of a VSE (including the features of the NN based VSEs)."""
+
+    vse_state = {attr: copy.deepcopy(getattr(vse, attr)) for attr in _VSE_STATE_ATTRS}
+
+    if vse.vse_supervised is not None:
+        vse_state["supervised"] = (np.copy(vse.vse_supervised.X_conv_cc) if vse.vse_supervised.X_conv_cc is not None
+                                   else None,
+                                   np.copy(vse.vse_supervised.X_conv_tc) if vse.vse_supervised.X_conv_tc is not None
+                                   else None)
+
+    if vse.vse_reinf is not None:
+        vse_state["reinf"] = np.copy(vse.vse_reinf.X_conv) if vse.vse_reinf.X_conv is not None else None
+
+    return vse_state
+
+
+def _set_vse_state(vse: VSE, vse_state: dict) -> None:
+    """Set the race dependent state of a VSE (copies are set such that the given state can be reused)."""
+
+    for attr in _VSE_STATE_ATTRS:
+        setattr(vse, attr, copy.deepcopy(vse_state[attr]))
+
+    vse.decision_overrides = {}
+
+    if vse.vse_supervised is not None:
+        vse.vse_supervised.X_conv_cc = copy.deepcopy(vse_state["supervised"][0])
+        vse.vse_supervised.X_conv_tc = copy.deepcopy(vse_state["supervised"][1])
+
+    if vse.vse_reinf is not None:
+        vse.vse_reinf.X_conv = copy.deepcopy(vse_state["reinf"])
+
+
+def _rollout(race_state: bytes,
+             vse_state: dict or None,
+             idx_driver: int,
+             compound: str or None,
+             use_prob_infl: bool,
+             create_rand_events: bool,
+             seed: int) -> list:
+    """Rollout executed by a worker process."""
+
+    race = pickle.loads(race_state)
+
+    if vse_state is not None:
+        race.vse = _vse_worker
+        _set_vse_state(vse=race.vse, vse_state=vse_state)
+
+    return _simulate_rollout(race=race,
+                             idx_driver=idx_driver,
+                             compound=compound,
+                             use_prob_infl=use_prob_infl,
+                             create_rand_events=create_rand_events,
+                             seed=seed)
+
+
+def _simulate_rollout(race: Race,
+                      idx_driver: int,
+                      compound: str or None,
+                      use_prob_infl: bool,
+                      create_rand_events: bool,
+                      seed: int) -> list:
+    """Apply the action (compound None = stay out) for the given driver in the next lap and simulate the remaining race.
+    Returns [result status, final position, final race time (nan if not finished)]."""
+
+    random.seed(seed)
+    np.random.seed(seed)
+
+    race.use_prob_infl = use_prob_infl
+
+    if create_rand_events:
+        race.resample_remaining_events()
+
+    # apply action -----------------------------------------------------------------------------------------------------
+    action_lap = race.cur_lap + 1
+    driver = race.drivers_list[idx_driver]
+
+    if race.vse is not None:
+        # VSE decision of the driver is overridden in the action lap, afterwards the VSE takes the decisions again
+        race.vse.decision_overrides = {idx_driver: compound}
+
+    else:
+        # driver follows his strategy info -> pitting now inserts an additional pit stop (it replaces a pit stop that
+        # is planned for the action lap) and keeps the later planned pit stops, staying out postpones a pit stop that is
+        # planned for the action lap by one lap
+        strategy_past = [x for x in driver.strategy_info if x[0] < action_lap]
+        strategy_future = [list(x) for x in driver.strategy_info if x[0] >= action_lap]
+
+        if compound is not None:
+            if strategy_future and strategy_future[0][0] == action_lap:
+                del strategy_future[0]
+
+            strategy_future = [[action_lap, compound, 0, 0.0]] + strategy_future
+
+        elif strategy_future and strategy_future[0][0] == action_lap:
+            strategy_future[0][0] += 1
+
+            if strategy_future[0][0] > race.race_pars["tot_no_laps"] \
+                    or (len(strategy_future) > 1 and strategy_future[1][0] == strategy_future[0][0]):
+                del strategy_future[0]
+
+        driver.strategy_info = strategy_past + strategy_future
+        race.compile_pit_schedule(idx_driver=idx_driver)
+
+    # simulate remaining race (warnings of invalid rollouts are suppressed, they are counted in the evaluation) -------
+    with contextlib.redirect_stdout(io.StringIO()):
+        race.simulate_race()
+
+    # VSE must not be returned by the worker processes
+    race.vse = None
+
+    return [race.result_status,
+            int(race.positions[-1, idx_driver]),
+            float(race.racetimes[-1, idx_driver])]
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# TESTING --------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    pass
@@ -0,0 +1,64 @@
+"""
+.. description::
+Helper functions for the optional timing instrumentation of the race simulation (see use_timing in the Race class). A
+timing dict contains the accumulated wall time and the number of calls for every phase of Race.__simulate_lap() in the
+form {phase: {"t": [s], "no_calls": int}}, the overtaking phase additionally contains the number of overtaking sweeps
+(iterations of the overtaking loop) and the number of checked driver pairs (pairs within the same cluster).
+"""
+
+# phases of Race.__simulate_lap() in the order of execution
+TIMING_PHASES = ("pitstop_outlap",
+                 "calc_laptimes",
+                 "fcy",
+                 "car_aging",
+                 "retirements",
+                 "overtaking",
+                 "vse",
+                 "pitstop_inlap",
+                 "fcy_checks")
+
+
+def create_timing() -> dict:
+    timing = {phase: {"t": 0.0, "no_calls": 0} for phase in TIMING_PHASES}
+    timing["overtaking"]["no_sweeps"] = 0
+    timing["overtaking"]["no_pairs"] = 0
+
+    return timing
+
+
+def add_timing(timing_tot: dict, timing: dict) -> None:
+    """Add the timing of a race (or of multiple races) to the total timing (in place)."""
+
+    for phase in TIMING_PHASES:
+        for key in timing[phase]:
+            timing_tot[phase][key] += timing[phase][key]
+
+
+def print_timing(timing: dict, no_races: int) -> None:
+    """Print the timing report, no_races is the number of races that were used to determine the timing."""
+
+    t_tot = sum(timing[phase]["t"] for phase in TIMING_PHASES)
+    no_laps = timing["calc_laptimes"]["no_calls"]
+
+    print("RESULT: Timing of the lap simulation phases (%i races, %i laps, %.3fs in total):"
+          % (no_races, no_laps, t_tot))
+
+    for phase in TIMING_PHASES:
+        print("RESULT: %-15s %9.3fs (%5.1f%%), %8.1fus per call"
+              % (phase,
+                 timing[phase]["t"],
+                 timing[phase]["t"] / t_tot * 100.0 if t_tot > 0.0 else 0.0,
+                 timing[phase]["t"] / timing[phase]["no_calls"] * 1e6 if timing[phase]["no_calls"] > 0 else 0.0))
+
+    if timing["overtaking"]["no_calls"] > 0:
+        print("RESULT: %.2f overtaking sweeps and %.2f checked driver pairs per lap on average"
+              % (timing["overtaking"]["no_sweeps"] / timing["overtaking"]["no_calls"],
+                 timing["overtaking"]["no_pairs"] / timing["overtaking"]["no_calls"]))
+
+
+# ----------------------------------------------------------------------------------------------------------------------
+# TESTING --------------------------------------------------------------------------------------------------------------
+# ----------------------------------------------------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    pass
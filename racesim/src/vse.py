@@ -47,10 +47,12 @@ class VSE(object):
                  "__avail_dry_compounds",
                  "__param_dry_compounds",
                  "__vse_pars",
+                 "__vse_paths",
                  "__cache_tireageprogress_corr_prevlap",
                  "__cache_position_preprevlap",
                  "__cache_ahead_preprevlap",
-                 "__cache_position_bef_pit_prevlap")
+                 "__cache_position_bef_pit_prevlap",
+                 "__decision_overrides")
 
     # ------------------------------------------------------------------------------------------------------------------
     # CONSTRUCTOR ------------------------------------------------------------------------------------------------------
@@ -64,6 +66,7 @@ class VSE(object):
 
         # initialize known variables (avail_dry_compounds should be solely used for the compound choice NN!)
         self.vse_pars = vse_pars
+        self.vse_paths = vse_paths
         self.avail_dry_compounds = [x for x in self.vse_pars["available_compounds"] if x not in ["I", "W"]]
         self.param_dry_compounds = self.vse_pars["param_dry_compounds"]
 
@@ -78,6 +81,7 @@ class VSE(object):
         self.cache_position_preprevlap = None
         self.cache_ahead_preprevlap = None
         self.cache_position_bef_pit_prevlap = None
+        self.decision_overrides = {}
 
         # during reinforcement training, the basic strategy determination must be performed by another VSE -> supervised
         # VSE is the favorite (it does not work for new/unknown tracks), followed by reinforcement VSE, base strategy
@@ -212,6 +216,10 @@ class VSE(object):
     def __set_vse_pars(self, x: dict) -> None: self.__vse_pars = x
     vse_pars = property(__get_vse_pars, __set_vse_pars)
 
+    def __get_vse_paths(self) -> dict: return self.__vse_paths
+    def __set_vse_paths(self, x: dict) -> None: self.__vse_paths = x
+    vse_paths = property(__get_vse_paths, __set_vse_paths)
+
     def __get_cache_tireageprogress_corr_prevlap(self) -> list: return self.__cache_tireageprogress_corr_prevlap
     def __set_cache_tireageprogress_corr_prevlap(self, x: list) -> None: self.__cache_tireageprogress_corr_prevlap = x
     cache_tireageprogress_corr_prevlap = property(__get_cache_tireageprogress_corr_prevlap,
@@ -230,6 +238,10 @@ class VSE(object):
     cache_position_bef_pit_prevlap = property(__get_cache_position_bef_pit_prevlap,
                                               __set_cache_position_bef_pit_prevlap)
 
+    def __get_decision_overrides(self) -> dict: return self.__decision_overrides
+    def __set_decision_overrides(self, x: dict) -> None: self.__decision_overrides = x
+    decision_overrides = property(__get_decision_overrides, __set_decision_overrides)
+
     # ------------------------------------------------------------------------------------------------------------------
     # METHODS ----------------------------------------------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
@@ -246,6 +258,7 @@ class VSE(object):
         self.cache_position_preprevlap = None
         self.cache_ahead_preprevlap = None
         self.cache_position_bef_pit_prevlap = None
+        self.decision_overrides = {}
 
         if self.vse_supervised is not None:
             self.vse_supervised.reset()
@@ -284,7 +297,8 @@ class VSE(object):
                        t_pitdrive_inlap_fcy: float,
                        t_pitdrive_outlap_fcy: float,
                        t_pitdrive_inlap_sc: float,
-                       t_pitdrive_outlap_sc: float) -> list:
+                       t_pitdrive_outlap_sc: float,
+                       independent_drivers: bool = False) -> list:
         """
         .. inputs::
         :param driver_initials:         List with driver initials (must be in the same order as the remaining inputs)
@@ -342,6 +356,10 @@ class VSE(object):
         :type t_pitdrive_inlap_sc:      float
         :param t_pitdrive_outlap_sc:    Track-specific pit stop time loss under SC conditions (out-lap)
         :type t_pitdrive_outlap_sc:     float
+        :param independent_drivers:     True if every entry should be regarded as a single driver alone on the track,
+                                        e.g. the same driver in several FCY scenarios, i.e. the features describing the
+                                        interaction with other drivers are set as for a single driver
+        :type independent_drivers:      bool
         """
 
         # --------------------------------------------------------------------------------------------------------------
@@ -449,7 +467,7 @@ class VSE(object):
         # tirechange_pursuer_prevlap -----------------------------------------------------------------------------------
         tirechange_pursuer_prevlap = [0] * self.no_drivers
 
-        if cur_lap > 1:
+        if cur_lap > 1 and not independent_drivers:
             for idx_driver in range(self.no_drivers):
                 """The pursuer is determined on the basis of the lap before the previous lap to avoid using the wrong
                 pursuer if he drove into the pit."""
@@ -484,8 +502,8 @@ class VSE(object):
         est_pos_losses = [0] * self.no_drivers
 
         for idx_driver in range(self.no_drivers):
-            # avoid feature generation for retired drivers
-            if not bool_driving[idx_driver]:
+            # avoid feature generation for retired drivers (there are no position losses for independent drivers)
+            if not bool_driving[idx_driver] or independent_drivers:
                 continue
 
             # get estimated time loss of a pit stop under current race conditions
@@ -514,8 +532,8 @@ class VSE(object):
         close_aheads = [False] * self.no_drivers
 
         for idx_driver in range(self.no_drivers):
-            # avoid feature generation for retired drivers
-            if not bool_driving[idx_driver]:
+            # avoid feature generation for retired drivers (independent drivers have no one ahead or behind)
+            if not bool_driving[idx_driver] or independent_drivers:
                 continue
 
             # calculate interval value
@@ -543,7 +561,7 @@ class VSE(object):
         # determine if there are defendable undercut attempts ----------------------------------------------------------
         defendable_undercuts = [False] * self.no_drivers
 
-        if cur_lap > 1:
+        if cur_lap > 1 and not independent_drivers:
             for idx_driver in range(self.no_drivers):
                 # avoid feature generation for retired drivers and continue if driver was on last position in previous
                 # lap
@@ -690,6 +708,17 @@ class VSE(object):
                 if next_compounds_tmp[idx_rel] is not None:
                     next_compounds[idx_abs] = next_compounds_tmp[idx_rel]
 
+        # --------------------------------------------------------------------------------------------------------------
+        # APPLY DECISION OVERRIDES -------------------------------------------------------------------------------------
+        # --------------------------------------------------------------------------------------------------------------
+
+        # decisions can be forced from outside, e.g. by the strategy advisor, in the form {idx_driver: compound or None}
+        # -> they are valid for a single call only
+        for idx_driver, compound in self.decision_overrides.items():
+            next_compounds[idx_driver] = compound
+
+        self.decision_overrides = {}
+
         # --------------------------------------------------------------------------------------------------------------
         # UPDATE CACHES FOR NEXT LAP -----------------------------------------------------------------------------------
         # --------------------------------------------------------------------------------------------------------------
@@ -699,8 +728,8 @@ class VSE(object):
         aheads_prevlap = np.zeros(self.no_drivers)
 
         for position_minus1, idx_driver in enumerate(idxs_sorted):
-            # continue if driver on current position had retired
-            if not bool_driving_prevlap[idx_driver]:
+            # continue if driver on current position had retired (independent drivers have no one behind)
+            if not bool_driving_prevlap[idx_driver] or independent_drivers:
                 aheads_prevlap[idx_driver] = np.inf
                 continue
 
@@ -718,7 +747,7 @@ class VSE(object):
                 pos_back_b = None
 
             if pos_back_b is not None:
-                aheads_prevlap[idx_driver] = racetimes_prevlap[pos_back_b] - racetimes_prevlap[pos_cur_b]
+                aheads_prevlap[idx_driver] = racetimes_prevlap[pos_back_b][0] - racetimes_prevlap[pos_cur_b][0]
             else:
                 aheads_prevlap[idx_driver] = np.inf
 
@@ -764,6 +793,44 @@ class VSE(object):
         Attention: Using the reinforcement VSE does not work during training!
         """
 
+        return self.determine_basic_strategies(driver=driver,
+                                               tot_no_laps=tot_no_laps,
+                                               fcy_scenarios=[fcy_phases],
+                                               location=location,
+                                               t_pit_tirechange_min=t_pit_tirechange_min,
+                                               t_pitdrive_inlap=t_pitdrive_inlap,
+                                               t_pitdrive_outlap=t_pitdrive_outlap,
+                                               t_pitdrive_inlap_fcy=t_pitdrive_inlap_fcy,
+                                               t_pitdrive_outlap_fcy=t_pitdrive_outlap_fcy,
+                                               t_pitdrive_inlap_sc=t_pitdrive_inlap_sc,
+                                               t_pitdrive_outlap_sc=t_pitdrive_outlap_sc,
+                                               mult_tiredeg_fcy=mult_tiredeg_fcy,
+                                               mult_tiredeg_sc=mult_tiredeg_sc)[0]
+
+    def determine_basic_strategies(self,
+                                   driver: Driver,
+                                   tot_no_laps: int,
+                                   fcy_scenarios: list,
+                                   location: str,
+                                   t_pit_tirechange_min: float,
+                                   t_pitdrive_inlap: float,
+                                   t_pitdrive_outlap: float,
+                                   t_pitdrive_inlap_fcy: float,
+                                   t_pitdrive_outlap_fcy: float,
+                                   t_pitdrive_inlap_sc: float,
+                                   t_pitdrive_outlap_sc: float,
+                                   mult_tiredeg_fcy: float = 0.5,
+                                   mult_tiredeg_sc: float = 0.25) -> list:
+
+        """
+        Batched version of determine_basic_strategy() that determines the basic strategies of the driver for several
+        FCY scenarios (list of FCY phase lists in the progress domain) in a single pass through the race. The scenarios
+        are independent of each other and are therefore handled as independent drivers within decide_pitstop(). The
+        basic strategies are returned in the order of the scenarios.
+
+        Attention: Using the reinforcement VSE does not work during training!
+        """
+
         # save original VSE to be able to temporarily replace it in case of reinforcement training
         orig_vse = self.vse_pars["vse_type"][driver.initials]
 
@@ -783,11 +850,13 @@ class VSE(object):
         # SIMULATE RACE ------------------------------------------------------------------------------------------------
         # --------------------------------------------------------------------------------------------------------------
 
-        # create list for strategy output starting with the correct information for the race start
-        basic_strategy_info = [driver.strategy_info[0]]
+        no_scenarios = len(fcy_scenarios)
+
+        # create lists for strategy output starting with the correct information for the race start
+        basic_strategy_infos = [[driver.strategy_info[0]] for _ in range(no_scenarios)]
 
         # consider correct start age
-        tire_age_tmp = float(basic_strategy_info[0][2])
+        tire_ages_tmp = [float(driver.strategy_info[0][2])] * no_scenarios
 
         for cur_lap in range(1, tot_no_laps + 1):
 
@@ -795,86 +864,93 @@ class VSE(object):
             # FEATURE PREPARATION --------------------------------------------------------------------------------------
             # ----------------------------------------------------------------------------------------------------------
 
-            # tirechange_tmp -------------------------------------------------------------------------------------------
-            if cur_lap > 1 and basic_strategy_info[-1][0] == cur_lap - 1:
-                tirechange_tmp = True
-            else:
-                tirechange_tmp = False
-
-            # fcy_types_tmp and fcy_start_end_progs_tmp ----------------------------------------------------------------
-            fcy_types_tmp = None
-            fcy_start_end_progs_tmp = [None, None]
-            lap_frac_normal = 1.0
-
-            for idx_fcy_phase, cur_fcy_phase in enumerate(fcy_phases):
-                # check if a phase affects the current lap (phases are in the progress domain if this method is called)
-                if cur_lap - 1.0 < cur_fcy_phase[1] and cur_fcy_phase[0] < cur_lap:
-                    # end progress can only be foreseen until the end of the current lap
-                    if cur_fcy_phase[2] == 'SC' or cur_fcy_phase[1] >= cur_lap:
-                        end_prog_tmp = float(cur_lap)
-                    else:
-                        end_prog_tmp = cur_fcy_phase[1]
+            tirechanges_tmp = [False] * no_scenarios
+            fcy_types_tmp = [None] * no_scenarios
+            fcy_start_end_progs_tmp = [[None, None] for _ in range(no_scenarios)]
 
-                    fcy_types_tmp = cur_fcy_phase[2]
-                    fcy_start_end_progs_tmp = [cur_fcy_phase[0], end_prog_tmp]
+            for idx_scenario, fcy_phases in enumerate(fcy_scenarios):
+                basic_strategy_info = basic_strategy_infos[idx_scenario]
 
-                    # save lap fraction information for tire age calculation
-                    lap_frac_normal = cur_lap - end_prog_tmp + max(cur_fcy_phase[0] - (cur_lap - 1.0), 0.0)
+                # tirechange_tmp ---------------------------------------------------------------------------------------
+                if cur_lap > 1 and basic_strategy_info[-1][0] == cur_lap - 1:
+                    tirechanges_tmp[idx_scenario] = True
 
-                    # break loop since we assume that not more than one phase can be active per lap
-                    break
+                # fcy_types_tmp and fcy_start_end_progs_tmp ------------------------------------------------------------
+                lap_frac_normal = 1.0
 
-            # tire_age_tmp (done after FCY handling to be able to consider decreased aging during FCY phase) -----------
-            if cur_lap > 1 and basic_strategy_info[-1][0] == cur_lap - 1:
-                # reset tire age in case of a tire change
-                tire_age_tmp = 0.0
+                for idx_fcy_phase, cur_fcy_phase in enumerate(fcy_phases):
+                    # check if a phase affects the current lap (phases are in the progress domain if this method is
+                    # called)
+                    if cur_lap - 1.0 < cur_fcy_phase[1] and cur_fcy_phase[0] < cur_lap:
+                        # end progress can only be foreseen until the end of the current lap
+                        if cur_fcy_phase[2] == 'SC' or cur_fcy_phase[1] >= cur_lap:
+                            end_prog_tmp = float(cur_lap)
+                        else:
+                            end_prog_tmp = cur_fcy_phase[1]
 
-            if fcy_types_tmp is None:
-                tire_age_tmp += 1.0
-            elif fcy_types_tmp == 'SC':
-                tire_age_tmp += lap_frac_normal + mult_tiredeg_sc * (1.0 - lap_frac_normal)
-            elif fcy_types_tmp == 'VSC':
-                tire_age_tmp += lap_frac_normal + mult_tiredeg_fcy * (1.0 - lap_frac_normal)
-            else:
-                raise RuntimeError("Unknown FCY type!")
+                        fcy_types_tmp[idx_scenario] = cur_fcy_phase[2]
+                        fcy_start_end_progs_tmp[idx_scenario] = [cur_fcy_phase[0], end_prog_tmp]
+
+                        # save lap fraction information for tire age calculation
+                        lap_frac_normal = cur_lap - end_prog_tmp + max(cur_fcy_phase[0] - (cur_lap - 1.0), 0.0)
+
+                        # break loop since we assume that not more than one phase can be active per lap
+                        break
+
+                # tire_age_tmp (done after FCY handling to be able to consider decreased aging during FCY phase) -------
+                if tirechanges_tmp[idx_scenario]:
+                    # reset tire age in case of a tire change
+                    tire_ages_tmp[idx_scenario] = 0.0
+
+                if fcy_types_tmp[idx_scenario] is None:
+                    tire_ages_tmp[idx_scenario] += 1.0
+                elif fcy_types_tmp[idx_scenario] == 'SC':
+                    tire_ages_tmp[idx_scenario] += lap_frac_normal + mult_tiredeg_sc * (1.0 - lap_frac_normal)
+                elif fcy_types_tmp[idx_scenario] == 'VSC':
+                    tire_ages_tmp[idx_scenario] += lap_frac_normal + mult_tiredeg_fcy * (1.0 - lap_frac_normal)
+                else:
+                    raise RuntimeError("Unknown FCY type!")
 
             # used2compounds -------------------------------------------------------------------------------------------
-            used_2compounds_tmp = len({x[1] for x in basic_strategy_info}) > 1
+            used_2compounds_tmp = [len({x[1] for x in basic_strategy_info}) > 1
+                                   for basic_strategy_info in basic_strategy_infos]
 
             # ----------------------------------------------------------------------------------------------------------
-            # GET TIRECHANGE DECISION ----------------------------------------------------------------------------------
+            # GET TIRECHANGE DECISIONS ---------------------------------------------------------------------------------
             # ----------------------------------------------------------------------------------------------------------
 
             # cur_racetimes_tmp can be set 0.0 since the race times are not directly inserted into the NN but used to
-            # determine features such as close ahead/behind (that are not relevant in case of a single driver)
-            next_compound = self.decide_pitstop(driver_initials=[driver.initials],
-                                                cur_compounds=[basic_strategy_info[-1][1]],
-                                                no_past_tirechanges=[len(basic_strategy_info) - 1],
-                                                tire_ages=[tire_age_tmp],
-                                                positions_prevlap=np.ones(1),
-                                                pit_prevlap=[tirechange_tmp],
-                                                cur_lap=cur_lap,
-                                                tot_no_laps=tot_no_laps,
-                                                fcy_types=[fcy_types_tmp],
-                                                fcy_start_end_progs=[fcy_start_end_progs_tmp],
-                                                bool_driving=np.ones(1, dtype=np.bool),
-                                                bool_driving_prevlap=np.ones(1, dtype=np.bool),
-                                                racetimes_prevlap=np.zeros(1),
-                                                location=location,
-                                                used_2compounds=[used_2compounds_tmp],
-                                                cur_positions=np.ones(1),
-                                                cur_racetimes_tmp=np.zeros(1),
-                                                t_pit_tirechange_min=t_pit_tirechange_min,
-                                                t_pit_tirechange_adds=[driver.car.t_pit_tirechange_add],
-                                                t_pitdrive_inlap=t_pitdrive_inlap,
-                                                t_pitdrive_outlap=t_pitdrive_outlap,
-                                                t_pitdrive_inlap_fcy=t_pitdrive_inlap_fcy,
-                                                t_pitdrive_outlap_fcy=t_pitdrive_outlap_fcy,
-                                                t_pitdrive_inlap_sc=t_pitdrive_inlap_sc,
-                                                t_pitdrive_outlap_sc=t_pitdrive_outlap_sc)[0]
-
-            if next_compound is not None:
-                basic_strategy_info.append([cur_lap, next_compound, 0, 0.0])
+            # determine features such as close ahead/behind (that are not relevant in case of independent drivers)
+            next_compounds = self.decide_pitstop(driver_initials=[driver.initials] * no_scenarios,
+                                                 cur_compounds=[x[-1][1] for x in basic_strategy_infos],
+                                                 no_past_tirechanges=[len(x) - 1 for x in basic_strategy_infos],
+                                                 tire_ages=list(tire_ages_tmp),
+                                                 positions_prevlap=np.ones(no_scenarios),
+                                                 pit_prevlap=tirechanges_tmp,
+                                                 cur_lap=cur_lap,
+                                                 tot_no_laps=tot_no_laps,
+                                                 fcy_types=fcy_types_tmp,
+                                                 fcy_start_end_progs=fcy_start_end_progs_tmp,
+                                                 bool_driving=np.ones(no_scenarios, dtype=np.bool),
+                                                 bool_driving_prevlap=np.ones(no_scenarios, dtype=np.bool),
+                                                 racetimes_prevlap=np.zeros(no_scenarios),
+                                                 location=location,
+                                                 used_2compounds=used_2compounds_tmp,
+                                                 cur_positions=np.ones(no_scenarios),
+                                                 cur_racetimes_tmp=np.zeros(no_scenarios),
+                                                 t_pit_tirechange_min=t_pit_tirechange_min,
+                                                 t_pit_tirechange_adds=[driver.car.t_pit_tirechange_add] * no_scenarios,
+                                                 t_pitdrive_inlap=t_pitdrive_inlap,
+                                                 t_pitdrive_outlap=t_pitdrive_outlap,
+                                                 t_pitdrive_inlap_fcy=t_pitdrive_inlap_fcy,
+                                                 t_pitdrive_outlap_fcy=t_pitdrive_outlap_fcy,
+                                                 t_pitdrive_inlap_sc=t_pitdrive_inlap_sc,
+                                                 t_pitdrive_outlap_sc=t_pitdrive_outlap_sc,
+                                                 independent_drivers=True)
+
+            for basic_strategy_info, next_compound in zip(basic_strategy_infos, next_compounds):
+                if next_compound is not None:
+                    basic_strategy_info.append([cur_lap, next_compound, 0, 0.0])
 
         # reset VSE for subsequent race simulation
         self.reset()
@@ -882,7 +958,7 @@ class VSE(object):
         # reset original VSE type
         self.vse_pars["vse_type"][driver.initials] = orig_vse
 
-        return basic_strategy_info
+        return basic_strategy_infos
 
 
 # ----------------------------------------------------------------------------------------------------------------------
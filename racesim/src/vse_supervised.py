@@ -219,7 +219,7 @@ class VSE_SUPERVISED(object):
             self.nnmodel_tc["interpreter"].invoke()
 
             # fetch NN output
-            pitstop_probs[idx_driver] = self.nnmodel_tc["interpreter"].get_tensor(self.nnmodel_tc["output_index"])
+            pitstop_probs[idx_driver] = self.nnmodel_tc["interpreter"].get_tensor(self.nnmodel_tc["output_index"])[0][0]
 
         # get indices of the drivers that have a predicted pitstop probability above 50%
         idxs_driver_pitstop = list(np.flatnonzero(np.round(pitstop_probs)))
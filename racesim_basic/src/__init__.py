@@ -1,5 +1,9 @@
 import racesim_basic.src.calc_racetimes_basic
+import racesim_basic.src.calc_racetimes_full_factorial
+import racesim_basic.src.calc_racetimes_fcy_scenarios
+import racesim_basic.src.create_fcy_scenarios
 import racesim_basic.src.opt_strategy_basic
+import racesim_basic.src.opt_strategy_dp
 import racesim_basic.src.import_pars
 import racesim_basic.src.check_pars
 import racesim_basic.src.import_ext_params
@@ -1,6 +1,7 @@
 import numpy as np
 import helper_funcs.src.calc_tire_degradation
 import math
+import itertools
 
 
 def calc_racetimes_basic(t_base: float,
@@ -389,101 +390,83 @@ def calc_racetimes_basic(t_base: float,
         # case SC: [start race time, end race time, type, SC delay in seconds, SC duration in laps]
         fcy_phases_conv = [[None, None, x[2], None, None] for x in fcy_phases]
 
+        # race times at the start of every lap (index = lap - 1, last entry = race time at the finish) -> it replaces
+        # the summation of the lap times for every affected lap and is updated whenever the lap times were modified
+        t_race_lapstart = np.zeros(tot_no_laps + 1)
+
         # loop through the phases from front to back (it was assured that the phases are sorted in an ascending order)
         for idx_phase, cur_phase in enumerate(fcy_phases):
-            # loop through the affected laps
+            # determine affected laps
             start_idx = math.floor(cur_phase[0])
             stop_idx = math.ceil(cur_phase[1])
+            idxs_lap = np.arange(start_idx, stop_idx)
 
-            for idx_lap in range(start_idx, stop_idx):
-                # determine affected lap fraction, slow lap time depending on FCY phase type and FCY phase start and
-                # stop race times
-                cur_progress = float(idx_lap)  # current race progress at start of lap
-
-                if cur_progress <= cur_phase[0]:
-                    # CASE 1: FCY phase starts within current lap (and might also end here) ----------------------------
-                    # get lap fraction driven with normal speed before FCY phase
-                    lap_frac_normal_bef = cur_phase[0] - cur_progress
-
-                    # get lap fraction driven with normal speed after FCY phase (if FCY phase is also ended within this
-                    # lap)
-                    if cur_progress + 1.0 >= cur_phase[1]:
-                        lap_frac_normal_aft = cur_progress + 1.0 - cur_phase[1]
-                    else:
-                        lap_frac_normal_aft = 0.0
-
-                    # calculate lap fractions driven normally and slowly
-                    lap_frac_normal = lap_frac_normal_bef + lap_frac_normal_aft
-                    lap_frac_slow = 1.0 - lap_frac_normal
-
-                    # determine slow lap time -> in the case of an SC phase this is nevertheless the FCY lap time in the
-                    # first lap of the phase, since the driver did not run up to the SC so far (SC waits for the driver
-                    # in the new lap)
-                    t_lap_slow = t_lap_fcy
-
-                    # fill start entry of converted FCY phase and consider possibly finished pit stops before start
-                    # (t_laps_pit is not considered for the current lap therefore)
-                    fcy_phases_conv[idx_phase][0] = (np.sum(t_laps[:idx_lap] + t_laps_pit[:idx_lap])
-                                                     + lap_frac_normal_bef * t_laps[idx_lap]
-                                                     + t_pit_before_fcy_start_end[idx_phase][0])
-
-                    # if the phase affects only one lap also fill the end entry of converted FCY phase
-                    if cur_progress + 1.0 >= cur_phase[1]:
-                        if math.isclose(cur_phase[1], tot_no_laps):
-                            # CASE 1: phase lasts until the end of the race -> set end race time inf
-                            fcy_phases_conv[idx_phase][1] = math.inf
-                        else:
-                            # CASE 2: normal case
-                            fcy_phases_conv[idx_phase][1] = fcy_phases_conv[idx_phase][0] + lap_frac_slow * t_lap_slow
-
-                elif cur_progress + 1.0 >= cur_phase[1]:
-                    # CASE 2: FCY phase was already started before and ends within current lap -------------------------
-                    # determine lap fractions and slow lap time
-                    if cur_phase[2] == 'SC':
-                        # for the SC it is assumed that it ends exactly on the finish line
-                        lap_frac_normal = 0.0
-                        lap_frac_slow = 1.0
-                        t_lap_slow = t_lap_sc
-                    else:
-                        lap_frac_normal = cur_progress + 1.0 - cur_phase[1]
-                        lap_frac_slow = 1.0 - lap_frac_normal
-                        t_lap_slow = t_lap_fcy
-
-                    # fill stop entry of converted FCY phase (t_laps_pit is not considered for the current lap
-                    # therefore)
-                    if math.isclose(cur_phase[1], tot_no_laps):
-                        # CASE 1: phase lasts until the end of the race -> set end race time inf
-                        fcy_phases_conv[idx_phase][1] = math.inf
-                    else:
-                        # CASE 2: normal case
-                        fcy_phases_conv[idx_phase][1] = (np.sum(t_laps[:idx_lap] + t_laps_pit[:idx_lap])
-                                                         + lap_frac_slow * t_lap_slow
-                                                         + t_pit_before_fcy_start_end[idx_phase][1])
+            if idxs_lap.size == 0:
+                continue
 
-                else:
-                    # CASE 3: whole lap affected by FCY phase (neither starting nor ending here) -----------------------
-                    lap_frac_normal = 0.0
-                    lap_frac_slow = 1.0
+            t_race_lapstart[1:] = np.cumsum(t_laps + t_laps_pit)
 
-                    # determine slow lap time
-                    if cur_phase[2] == 'SC':
-                        t_lap_slow = t_lap_sc
-                    else:
-                        t_lap_slow = t_lap_fcy
+            # determine slow lap times depending on FCY phase type -> in the case of an SC phase the FCY lap time is
+            # nevertheless used in the first lap of the phase, since the driver did not run up to the SC so far (SC
+            # waits for the driver in the new lap)
+            t_lap_slow = np.full(idxs_lap.size, t_lap_sc if cur_phase[2] == 'SC' else t_lap_fcy)
+            t_lap_slow[0] = t_lap_fcy
 
-                # set lap time (t_laps_pit not affected)
-                t_lap_tmp = lap_frac_normal * t_laps[idx_lap] + lap_frac_slow * t_lap_slow
+            # determine lap fractions driven with normal speed (zero for laps entirely affected by the FCY phase)
+            lap_frac_normal = np.zeros(idxs_lap.size)
 
-                if t_laps[idx_lap] < t_lap_tmp:
-                    t_laps[idx_lap] = t_lap_tmp
-                else:
-                    print("WARNING: The calculated lap time affected by the FCY phase is faster than the normal lap"
-                          " time. This should be checked!")
+            # CASE 1: FCY phase starts within the first lap (and might also end there) -> get lap fraction driven with
+            # normal speed before FCY phase and after FCY phase (if FCY phase is also ended within this lap)
+            lap_frac_normal_bef = cur_phase[0] - start_idx
+
+            if start_idx + 1.0 >= cur_phase[1]:
+                lap_frac_normal_aft = start_idx + 1.0 - cur_phase[1]
+            else:
+                lap_frac_normal_aft = 0.0
+
+            lap_frac_normal[0] = lap_frac_normal_bef + lap_frac_normal_aft
+
+            # CASE 2: FCY phase was already started before and ends within the last lap (for the SC it is assumed that
+            # it ends exactly on the finish line)
+            if idxs_lap.size > 1 and cur_phase[2] != 'SC':
+                lap_frac_normal[-1] = idxs_lap[-1] + 1.0 - cur_phase[1]
+
+            lap_frac_slow = 1.0 - lap_frac_normal
+
+            # fill start entry of converted FCY phase and consider possibly finished pit stops before start (t_laps_pit
+            # is not considered for the current lap therefore)
+            fcy_phases_conv[idx_phase][0] = (t_race_lapstart[start_idx]
+                                             + lap_frac_normal_bef * t_laps[start_idx]
+                                             + t_pit_before_fcy_start_end[idx_phase][0])
+
+            # set lap times (t_laps_pit not affected)
+            t_laps_tmp = lap_frac_normal * t_laps[idxs_lap] + lap_frac_slow * t_lap_slow
+            bool_slower = t_laps[idxs_lap] < t_laps_tmp
+            t_laps[idxs_lap[bool_slower]] = t_laps_tmp[bool_slower]
+
+            for _ in range(np.count_nonzero(~bool_slower)):
+                print("WARNING: The calculated lap time affected by the FCY phase is faster than the normal lap"
+                      " time. This should be checked!")
+
+            t_race_lapstart[1:] = np.cumsum(t_laps + t_laps_pit)
+
+            # fill end entry of converted FCY phase
+            if math.isclose(cur_phase[1], tot_no_laps):
+                # CASE 1: phase lasts until the end of the race -> set end race time inf
+                fcy_phases_conv[idx_phase][1] = math.inf
+            elif idxs_lap.size == 1:
+                # CASE 2: phase affects only one lap
+                fcy_phases_conv[idx_phase][1] = fcy_phases_conv[idx_phase][0] + lap_frac_slow[0] * t_lap_slow[0]
+            else:
+                # CASE 3: normal case (t_laps_pit is not considered for the last lap therefore)
+                fcy_phases_conv[idx_phase][1] = (t_race_lapstart[stop_idx - 1]
+                                                 + lap_frac_slow[-1] * t_lap_slow[-1]
+                                                 + t_pit_before_fcy_start_end[idx_phase][1])
 
             # calculate SC delay and duration of SC phase
             if cur_phase[2] == 'SC':
                 # get the race time at the end of the lap in which the SC starts
-                t_race_sc_start = np.sum(t_laps[:start_idx + 1] + t_laps_pit[:start_idx + 1])
+                t_race_sc_start = t_race_lapstart[start_idx + 1]
 
                 # calculate the difference to SC phase start and save this information as SC delay into the phase
                 fcy_phases_conv[idx_phase][3] = t_race_sc_start - fcy_phases_conv[idx_phase][0]
@@ -519,6 +502,479 @@ def calc_racetimes_basic(t_base: float,
     return t_race_lapwise, fcy_phases_conv
 
 
+def create_strategy_table(strategies: list) -> dict:
+    """
+    .. description::
+    Convert a list of strategies in the form [[inlap, compound, age, refueling], ...] (see calc_racetimes_basic()) into
+    the strategy table used by calc_racetimes_basic_batch(). The table contains (strategies x stints) arrays, strategies
+    with less stints are padded with inlap -1.
+
+    .. inputs::
+    :param strategies:          list of strategies, e.g. [[[0, 'A3', 2, 0.0], [20, 'A4', 0, 0.0]], ...]
+    :type strategies:           list
+
+    .. outputs::
+    :return strategy_table:     {"inlaps": int array, "compounds": object array, "tire_ages": float array, "refuels":
+                                float array}
+    :rtype strategy_table:      dict
+    """
+
+    no_strategies = len(strategies)
+    max_no_stints = max(len(strategy) for strategy in strategies) if strategies else 0
+
+    strategy_table = {"inlaps": np.full((no_strategies, max_no_stints), -1, dtype=np.int64),
+                      "compounds": np.full((no_strategies, max_no_stints), None, dtype=object),
+                      "tire_ages": np.zeros((no_strategies, max_no_stints)),
+                      "refuels": np.zeros((no_strategies, max_no_stints))}
+
+    for idx_strategy, strategy in enumerate(strategies):
+        for idx_stint, stint in enumerate(strategy):
+            strategy_table["inlaps"][idx_strategy, idx_stint] = stint[0]
+            strategy_table["compounds"][idx_strategy, idx_stint] = stint[1]
+            strategy_table["tire_ages"][idx_strategy, idx_stint] = stint[2]
+            strategy_table["refuels"][idx_strategy, idx_stint] = stint[3]
+
+    return strategy_table
+
+
+def create_strategy_table_full_factorial(tot_no_laps: int, comp_strat: tuple, start_age: int) -> tuple:
+    """Return the strategy table (see create_strategy_table()) containing all inlap combinations of the given compound
+    strategy that appear in a rising order (tot_no_laps is not included as race must not be finished in pit) as well as
+    the according inlap indices (strategies x pit stops, idx = inlap - 1) as used by the full factorial calculation."""
+
+    no_pitstops = len(comp_strat) - 1
+
+    idxs_inlaps = list(itertools.combinations(range(tot_no_laps - 1), no_pitstops))
+    no_combinations = len(idxs_inlaps)
+    idxs_inlaps = np.array(idxs_inlaps, dtype=np.int64).reshape(no_combinations, no_pitstops)
+
+    strategy_table = {"inlaps": np.hstack((np.zeros((no_combinations, 1), dtype=np.int64), idxs_inlaps + 1)),
+                      "compounds": np.tile(np.array(comp_strat, dtype=object), (no_combinations, 1)),
+                      "tire_ages": np.zeros((no_combinations, no_pitstops + 1)),
+                      "refuels": np.zeros((no_combinations, no_pitstops + 1))}
+    strategy_table["tire_ages"][:, 0] = start_age
+
+    return strategy_table, idxs_inlaps
+
+
+def calc_racetimes_basic_batch(t_base: float,
+                               tot_no_laps: int,
+                               t_lap_sens_mass: float,
+                               t_pitdrive_inlap: float,
+                               t_pitdrive_outlap: float,
+                               t_pit_tirechange: float,
+                               pits_aft_finishline: bool,
+                               tire_pars: dict,
+                               p_grid: int,
+                               t_loss_pergridpos: float,
+                               t_loss_firstlap: float,
+                               strategy_table: dict,
+                               drivetype: str,
+                               m_fuel_init: float,
+                               b_fuel_perlap: float,
+                               t_pit_refuel_perkg: float,
+                               t_pit_charge_perkwh: float,
+                               t_pitdrive_inlap_fcy: float = None,
+                               t_pitdrive_outlap_fcy: float = None,
+                               t_pitdrive_inlap_sc: float = None,
+                               t_pitdrive_outlap_sc: float = None,
+                               fcy_phases: list = None,
+                               t_lap_sc: float = None,
+                               t_lap_fcy: float = None,
+                               t_laps_basic: np.ndarray = None) -> tuple:
+
+    """
+    .. description::
+    Batched variant of calc_racetimes_basic() that evaluates many strategies at once. The strategies are given as
+    strategy table (see create_strategy_table()), all other inputs are equal for all strategies. The lap times of all
+    strategies are calculated in a (strategies x laps) array, the tire degradation is gathered from one degradation
+    array per compound and start age, the fuel mass and race start terms are broadcast. The pit stops and the FCY phases
+    are handled in loops over the stints respectively the affected laps that are vectorized over the strategies. The
+    operations are performed in the same order as in calc_racetimes_basic() such that the results are identical.
+
+    .. inputs::
+    :param strategy_table:          (strategies x stints) arrays of the strategies, see create_strategy_table(), every
+                                    strategy must start with inlap 0 and its inlaps must appear in a rising order
+    :type strategy_table:           dict
+    :param t_laps_basic:            [s] lap times of the strategies without pit stops and FCY phases as returned by
+                                    calc_laptimes_basic_batch() (optional) -> allows to reuse them for several FCY
+                                    scenarios
+    :type t_laps_basic:             np.ndarray
+
+    All other inputs are equal to calc_racetimes_basic().
+
+    .. outputs::
+    :return t_race_laps:            [s] cumulated lap times (i.e. race times) after every lap, (strategies x laps)
+    :rtype t_race_laps:             np.ndarray
+    :return fcy_phases_conv:        list of the converted FCY phases for every strategy (see calc_racetimes_basic()),
+                                    None if input fcy_phases was None.
+    :rtype fcy_phases_conv:         list
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # PREPARATIONS -----------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    inlaps = strategy_table["inlaps"]
+    refuels = strategy_table["refuels"]
+
+    no_strategies, max_no_stints = inlaps.shape
+    bool_stints = inlaps >= 0
+
+    # check strategy input
+    __check_strategy_table(strategy_table=strategy_table)
+
+    # check drivetype and consumption
+    if drivetype == 'combustion':
+        if m_fuel_init is None or b_fuel_perlap is None:
+            raise RuntimeError('Parameters m_fuel_init and b_fuel_perlap are required for a combustion car!')
+    elif drivetype == 'electric':
+        # electric consumption not required since the car does not lose any mass
+        pass
+    else:
+        raise RuntimeError('Unknown drivetype!')
+
+    # check possible refueling/recharging during pitstops
+    if np.any(bool_stints & (refuels != 0.0)):
+        if drivetype == 'combustion' and t_pit_refuel_perkg is None:
+            raise RuntimeError('Refueling is set but t_pit_refuel_perkg is not set!')
+        elif drivetype == 'electric' and t_pit_charge_perkwh is not None:
+            raise RuntimeError('Recharging is set but t_pit_charge_perkwh is not set!')
+
+    # check FCY phases
+    if fcy_phases is not None and (t_lap_fcy is None or t_lap_sc is None):
+        print("WARNING: t_lap_fcy and t_lap_sc are required if fcy_phases is not None! Using 140% and 160% of the"
+              " base lap time instead!")
+        t_lap_fcy = t_base * 1.4
+        t_lap_sc = t_base * 1.6
+
+    if fcy_phases is not None and any(False if x[2] in ['SC', 'VSC'] else True for x in fcy_phases):
+        raise RuntimeError("Unknown FCY phase type!")
+
+    if fcy_phases is not None and not all([x[0] < y[0] for x, y in zip(fcy_phases, fcy_phases[1:])]):
+        raise RuntimeError('The given FCY phases are not sorted in a rising order!')
+
+    if fcy_phases is not None \
+            and (t_pitdrive_inlap_fcy is None or t_pitdrive_outlap_fcy is None
+                 or t_pitdrive_inlap_sc is None or t_pitdrive_outlap_sc is None):
+        raise RuntimeError("t_pitdrive_inlap_fcy/sc and t_pitdrive_outlap_fcy/sc must all be supplied if there are FCY"
+                           " phases to consider!")
+
+    # assure FCY phases end within the race
+    if fcy_phases is not None:
+        for idx_phase in range(len(fcy_phases)):
+            if fcy_phases[idx_phase][1] > float(tot_no_laps):
+                print("WARNING: Inserted FCY phase ends after the last lap of the race, reducing it to end with the"
+                      " final lap!")
+                fcy_phases[idx_phase][1] = float(tot_no_laps)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CONSIDER BASE LAP TIME, FUEL MASS LOSS, RACE START AND TIRE DEGRADATION ------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # the lap times are not affected by the FCY phases so far, i.e. they can be reused for several FCY scenarios
+    if t_laps_basic is None:
+        t_laps = calc_laptimes_basic_batch(t_base=t_base,
+                                           tot_no_laps=tot_no_laps,
+                                           t_lap_sens_mass=t_lap_sens_mass,
+                                           tire_pars=tire_pars,
+                                           p_grid=p_grid,
+                                           t_loss_pergridpos=t_loss_pergridpos,
+                                           t_loss_firstlap=t_loss_firstlap,
+                                           strategy_table=strategy_table,
+                                           drivetype=drivetype,
+                                           m_fuel_init=m_fuel_init,
+                                           b_fuel_perlap=b_fuel_perlap)
+    else:
+        t_laps = np.copy(t_laps_basic)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CONSIDER PIT STOPS -----------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # see calc_racetimes_basic() for a description of t_laps_pit and t_pit_before_fcy_start_end (the latter is shared
+    # between all FCY phases there, which is reproduced here)
+    t_laps_pit = np.zeros((no_strategies, tot_no_laps))
+    t_pit_before_fcy_start_end = np.zeros((no_strategies, 2))
+
+    # estimate lap fraction of the pit entry and exit assuming the total pit length is about 6% of a normal lap length
+    if pits_aft_finishline:
+        lap_fraction_pit_inlap = 0.01
+        lap_fraction_pit_outlap = 0.05
+    else:
+        lap_fraction_pit_inlap = 0.05
+        lap_fraction_pit_outlap = 0.01
+
+    idxs_strategies = np.arange(no_strategies)
+
+    for idx_stint in range(1, max_no_stints):
+        idxs_strat_cur = idxs_strategies[bool_stints[:, idx_stint]]
+        cur_inlaps = inlaps[idxs_strat_cur, idx_stint]
+
+        # standstill time (tire change or refueling / recharging if it lasts longer)
+        timelosses_standstill = np.full(idxs_strat_cur.size, t_pit_tirechange)
+        cur_refuels = refuels[idxs_strat_cur, idx_stint]
+
+        if drivetype == 'combustion' and t_pit_refuel_perkg is not None:
+            t_refuel = cur_refuels * t_pit_refuel_perkg
+            timelosses_standstill = np.where((cur_refuels != 0.0) & (t_refuel > timelosses_standstill),
+                                             t_refuel, timelosses_standstill)
+        elif drivetype == 'electric' and t_pit_charge_perkwh is not None:
+            t_charge = cur_refuels * t_pit_charge_perkwh
+            timelosses_standstill = np.where((cur_refuels != 0.0) & (t_charge > timelosses_standstill),
+                                             t_charge, timelosses_standstill)
+
+        # pit losses (inlap) -------------------------------------------------------------------------------------------
+        t_pit_inlap = np.zeros(idxs_strat_cur.size)
+
+        if not pits_aft_finishline:
+            t_pit_inlap += timelosses_standstill
+
+        t_pit_inlap += __get_pitdrive_timelosses(inlaps=cur_inlaps,
+                                                 fcy_phases=fcy_phases,
+                                                 lap_frac_start=-lap_fraction_pit_inlap,
+                                                 lap_frac_end=0.0,
+                                                 t_pitdrive=t_pitdrive_inlap,
+                                                 t_pitdrive_fcy=t_pitdrive_inlap_fcy,
+                                                 t_pitdrive_sc=t_pitdrive_inlap_sc)
+
+        t_laps_pit[idxs_strat_cur, cur_inlaps - 1] += t_pit_inlap
+
+        # pit losses (outlap) ------------------------------------------------------------------------------------------
+        # skip strategies with an inlap in the last lap of the race since the outlap is not driven anymore
+        bool_outlap = cur_inlaps < tot_no_laps
+        idxs_strat_cur = idxs_strat_cur[bool_outlap]
+        cur_inlaps = cur_inlaps[bool_outlap]
+        t_pit_inlap = t_pit_inlap[bool_outlap]
+
+        t_pit_outlap = np.zeros(idxs_strat_cur.size)
+
+        if pits_aft_finishline:
+            t_pit_outlap += timelosses_standstill[bool_outlap]
+
+        t_pit_outlap += __get_pitdrive_timelosses(inlaps=cur_inlaps,
+                                                  fcy_phases=fcy_phases,
+                                                  lap_frac_start=0.0,
+                                                  lap_frac_end=lap_fraction_pit_outlap,
+                                                  t_pitdrive=t_pitdrive_outlap,
+                                                  t_pitdrive_fcy=t_pitdrive_outlap_fcy,
+                                                  t_pitdrive_sc=t_pitdrive_outlap_sc)
+
+        t_laps_pit[idxs_strat_cur, cur_inlaps] += t_pit_outlap
+
+        # fill t_pit_before_fcy_start_end
+        if fcy_phases is not None:
+            for cur_phase in fcy_phases:
+                bool_start = (cur_inlaps + lap_fraction_pit_outlap < cur_phase[0]) & (cur_phase[0] < cur_inlaps + 1.0)
+                t_pit_before_fcy_start_end[idxs_strat_cur[bool_start], 0] += t_pit_outlap[bool_start]
+
+                bool_end_inlap = np.abs(cur_phase[1] - cur_inlaps) \
+                    <= 1e-09 * np.maximum(abs(cur_phase[1]), np.abs(cur_inlaps))  # equal to math.isclose()
+                bool_end_outlap = ~bool_end_inlap \
+                    & (cur_inlaps + lap_fraction_pit_outlap < cur_phase[1]) & (cur_phase[1] <= cur_inlaps + 1.0)
+                t_pit_before_fcy_start_end[idxs_strat_cur[bool_end_inlap], 1] += t_pit_inlap[bool_end_inlap]
+                t_pit_before_fcy_start_end[idxs_strat_cur[bool_end_outlap], 1] += t_pit_outlap[bool_end_outlap]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CONSIDER FCY PHASES ----------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    if fcy_phases is not None:
+        # converted FCY phases as arrays (start race time, end race time, SC delay, SC duration) for every strategy
+        fcy_phases_conv_arr = np.full((no_strategies, len(fcy_phases), 4), np.nan)
+
+        # race times at the start of every lap for every strategy (see calc_racetimes_basic())
+        t_race_lapstart = np.zeros((no_strategies, tot_no_laps + 1))
+
+        for idx_phase, cur_phase in enumerate(fcy_phases):
+            start_idx = math.floor(cur_phase[0])
+            stop_idx = math.ceil(cur_phase[1])
+            idxs_lap = np.arange(start_idx, stop_idx)
+            bool_race_end = math.isclose(cur_phase[1], tot_no_laps)
+
+            if idxs_lap.size == 0:
+                continue
+
+            t_race_lapstart[:, 1:] = np.cumsum(t_laps + t_laps_pit, axis=1)
+
+            # slow lap times and lap fractions driven with normal speed of the affected laps (equal for all strategies)
+            t_lap_slow = np.full(idxs_lap.size, t_lap_sc if cur_phase[2] == 'SC' else t_lap_fcy)
+            t_lap_slow[0] = t_lap_fcy
+
+            lap_frac_normal = np.zeros(idxs_lap.size)
+            lap_frac_normal_bef = cur_phase[0] - start_idx
+
+            if start_idx + 1.0 >= cur_phase[1]:
+                lap_frac_normal_aft = start_idx + 1.0 - cur_phase[1]
+            else:
+                lap_frac_normal_aft = 0.0
+
+            lap_frac_normal[0] = lap_frac_normal_bef + lap_frac_normal_aft
+
+            if idxs_lap.size > 1 and cur_phase[2] != 'SC':
+                lap_frac_normal[-1] = idxs_lap[-1] + 1.0 - cur_phase[1]
+
+            lap_frac_slow = 1.0 - lap_frac_normal
+
+            fcy_phases_conv_arr[:, idx_phase, 0] = (t_race_lapstart[:, start_idx]
+                                                    + lap_frac_normal_bef * t_laps[:, start_idx]
+                                                    + t_pit_before_fcy_start_end[:, 0])
+
+            # set lap times (t_laps_pit not affected)
+            t_laps_tmp = lap_frac_normal * t_laps[:, idxs_lap] + lap_frac_slow * t_lap_slow
+            bool_slower = t_laps[:, idxs_lap] < t_laps_tmp
+            t_laps[:, idxs_lap] = np.where(bool_slower, t_laps_tmp, t_laps[:, idxs_lap])
+
+            for _ in range(np.count_nonzero(~np.all(bool_slower, axis=0))):
+                print("WARNING: The calculated lap time affected by the FCY phase is faster than the normal lap"
+                      " time. This should be checked!")
+
+            t_race_lapstart[:, 1:] = np.cumsum(t_laps + t_laps_pit, axis=1)
+
+            if bool_race_end:
+                fcy_phases_conv_arr[:, idx_phase, 1] = math.inf
+            elif idxs_lap.size == 1:
+                fcy_phases_conv_arr[:, idx_phase, 1] = \
+                    fcy_phases_conv_arr[:, idx_phase, 0] + lap_frac_slow[0] * t_lap_slow[0]
+            else:
+                fcy_phases_conv_arr[:, idx_phase, 1] = (t_race_lapstart[:, stop_idx - 1]
+                                                        + lap_frac_slow[-1] * t_lap_slow[-1]
+                                                        + t_pit_before_fcy_start_end[:, 1])
+
+            # calculate SC delay and duration of SC phase
+            if cur_phase[2] == 'SC':
+                t_race_sc_start = t_race_lapstart[:, start_idx + 1]
+                fcy_phases_conv_arr[:, idx_phase, 2] = t_race_sc_start - fcy_phases_conv_arr[:, idx_phase, 0]
+
+                # assure that SC delay in first lap is at least 33% of the SC lap time
+                bool_delay = fcy_phases_conv_arr[:, idx_phase, 2] < 0.33 * t_lap_sc
+                t_sc_delay_diff = 0.33 * t_lap_sc - fcy_phases_conv_arr[bool_delay, idx_phase, 2]
+
+                fcy_phases_conv_arr[bool_delay, idx_phase, 2] += t_sc_delay_diff
+                fcy_phases_conv_arr[bool_delay, idx_phase, 1] += t_sc_delay_diff
+                if start_idx + 1 < tot_no_laps:
+                    t_laps[bool_delay, start_idx + 1] += t_sc_delay_diff
+
+                fcy_phases_conv_arr[:, idx_phase, 3] = math.inf if bool_race_end else stop_idx - start_idx - 1
+
+        # set together lists of converted FCY phases in the format of calc_racetimes_basic()
+        fcy_phases_conv = []
+
+        for idx_strategy in range(no_strategies):
+            fcy_phases_conv.append([])
+
+            for idx_phase, cur_phase in enumerate(fcy_phases):
+                conv_tmp = fcy_phases_conv_arr[idx_strategy, idx_phase]
+
+                if cur_phase[2] == 'SC':
+                    fcy_phases_conv[-1].append([conv_tmp[0], conv_tmp[1], cur_phase[2], conv_tmp[2],
+                                                conv_tmp[3] if np.isinf(conv_tmp[3]) else int(conv_tmp[3])])
+                else:
+                    fcy_phases_conv[-1].append([conv_tmp[0], conv_tmp[1], cur_phase[2], None, None])
+
+    else:
+        fcy_phases_conv = None
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CALCULATE LAPWISE RACE TIMES -------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    t_race_lapwise = np.cumsum(t_laps + t_laps_pit, axis=1)
+
+    return t_race_lapwise, fcy_phases_conv
+
+
+def calc_laptimes_basic_batch(t_base: float,
+                              tot_no_laps: int,
+                              t_lap_sens_mass: float,
+                              tire_pars: dict,
+                              p_grid: int,
+                              t_loss_pergridpos: float,
+                              t_loss_firstlap: float,
+                              strategy_table: dict,
+                              drivetype: str,
+                              m_fuel_init: float,
+                              b_fuel_perlap: float) -> np.ndarray:
+    """Return the lap times of all strategies in the strategy table (strategies x laps) considering the base lap time,
+    the fuel mass, the race start and the tire degradation but neither pit stops nor FCY phases, see
+    calc_racetimes_basic_batch()."""
+
+    __check_strategy_table(strategy_table=strategy_table)
+
+    inlaps = strategy_table["inlaps"]
+    compounds = strategy_table["compounds"]
+    tire_ages = strategy_table["tire_ages"]
+
+    no_strategies, max_no_stints = inlaps.shape
+    bool_stints = inlaps >= 0
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CONSIDER BASE LAP TIME, FUEL MASS LOSS AND RACE START ------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    t_laps_single = np.ones(tot_no_laps) * t_base
+
+    if drivetype == 'combustion':
+        t_laps_single += (m_fuel_init - b_fuel_perlap * np.arange(0, tot_no_laps)) * t_lap_sens_mass
+
+    t_laps_single[0] += t_loss_firstlap + (p_grid - 1) * t_loss_pergridpos
+
+    t_laps = np.tile(t_laps_single, (no_strategies, 1))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CONSIDER TIRE DEGRADATION ----------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    idxs_strategies = np.arange(no_strategies)
+    laps = np.arange(tot_no_laps)
+
+    # end of every stint (= inlap of the next stint or end of the race)
+    inlaps_next = np.full((no_strategies, max_no_stints), tot_no_laps, dtype=np.int64)
+    inlaps_next[:, :-1] = np.where(bool_stints[:, 1:], inlaps[:, 1:], tot_no_laps)
+
+    for idx_stint in range(max_no_stints):
+        idxs_strat_cur = idxs_strategies[bool_stints[:, idx_stint]]
+        cur_inlaps = inlaps[idxs_strat_cur, idx_stint]
+        lens_cur_stint = inlaps_next[idxs_strat_cur, idx_stint] - cur_inlaps
+
+        # gather tire losses from one degradation array per compound and start age (degradation considered on basis of
+        # the tire age at the start of a lap, a single lap stint is calculated separately as in calc_tire_degradation)
+        offsets = laps[None, :] - cur_inlaps[:, None]
+        bool_in_stint = (offsets >= 0) & (offsets < lens_cur_stint[:, None])
+        t_degr = np.zeros((idxs_strat_cur.size, tot_no_laps))
+
+        for compound in set(compounds[idxs_strat_cur, idx_stint]):
+            bool_comp = compounds[idxs_strat_cur, idx_stint] == compound
+
+            for age in np.unique(tire_ages[idxs_strat_cur[bool_comp], idx_stint]):
+                bool_group = bool_comp & (tire_ages[idxs_strat_cur, idx_stint] == age)
+                age_cur = int(age) if float(age).is_integer() else float(age)
+
+                t_degr_comp = helper_funcs.src.calc_tire_degradation.\
+                    calc_tire_degradation(tire_age_start=age_cur,
+                                          stint_length=tot_no_laps,
+                                          compound=compound,
+                                          tire_pars=tire_pars)
+                t_degr[bool_group] = np.atleast_1d(t_degr_comp)[np.clip(offsets[bool_group], 0, tot_no_laps - 1)]
+
+                bool_single = bool_group & (lens_cur_stint == 1)
+
+                if np.any(bool_single):
+                    t_degr[bool_single] = helper_funcs.src.calc_tire_degradation.\
+                        calc_tire_degradation(tire_age_start=age_cur,
+                                              stint_length=1,
+                                              compound=compound,
+                                              tire_pars=tire_pars)
+
+        t_laps[idxs_strat_cur] += np.where(bool_in_stint, t_degr, 0.0)
+
+        # consider cold tires in the first lap of a stint (if inlap is not the last lap of the race)
+        bool_cold = cur_inlaps < tot_no_laps
+        t_laps[idxs_strat_cur[bool_cold], cur_inlaps[bool_cold]] += tire_pars["t_add_coldtires"]
+
+    return t_laps
+
+
 def __perform_pitstop_standstill(t_pit_tirechange: float, drivetype: str, cur_stop: list, t_pit_refuel_perkg: float,
                                  t_pit_charge_perkwh: float) -> float:
     """This method is used to calculate the correct standstill time while giving the possibility to refuel/recharge."""
@@ -538,3 +994,46 @@ def __perform_pitstop_standstill(t_pit_tirechange: float, drivetype: str, cur_st
         timeloss_standstill = cur_stop[3] * t_pit_charge_perkwh
 
     return timeloss_standstill
+
+
+def __get_pitdrive_timelosses(inlaps: np.ndarray, fcy_phases: list or None, lap_frac_start: float, lap_frac_end: float,
+                              t_pitdrive: float, t_pitdrive_fcy: float, t_pitdrive_sc: float) -> np.ndarray:
+    """This method returns the pit driving time losses for an array of inlaps considering the first FCY phase that is
+    active from inlap + lap_frac_start to inlap + lap_frac_end (if there is any)."""
+
+    timelosses_pitdrive = np.full(inlaps.size, t_pitdrive)
+
+    if fcy_phases is None:
+        return timelosses_pitdrive
+
+    bool_no_phase = np.full(inlaps.size, True)
+
+    for cur_phase in fcy_phases:
+        bool_phase = bool_no_phase & (cur_phase[0] <= inlaps + lap_frac_start) & (inlaps + lap_frac_end <= cur_phase[1])
+
+        if cur_phase[2] == 'SC':
+            # SC started already before the inlap -> driver ran up to the SC already, otherwise the time loss is equal
+            # to driving through the pit during a FCY phase
+            timelosses_pitdrive[bool_phase] = np.where(cur_phase[0] < inlaps[bool_phase] - 1.0,
+                                                       t_pitdrive_sc, t_pitdrive_fcy)
+        else:
+            timelosses_pitdrive[bool_phase] = t_pitdrive_fcy
+
+        bool_no_phase &= ~bool_phase
+
+    return timelosses_pitdrive
+
+
+def __check_strategy_table(strategy_table: dict) -> None:
+    """This method checks that every strategy in the strategy table starts with inlap 0 and that the inlaps appear in a
+    rising order."""
+
+    inlaps = strategy_table["inlaps"]
+    bool_stints = inlaps >= 0
+
+    if inlaps.shape[1] == 0 or not np.all(bool_stints[:, 0]) or np.any(inlaps[:, 0] != 0):
+        raise RuntimeError('Start compound information must be provided!')
+
+    if np.any(bool_stints[:, 1:] & ~bool_stints[:, :-1]) \
+            or np.any(bool_stints[:, 1:] & (inlaps[:, 1:] <= inlaps[:, :-1])):
+        raise RuntimeError('The given inlaps are not sorted in a rising order!')
@@ -0,0 +1,162 @@
+import numpy as np
+import math
+import copy
+import racesim_basic.src.calc_racetimes_basic
+
+
+def calc_racetimes_fcy_scenarios(t_base: float,
+                                 tot_no_laps: int,
+                                 t_lap_sens_mass: float,
+                                 t_pitdrive_inlap: float,
+                                 t_pitdrive_outlap: float,
+                                 t_pitdrive_inlap_fcy: float,
+                                 t_pitdrive_outlap_fcy: float,
+                                 t_pitdrive_inlap_sc: float,
+                                 t_pitdrive_outlap_sc: float,
+                                 t_pit_tirechange: float,
+                                 pits_aft_finishline: bool,
+                                 tire_pars: dict,
+                                 p_grid: int,
+                                 t_loss_pergridpos: float,
+                                 t_loss_firstlap: float,
+                                 comp_strat: tuple,
+                                 start_age: int,
+                                 drivetype: str,
+                                 m_fuel_init: float,
+                                 b_fuel_perlap: float,
+                                 fcy_scenarios: list,
+                                 t_lap_sc: float,
+                                 t_lap_fcy: float,
+                                 risk_alpha: float = None) -> np.ndarray:
+
+    """
+    .. description::
+    This function evaluates all inlap combinations of a compound strategy (full factorial) against a bank of FCY
+    scenarios (see create_fcy_scenarios()) and returns the expected race time or, if risk_alpha is set, the conditional
+    value at risk (mean race time of the (1 - risk_alpha) share of the slowest scenarios) of every inlap combination.
+    The lap times without pit stops and FCY phases are independent of the scenario and are therefore calculated only
+    once, the pit stops and FCY phases are then considered for all inlap combinations at once per scenario (see
+    calc_racetimes_basic_batch()). Identical scenarios (mostly the ones without any FCY phase) are evaluated only once.
+    Refueling is not considered.
+
+    .. inputs::
+    :param fcy_scenarios:           list containing the FCY phases of every scenario in the form [[start race progress,
+                                    stop race progress, phase type], ...]
+    :type fcy_scenarios:            list
+    :param risk_alpha:              None for the expected race time, otherwise confidence level in range [0.0, 1.0) of
+                                    the conditional value at risk
+    :type risk_alpha:               float
+
+    All other inputs are equal to calc_racetimes_basic() respectively calc_racetimes_full_factorial().
+
+    .. outputs::
+    :return t_race:                 [s] expected race times (or conditional values at risk) in an n-D array (n = number
+                                    of pit stops, first dimension = first stop etc.), index = inlap - 1, inlap
+                                    combinations not appearing in a rising order are set np.nan
+    :rtype t_race:                  np.ndarray
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # PREPARATIONS -----------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    if not fcy_scenarios:
+        raise RuntimeError("At least one FCY scenario is required!")
+
+    if risk_alpha is not None and not 0.0 <= risk_alpha < 1.0:
+        raise RuntimeError("risk_alpha must be in the range [0.0, 1.0)!")
+
+    # set FCY lap times once here such that the warning does not appear for every scenario
+    if t_lap_fcy is None or t_lap_sc is None:
+        print("WARNING: t_lap_fcy and t_lap_sc are required for FCY scenarios! Using 140% and 160% of the base lap time"
+              " instead!")
+        t_lap_fcy = t_base * 1.4
+        t_lap_sc = t_base * 1.6
+
+    strategy_table, idxs_inlaps = racesim_basic.src.calc_racetimes_basic.\
+        create_strategy_table_full_factorial(tot_no_laps=tot_no_laps,
+                                             comp_strat=comp_strat,
+                                             start_age=start_age)
+
+    # determine unique scenarios and the index of the according unique scenario for every scenario
+    fcy_scenarios_unique = []
+    idxs_scenario_unique = []
+
+    for cur_scenario in fcy_scenarios:
+        cur_scenario = [list(x[:3]) for x in cur_scenario]
+
+        if cur_scenario not in fcy_scenarios_unique:
+            fcy_scenarios_unique.append(cur_scenario)
+
+        idxs_scenario_unique.append(fcy_scenarios_unique.index(cur_scenario))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # EVALUATE ALL INLAP COMBINATIONS FOR ALL SCENARIOS ----------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # lap times without pit stops and FCY phases are equal for all scenarios
+    t_laps_basic = racesim_basic.src.calc_racetimes_basic.\
+        calc_laptimes_basic_batch(t_base=t_base,
+                                  tot_no_laps=tot_no_laps,
+                                  t_lap_sens_mass=t_lap_sens_mass,
+                                  tire_pars=tire_pars,
+                                  p_grid=p_grid,
+                                  t_loss_pergridpos=t_loss_pergridpos,
+                                  t_loss_firstlap=t_loss_firstlap,
+                                  strategy_table=strategy_table,
+                                  drivetype=drivetype,
+                                  m_fuel_init=m_fuel_init,
+                                  b_fuel_perlap=b_fuel_perlap)
+
+    t_race_unique = np.zeros((idxs_inlaps.shape[0], len(fcy_scenarios_unique)))
+
+    for idx_scenario, cur_scenario in enumerate(fcy_scenarios_unique):
+        t_race_unique[:, idx_scenario] = racesim_basic.src.calc_racetimes_basic.\
+            calc_racetimes_basic_batch(t_base=t_base,
+                                       tot_no_laps=tot_no_laps,
+                                       t_lap_sens_mass=t_lap_sens_mass,
+                                       t_pitdrive_inlap=t_pitdrive_inlap,
+                                       t_pitdrive_outlap=t_pitdrive_outlap,
+                                       t_pitdrive_inlap_fcy=t_pitdrive_inlap_fcy,
+                                       t_pitdrive_outlap_fcy=t_pitdrive_outlap_fcy,
+                                       t_pitdrive_inlap_sc=t_pitdrive_inlap_sc,
+                                       t_pitdrive_outlap_sc=t_pitdrive_outlap_sc,
+                                       t_pit_tirechange=t_pit_tirechange,
+                                       pits_aft_finishline=pits_aft_finishline,
+                                       tire_pars=tire_pars,
+                                       p_grid=p_grid,
+                                       t_loss_pergridpos=t_loss_pergridpos,
+                                       t_loss_firstlap=t_loss_firstlap,
+                                       strategy_table=strategy_table,
+                                       drivetype=drivetype,
+                                       m_fuel_init=m_fuel_init,
+                                       b_fuel_perlap=b_fuel_perlap,
+                                       t_pit_refuel_perkg=None,
+                                       t_pit_charge_perkwh=None,
+                                       fcy_phases=copy.deepcopy(cur_scenario) if cur_scenario else None,
+                                       t_lap_sc=t_lap_sc,
+                                       t_lap_fcy=t_lap_fcy,
+                                       t_laps_basic=t_laps_basic)[0][:, -1]
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CALCULATE RISK MEASURE -------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    t_race_scenarios = t_race_unique[:, idxs_scenario_unique]
+
+    if risk_alpha is None:
+        t_race_measure = np.mean(t_race_scenarios, axis=1)
+    else:
+        no_scenarios_tail = max(math.ceil((1.0 - risk_alpha) * len(fcy_scenarios)), 1)
+        t_race_measure = np.mean(np.sort(t_race_scenarios, axis=1)[:, -no_scenarios_tail:], axis=1)
+
+    # inlap combinations not appearing in a rising order are set np.nan
+    t_race = np.full((tot_no_laps - 1,) * (len(comp_strat) - 1), np.nan)
+    np.put(t_race, np.ravel_multi_index(tuple(idxs_inlaps.T), t_race.shape), t_race_measure)
+
+    return t_race
+
+
+# testing --------------------------------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    pass
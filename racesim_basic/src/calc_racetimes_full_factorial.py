@@ -0,0 +1,155 @@
+import numpy as np
+import helper_funcs.src.calc_tire_degradation
+
+
+def calc_racetimes_full_factorial(t_base: float,
+                                  tot_no_laps: int,
+                                  t_lap_sens_mass: float,
+                                  t_pitdrive_inlap: float,
+                                  t_pitdrive_outlap: float,
+                                  t_pit_tirechange: float,
+                                  tire_pars: dict,
+                                  p_grid: int,
+                                  t_loss_pergridpos: float,
+                                  t_loss_firstlap: float,
+                                  comp_strat: tuple,
+                                  start_age: int,
+                                  drivetype: str,
+                                  m_fuel_init: float,
+                                  b_fuel_perlap: float) -> np.ndarray:
+
+    """
+    .. description::
+    This function calculates the final race times of all inlap combinations of a compound strategy at once (full
+    factorial) under the same assumptions as calc_racetimes_basic() without FCY phases and without refueling. The race
+    time is split into a part that is independent of the inlaps (base lap times, fuel mass, race start, cold tires and
+    pit stops) and the tire degradation time losses of the stints. The latter are taken from cumulative stint cost
+    tables, i.e. the tire degradation time loss of a stint is a single array lookup for its compound, start age and
+    stint length. The result is equal to calc_racetimes_basic() except for floating point rounding.
+
+    .. inputs::
+    :param t_base:                  [s] base lap time (= t_q + t_gap,racepace + t_car + t_driver)
+    :type t_base:                   float
+    :param tot_no_laps:             number of laps in current race
+    :type tot_no_laps:              int
+    :param t_lap_sens_mass:         [s/kg] lap time sensitivity against fuel mass
+    :type t_lap_sens_mass:          float
+    :param t_pitdrive_inlap:        [s] lap time loss in current lap when entering the pit
+    :type t_pitdrive_inlap:         float
+    :param t_pitdrive_outlap:       [s] lap time loss driving through the pit during the outlap
+    :type t_pitdrive_outlap:        float
+    :param t_pit_tirechange:        [s] standstill time to change tires during pit stop
+    :type t_pit_tirechange:         float
+    :param tire_pars:               tire model parameters for every compound -> see param file
+    :type tire_pars:                dict
+    :param p_grid:                  [-] grid position at race start
+    :type p_grid:                   int
+    :param t_loss_pergridpos:       [s/pos] lap time loss between two grid positions
+    :type t_loss_pergridpos:        float
+    :param t_loss_firstlap:         [s] lap time loss due to start from standstill
+    :type t_loss_firstlap:          float
+    :param comp_strat:              compound strategy (compound of every stint), e.g. ('A3', 'A4')
+    :type comp_strat:               tuple
+    :param start_age:               [-] tire age of the start tire set (the tires of the other stints are new)
+    :type start_age:                int
+    :param drivetype:               either combustion or electric
+    :type drivetype:                str
+    :param m_fuel_init:             [kg] initial fuel mass -> None for electric
+    :type m_fuel_init:              float
+    :param b_fuel_perlap:           [kg/lap] fuel consumption per lap -> None for electric
+    :type b_fuel_perlap:            float
+
+    .. outputs::
+    :return t_race:                 [s] final race times in an n-D array (n = number of pit stops, first dimension =
+                                    first stop etc.), index = inlap - 1, inlap combinations not appearing in a rising
+                                    order are set np.nan
+    :rtype t_race:                  np.ndarray
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # PREPARATIONS -----------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # check drivetype and consumption
+    if drivetype == 'combustion':
+        if m_fuel_init is None or b_fuel_perlap is None:
+            raise RuntimeError('Parameters m_fuel_init and b_fuel_perlap are required for a combustion car!')
+    elif drivetype != 'electric':
+        raise RuntimeError('Unknown drivetype!')
+
+    no_pitstops = len(comp_strat) - 1
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # CALCULATE TIME LOSSES INDEPENDENT OF THE INLAPS ------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # base lap time, fuel mass time loss (considered with fuel mass at start of respective lap) and race start losses
+    t_laps = np.ones(tot_no_laps) * t_base
+
+    if drivetype == 'combustion':
+        t_laps += (m_fuel_init - b_fuel_perlap * np.arange(0, tot_no_laps)) * t_lap_sens_mass
+
+    t_laps[0] += t_loss_firstlap + (p_grid - 1) * t_loss_pergridpos
+
+    # cold tires in the first lap of every stint and pit stop losses (the race must not be finished in the pit, i.e. the
+    # outlap is always driven)
+    t_race_const = (np.sum(t_laps)
+                    + (no_pitstops + 1) * tire_pars["t_add_coldtires"]
+                    + no_pitstops * (t_pit_tirechange + t_pitdrive_inlap + t_pitdrive_outlap))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # EVALUATE ALL INLAP COMBINATIONS ----------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # create open grids of the inlaps (index = inlap - 1, tot_no_laps is not included as race must not be finished in
+    # pit) and determine the stint lengths
+    inlaps = [0] + list(np.ix_(*[np.arange(1, tot_no_laps)] * no_pitstops)) + [tot_no_laps]
+
+    t_race = np.full((tot_no_laps - 1,) * no_pitstops, t_race_const)
+    bool_valid = np.full(t_race.shape, True)
+
+    for idx_stint, compound in enumerate(comp_strat):
+        len_stint = inlaps[idx_stint + 1] - inlaps[idx_stint]
+
+        # inlaps must appear in a rising order
+        bool_valid &= len_stint > 0
+
+        # add tire losses of the stint
+        t_stint_degr = calc_stint_cost_table(tire_age_start=start_age if idx_stint == 0 else 0,
+                                             max_stint_length=tot_no_laps,
+                                             compound=compound,
+                                             tire_pars=tire_pars)
+
+        t_race += t_stint_degr[np.clip(len_stint, 0, None)]
+
+    t_race[~bool_valid] = np.nan
+
+    return t_race
+
+
+def calc_stint_cost_table(tire_age_start: int,
+                          max_stint_length: int,
+                          compound: str,
+                          tire_pars: dict) -> np.ndarray:
+    """Return the cumulative tire degradation time losses of a stint with the given compound and start age for every
+    stint length from 0 to max_stint_length (index = stint length). The degradation is calculated the same way as in
+    calc_racetimes_basic(), i.e. a stint of length 1 is calculated using the single lap equations."""
+
+    t_stint_degr = np.zeros(max_stint_length + 1)
+    t_stint_degr[1:] = np.cumsum(helper_funcs.src.calc_tire_degradation.
+                                 calc_tire_degradation(tire_age_start=tire_age_start,
+                                                       stint_length=max_stint_length,
+                                                       compound=compound,
+                                                       tire_pars=tire_pars))
+    t_stint_degr[1] = helper_funcs.src.calc_tire_degradation.\
+        calc_tire_degradation(tire_age_start=tire_age_start,
+                              stint_length=1,
+                              compound=compound,
+                              tire_pars=tire_pars)
+
+    return t_stint_degr
+
+
+# testing --------------------------------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    pass
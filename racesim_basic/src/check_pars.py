@@ -1,10 +1,19 @@
 def check_pars(sim_opts: dict, pars_in: dict, use_plot: bool) -> None:
+    # options added later are optional such that option dicts without them (e.g. in the notebooks) can still be used
+    use_dp = sim_opts.get("use_dp", False)
+    no_fcy_scenarios = sim_opts.get("no_fcy_scenarios", 0)
+    fcy_risk_alpha = sim_opts.get("fcy_risk_alpha", None)
+
     # check user input
     if pars_in['driver_pars']['tire_pars']['tire_deg_model'] != 'lin' and sim_opts["use_qp"]:
         raise RuntimeError('QP is only available for a linear tire degradation model!')
 
-    if use_plot and sim_opts["use_qp"]:
-        print('INFO: Plotting will be reduced since the derived data from the QP is much less than for full factorial!')
+    if sim_opts["use_qp"] and use_dp:
+        raise RuntimeError('QP and DP cannot be activated at the same time!')
+
+    if use_plot and (sim_opts["use_qp"] or use_dp):
+        print('INFO: Plotting will be reduced since the derived data from the QP/DP is much less than for full'
+              ' factorial!')
 
     if not 0 <= sim_opts["min_no_pitstops"] < sim_opts["max_no_pitstops"]:
         raise RuntimeError('Minimum number of pit stops must be less than maximum number of pit stops and greater than'
@@ -16,3 +25,20 @@ def check_pars(sim_opts: dict, pars_in: dict, use_plot: bool) -> None:
     if sim_opts["use_qp"] and sim_opts["fcy_phases"]:
         print("WARNING: FCY phases cannot be considered when using the quadratic optimization, they will therefore be"
               " neglected!")
+
+    if use_dp and sim_opts["fcy_phases"]:
+        print("WARNING: FCY phases cannot be considered when using the dynamic programming optimization, they will"
+              " therefore be neglected!")
+
+    if no_fcy_scenarios > 0 and (sim_opts["use_qp"] or use_dp):
+        raise RuntimeError('Random FCY scenarios can only be considered in full factorial calculations!')
+
+    if no_fcy_scenarios > 0 and "fcy_scenario_pars" not in pars_in:
+        raise RuntimeError('Parameters for the random FCY scenarios are missing!')
+
+    if no_fcy_scenarios > 0 and sim_opts["fcy_phases"]:
+        print("WARNING: FCY phases cannot be considered when using random FCY scenarios, they will therefore be"
+              " neglected!")
+
+    if fcy_risk_alpha is not None and not 0.0 <= fcy_risk_alpha < 1.0:
+        raise RuntimeError('fcy_risk_alpha must be in the range [0.0, 1.0)!')
@@ -0,0 +1,166 @@
+import numpy as np
+import random
+import math
+
+
+def create_fcy_scenarios(tot_no_laps: int,
+                         fcy_scenario_pars: dict,
+                         no_scenarios: int) -> list:
+    """
+    .. description::
+    This function creates a bank of random FCY scenarios for the basic race simulation. Every scenario is created using
+    the same logic as MonteCarlo.create_random_events() of the race simulation at the start of the race (i.e. all
+    drivers are still driving): SC phases are determined on the basis of the SC probabilities, one driver per SC phase
+    has an accident, the other drivers can have a failure that induces a VSC phase. Only the FCY phases are returned
+    since the basic race simulation does not consider the retirements. The random module is used like in the race
+    simulation, i.e. the scenarios can be reproduced by setting a seed using random.seed().
+
+    .. inputs::
+    :param tot_no_laps:         number of laps in current race
+    :type tot_no_laps:          int
+    :param fcy_scenario_pars:   {"monte_carlo_pars": dict, "p_accidents": list, "p_failures": list} -> Monte Carlo
+                                parameters (see pars_mcs.ini) as well as the accident and failure probabilities of all
+                                drivers taking part in the race (see import_fcy_scenario_pars())
+    :type fcy_scenario_pars:    dict
+    :param no_scenarios:        number of scenarios to create
+    :type no_scenarios:         int
+
+    .. outputs::
+    :return fcy_scenarios:      list containing the FCY phases of every scenario in the form [[start race progress,
+                                stop race progress, phase type], ...] (sorted by start race progress, can be empty)
+    :rtype fcy_scenarios:       list
+    """
+
+    monte_carlo_pars = fcy_scenario_pars["monte_carlo_pars"]
+    p_accidents = fcy_scenario_pars["p_accidents"]
+    p_failures = fcy_scenario_pars["p_failures"]
+
+    if len(p_accidents) != len(p_failures):
+        raise RuntimeError("Accident and failure probabilities must be given for the same number of drivers!")
+
+    # p_sc_start is a list with 6 individual probabilities: [p_firstlap, p<20%, p<40%, p<60%, p<80%, p<100%] -> it is
+    # distributed among the laps once for all scenarios
+    probs_sc_start = np.zeros(tot_no_laps)
+    no_individual_phases = len(monte_carlo_pars["p_sc_start"]) - 1  # -1 to remove start lap probability
+
+    for idx, cur_p in enumerate(monte_carlo_pars["p_sc_start"]):
+        if idx == 0:
+            # CASE 1: first lap (has its own probability)
+            probs_sc_start[0] = cur_p
+        else:
+            # CASE 2: all other laps (covered by phases in 20% steps)
+            cur_start_prog = round(1.0 / no_individual_phases * (idx - 1) * tot_no_laps)
+            cur_start_prog = max(cur_start_prog, 1)  # assure start progress is at least second lap
+            cur_end_prog = round(1.0 / no_individual_phases * idx * tot_no_laps)
+            cur_duration = cur_end_prog - cur_start_prog  # end prog not included
+            probs_sc_start[cur_start_prog:cur_end_prog] = cur_p / cur_duration  # distribute SC probability among laps
+
+    choices_sc_start = list(range(0, tot_no_laps))
+    probs_sc_start = list(probs_sc_start)
+
+    # create scenarios
+    fcy_scenarios = []
+
+    for _ in range(no_scenarios):
+        fcy_phases = []
+        bool_retired = [False] * len(p_accidents)
+
+        # determine SC phases ------------------------------------------------------------------------------------------
+        no_sc = random.choices(list(range(0, len(monte_carlo_pars["p_sc_quant"]))),
+                               monte_carlo_pars["p_sc_quant"])[0]
+
+        while len(fcy_phases) < no_sc:
+            # start race progress (including random begin within start lap)
+            prog_start = random.choices(choices_sc_start, probs_sc_start)[0] + random.random()
+
+            # assure that SC phase is started more than a lap before the end of the race
+            if prog_start > tot_no_laps - 1.0:
+                continue
+
+            # determine duration and stop race progress (full lap) of SC phase
+            sc_dur = float(random.choices(list(range(1, len(monte_carlo_pars["p_sc_duration"]) + 1)),
+                                          monte_carlo_pars["p_sc_duration"])[0])
+            prog_stop = min(float(math.floor(prog_start + sc_dur)), float(tot_no_laps))
+
+            # append created phase temporarily and remove it again if it intersects another one
+            fcy_phases.append([prog_start, prog_stop, 'SC'])
+
+            if __check_fcyphase_intersection(fcy_phases=fcy_phases, monte_carlo_pars=monte_carlo_pars):
+                del fcy_phases[-1]
+
+        # determine driver accidents (one driver per SC phase) ---------------------------------------------------------
+        for _ in fcy_phases:
+            if all(bool_retired):
+                break
+
+            idx_tmp = None
+
+            while idx_tmp is None or bool_retired[idx_tmp]:
+                idx_tmp = random.choices(list(range(len(p_accidents))), p_accidents)[0]
+
+            bool_retired[idx_tmp] = True
+
+        # determine driver failures and VSC phases ---------------------------------------------------------------------
+        for idx, p_failure in enumerate(p_failures):
+            # if current driver is already involved in an accident continue to next driver
+            if bool_retired[idx]:
+                continue
+
+            failure = random.choices([False, True], [1.0 - p_failure, p_failure])[0]
+
+            if not failure:
+                continue
+
+            vsc = random.choices([False, True], [1.0 - monte_carlo_pars["p_vsc_aft_failure"],
+                                                 monte_carlo_pars["p_vsc_aft_failure"]])[0]
+
+            # loop until valid VSC phase was found
+            while vsc:
+                # start race progress determined by a uniform distribution (more than half a lap before the end)
+                prog_start = random.random() * tot_no_laps
+
+                if prog_start >= tot_no_laps - 0.5:
+                    continue
+
+                # determine duration and stop race progress of VSC phase
+                vsc_dur = random.choices(list(range(1, len(monte_carlo_pars["p_vsc_duration"]) + 1)),
+                                         monte_carlo_pars["p_vsc_duration"])[0] + random.random()
+                prog_stop = min(prog_start + vsc_dur, float(tot_no_laps))
+
+                # append created phase temporarily and remove it again if it intersects another one
+                fcy_phases.append([prog_start, prog_stop, 'VSC'])
+
+                if __check_fcyphase_intersection(fcy_phases=fcy_phases, monte_carlo_pars=monte_carlo_pars):
+                    del fcy_phases[-1]
+                else:
+                    break
+
+        # sort FCY phase list by start race progress when finished
+        fcy_phases.sort(key=lambda x: x[0])
+        fcy_scenarios.append(fcy_phases)
+
+    return fcy_scenarios
+
+
+def __check_fcyphase_intersection(fcy_phases: list, monte_carlo_pars: dict) -> bool:
+    """This method checks if the inserted FCY phases (race progress domain) keep the minimum distance defined in the
+    Monte Carlo parameters, see MonteCarlo.check_fcyphase_intersection(). It returns True if an intersection exists."""
+
+    for idx_1, cur_phase_1 in enumerate(fcy_phases):
+        if cur_phase_1[2] == 'VSC':
+            cur_min_dist = monte_carlo_pars["min_dist_vsc"]
+        elif cur_phase_1[2] == 'SC':
+            cur_min_dist = monte_carlo_pars["min_dist_sc"]
+        else:
+            raise RuntimeError("Unknown FCY phase type!")
+
+        for cur_phase_2 in fcy_phases[idx_1 + 1:]:
+            if cur_phase_2[0] <= cur_phase_1[1] + cur_min_dist and cur_phase_1[0] - cur_min_dist <= cur_phase_2[1]:
+                return True
+
+    return False
+
+
+# testing --------------------------------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    pass
@@ -1,3 +1,4 @@
+import os
 import racesim.src.import_pars
 
 
@@ -9,6 +10,14 @@ def import_ext_params(use_print: bool, race_pars_file: str, driver_initials: str
                                                   mcs_pars_file='pars_mcs.ini')[0]
 
     # convert parameter format -----------------------------------------------------------------------------------------
+    return convert_ext_params(pars_in=pars_in, driver_initials=driver_initials)
+
+
+def convert_ext_params(pars_in: dict, driver_initials: str) -> dict:
+    """Convert the parameters of the race simulation (as loaded by racesim.src.import_pars) into the parameter format of
+    the basic race simulation for the given driver. This allows to load a race once and to convert it for all
+    participants."""
+
     pars_basic = {}
 
     pars_basic['track_pars'] = {"t_pitdrive_inlap": pars_in['track_pars']['t_pitdrive_inlap'],
@@ -51,3 +60,28 @@ def import_ext_params(use_print: bool, race_pars_file: str, driver_initials: str
                                  "t_pit_charge_perkwh": pars_in['car_pars'][team_tmp]['t_pit_charge_perkwh']}
 
     return pars_basic
+
+
+def import_fcy_scenario_pars(use_print: bool, race_pars_file: str, mcs_pars_file: str = 'pars_mcs.ini') -> dict:
+    """Load the parameters required to create random FCY scenarios (see create_fcy_scenarios()) from the parameter files
+    of the race simulation, i.e. the Monte Carlo parameters and the accident and failure probabilities of all
+    participants of the race."""
+
+    # load parameters --------------------------------------------------------------------------------------------------
+    par_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+                            "racesim", "input", "parameters")
+
+    pars_in = racesim.src.import_pars.import_pars(use_print=use_print,
+                                                  use_vse=False,
+                                                  race_pars_file=os.path.join(par_path, race_pars_file),
+                                                  mcs_pars_file=os.path.join(par_path, mcs_pars_file))[0]
+
+    # set together FCY scenario parameters -----------------------------------------------------------------------------
+    participants = pars_in['race_pars']['participants']
+
+    fcy_scenario_pars = {"monte_carlo_pars": pars_in['monte_carlo_pars'],
+                         "p_accidents": [pars_in['driver_pars'][initials]['p_accident'] for initials in participants],
+                         "p_failures": [pars_in['car_pars'][pars_in['driver_pars'][initials]['team']]['p_failure']
+                                        for initials in participants]}
+
+    return fcy_scenario_pars
@@ -1,5 +1,11 @@
 import numpy as np
-import cvxpy as cp
+
+# cvxpy is optional since it is only required for the QP solved by opt_strategy_basic() (opt_strategies_basic_lin()
+# solves the same problem without it)
+try:
+    import cvxpy as cp
+except ImportError:
+    cp = None
 
 
 def opt_strategy_basic(tot_no_laps: int,
@@ -65,6 +71,9 @@ def opt_strategy_basic(tot_no_laps: int,
     :rtype stint_lengths:   np.ndarray
     """
 
+    if cp is None:
+        raise RuntimeError('cvxpy is required for opt_strategy_basic(), use opt_strategies_basic_lin() instead!')
+
     # ------------------------------------------------------------------------------------------------------------------
     # SET UP PROBLEM MATRICES ------------------------------------------------------------------------------------------
     # ------------------------------------------------------------------------------------------------------------------
@@ -121,6 +130,143 @@ def opt_strategy_basic(tot_no_laps: int,
     return stint_lengths
 
 
+def opt_strategies_basic_lin(tot_no_laps: int,
+                             tire_pars: dict,
+                             strategy_combinations: dict,
+                             start_age: int) -> dict:
+
+    """
+    .. description::
+    Closed-form solution of the integer QP of opt_strategy_basic() (linear tire degradation model) for all compound
+    combinations and all numbers of pit stops at once, i.e. without cvxpy. The objective is separable and convex, i.e.
+    an integer solution is optimal if no lap can be moved from one stint to another with a gain. The marginal cost of
+    extending stint i from x_i to x_i + 1 laps is d_i(x_i) = k_1_lin_i * (x_i + 0.5) + q_i. At first, the continuous
+    KKT conditions are solved (all marginal costs equal to the Lagrange multiplier, stints with a single lap are removed
+    iteratively from the active set), the result is rounded down. Afterwards, a local repair adds the missing laps to
+    the stints with the lowest marginal costs and moves laps between stints as long as this reduces the objective. The
+    stints of all combinations are processed in a single padded array (one row per combination).
+
+    opt_strategy_basic() can be used as cross-check if cvxpy is installed (both return the same objective value, the
+    stint lengths can differ if there are several optimal solutions).
+
+    .. inputs::
+    :param tot_no_laps:             number of laps in current race
+    :type tot_no_laps:              int
+    :param tire_pars:               tire model parameters for every compound -> see param file
+    :type tire_pars:                dict
+    :param strategy_combinations:   compound combinations for every number of pit stops, e.g.
+                                    {1: [('A4', 'A5')], 2: [('A4', 'A5', 'A5'), ('A4', 'A4', 'A5')], ...}
+    :type strategy_combinations:    dict
+    :param start_age:               [-] tire age of the start tire set (the tires of the other stints are new)
+    :type start_age:                int
+
+    .. outputs::
+    :return stint_lengths:          optimized stint lengths for every combination in the form
+                                    {no_pitstops: [stint_lengths, ...], ...}, stint_lengths is None if no solution
+                                    exists (more stints than laps or negative k_1_lin)
+    :rtype stint_lengths:           dict
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # SET UP PADDED PROBLEM ARRAYS -------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    combinations = [(no_pitstops, comp_strat) for no_pitstops in strategy_combinations
+                    for comp_strat in strategy_combinations[no_pitstops]]
+
+    if not combinations:
+        return {no_pitstops: [] for no_pitstops in strategy_combinations}
+
+    no_combinations = len(combinations)
+    max_no_stints = max(len(comp_strat) for _, comp_strat in combinations)
+
+    # inactive (padded) stints get zero laps and an infinite marginal cost
+    bool_active = np.full((no_combinations, max_no_stints), False)
+    k_1 = np.ones((no_combinations, max_no_stints))
+    q = np.zeros((no_combinations, max_no_stints))
+
+    for idx_comb, (_, comp_strat) in enumerate(combinations):
+        no_stints = len(comp_strat)
+        bool_active[idx_comb, :no_stints] = True
+        k_1[idx_comb, :no_stints] = [tire_pars[comp]['k_1_lin'] for comp in comp_strat]
+        q[idx_comb, :no_stints] = [tire_pars[comp]['k_0'] for comp in comp_strat]
+
+    # same objective as in opt_strategy_basic(): 0.5 * k_1_lin * x^2 + ((0.5 + age) * k_1_lin + k_0) * x
+    ages = np.zeros((no_combinations, max_no_stints))
+    ages[:, 0] = start_age
+    q += (0.5 + ages) * k_1
+
+    no_stints = np.sum(bool_active, axis=1)
+    bool_valid = (no_stints <= tot_no_laps) & np.all(~bool_active | (k_1 >= 0.0), axis=1)
+    no_laps_free = tot_no_laps - no_stints  # laps to distribute in addition to the minimum of 1 lap per stint
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # SOLVE CONTINUOUS KKT CONDITIONS ----------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # additional laps of stint i for multiplier lam: (lam - q_i) / k_1_i - 0.5 (k_1 = 0 is regularized for this step)
+    k_1_reg = np.maximum(k_1, 1e-6)
+    bool_kkt = np.copy(bool_active)
+    lam = np.zeros(no_combinations)
+
+    for _ in range(max_no_stints):
+        sum_inv_k_1 = np.sum(np.where(bool_kkt, 1.0 / k_1_reg, 0.0), axis=1)
+        sum_q_k_1 = np.sum(np.where(bool_kkt, q / k_1_reg + 0.5, 0.0), axis=1)
+        lam = (no_laps_free + sum_q_k_1) / np.maximum(sum_inv_k_1, 1e-12)
+
+        bool_kkt_new = bool_kkt & ((lam[:, None] - q) / k_1_reg - 0.5 > 0.0)
+
+        if np.array_equal(bool_kkt_new, bool_kkt):
+            break
+
+        bool_kkt = bool_kkt_new
+
+    x_add = np.where(bool_kkt, np.floor(np.clip((lam[:, None] - q) / k_1_reg - 0.5, 0.0, tot_no_laps)), 0.0)
+    x = np.where(bool_active, 1 + x_add.astype(np.int64), 0)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # LOCAL REPAIR -----------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    idxs_comb = np.arange(no_combinations)
+
+    for _ in range(tot_no_laps * max_no_stints):
+        # marginal costs of adding a lap to / removing a lap from every stint
+        cost_add = np.where(bool_active, k_1 * (x + 0.5) + q, np.inf)
+        cost_rem = np.where(bool_active & (x > 1), k_1 * (x - 0.5) + q, -np.inf)
+
+        idxs_add = np.argmin(cost_add, axis=1)
+        idxs_rem = np.argmax(cost_rem, axis=1)
+        no_laps_diff = tot_no_laps - np.sum(x, axis=1)
+
+        # add missing laps to the cheapest stints, remove surplus laps from the most expensive stints and move a lap if
+        # this reduces the objective
+        bool_add = bool_valid & (no_laps_diff > 0)
+        bool_rem = bool_valid & (no_laps_diff < 0)
+        bool_move = bool_valid & (no_laps_diff == 0) \
+            & (cost_rem[idxs_comb, idxs_rem] > cost_add[idxs_comb, idxs_add] + 1e-9)
+
+        if not np.any(bool_add | bool_rem | bool_move):
+            break
+
+        x[idxs_comb[bool_add | bool_move], idxs_add[bool_add | bool_move]] += 1
+        x[idxs_comb[bool_rem | bool_move], idxs_rem[bool_rem | bool_move]] -= 1
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # SET TOGETHER OUTPUT ----------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    stint_lengths = {no_pitstops: [] for no_pitstops in strategy_combinations}
+
+    for idx_comb, (no_pitstops, comp_strat) in enumerate(combinations):
+        if bool_valid[idx_comb]:
+            stint_lengths[no_pitstops].append(x[idx_comb, :len(comp_strat)].astype(np.int32))
+        else:
+            stint_lengths[no_pitstops].append(None)
+
+    return stint_lengths
+
+
 # testing --------------------------------------------------------------------------------------------------------------
 if __name__ == "__main__":
     pass
@@ -0,0 +1,165 @@
+import numpy as np
+import racesim_basic.src.calc_racetimes_full_factorial
+
+
+def opt_strategy_dp(tot_no_laps: int,
+                    tire_pars: dict,
+                    available_compounds: list,
+                    min_no_pitstops: int,
+                    max_no_pitstops: int,
+                    enforce_diff_compounds: bool,
+                    start_compound: str or None,
+                    start_age: int) -> dict:
+
+    """
+    .. description::
+    Dynamic programming optimization of the stint lengths and compounds for every number of pit stops at once. In
+    contrast to the QP (opt_strategy_basic) it works for all tire degradation models (lin, quad, cub, ln) since the
+    stage costs are taken from calc_tire_degradation().
+
+    The state of the DP is (lap at the end of the stint, number of stops used, current compound, compounds used so far
+    as bit mask). A stage adds a stint with a new compound, the stage cost is the tire degradation time loss of the
+    stint plus the cold tire time loss in its first lap. The base lap times, the fuel mass time losses (no refueling)
+    and the pit stop time losses do not depend on the stint lengths and compounds for a given number of pit stops and
+    are therefore not part of the optimization. The effort is O(max_no_pitstops * no_compounds * 2^no_compounds *
+    tot_no_laps^2).
+
+    .. inputs::
+    :param tot_no_laps:             number of laps in current race
+    :type tot_no_laps:              int
+    :param tire_pars:               tire model parameters for every compound -> see param file
+    :type tire_pars:                dict
+    :param available_compounds:     available compounds, e.g. ['A3', 'A4', 'A5']
+    :type available_compounds:      list
+    :param min_no_pitstops:         minimum number of pit stops
+    :type min_no_pitstops:          int
+    :param max_no_pitstops:         maximum number of pit stops
+    :type max_no_pitstops:          int
+    :param enforce_diff_compounds:  enforce that at least two different compounds are used (if there is a pit stop)
+    :type enforce_diff_compounds:   bool
+    :param start_compound:          compound of the first stint (None if it is free)
+    :type start_compound:           str or None
+    :param start_age:               [-] tire age of the start tire set (the tires of the other stints are new)
+    :type start_age:                int
+
+    .. outputs::
+    :return opt_strategies:         optimal strategy for every number of pit stops in the form
+                                    {no_pitstops: [stint_lengths, compounds], ...}, number of pit stops without a valid
+                                    strategy (e.g. more stints than laps) are not included
+    :rtype opt_strategies:          dict
+    """
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # PREPARATIONS -----------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    if start_compound is not None and start_compound not in available_compounds:
+        raise RuntimeError('Start compound is not available!')
+
+    no_compounds = len(available_compounds)
+    no_masks = 2 ** no_compounds
+
+    # create stint cost matrices t_stint[idx_compound][lap_start, lap_end] containing the time losses of a stint from
+    # lap_start to lap_end (inf if lap_end <= lap_start) for the first stint (start age) and for the following stints
+    laps = np.arange(tot_no_laps + 1)
+    len_stints = laps[None, :] - laps[:, None]
+
+    t_stint_first = []
+    t_stint = []
+
+    for compound in available_compounds:
+        for tire_age_start, t_stint_cur in ((start_age, t_stint_first), (0, t_stint)):
+            t_stint_degr = racesim_basic.src.calc_racetimes_full_factorial.\
+                calc_stint_cost_table(tire_age_start=tire_age_start,
+                                      max_stint_length=tot_no_laps,
+                                      compound=compound,
+                                      tire_pars=tire_pars)
+
+            t_stint_cur.append(np.where(len_stints > 0,
+                                        t_stint_degr[np.clip(len_stints, 0, None)] + tire_pars["t_add_coldtires"],
+                                        np.inf))
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # FORWARD PASS -----------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    # t_opt[no_stops][lap, idx_compound, mask] contains the minimal time loss to reach the end of lap with no_stops
+    # stops, the back pointers contain lap, compound and mask at the end of the previous stint
+    t_opt = [np.full((tot_no_laps + 1, no_compounds, no_masks), np.inf)]
+    back_pointers = [None]
+
+    # first stint (starts in lap 0)
+    for idx_compound, compound in enumerate(available_compounds):
+        if start_compound is None or compound == start_compound:
+            t_opt[0][:, idx_compound, 1 << idx_compound] = t_stint_first[idx_compound][0]
+
+    # further stints
+    for no_stops in range(1, max_no_pitstops + 1):
+        # the compound at the end of the previous stint does not influence the costs of the next stint
+        idxs_compound_prev = np.argmin(t_opt[-1], axis=1)                       # shape (tot_no_laps + 1, no_masks)
+        t_opt_prev = np.min(t_opt[-1], axis=1)                                  # shape (tot_no_laps + 1, no_masks)
+
+        t_opt_cur = np.full((tot_no_laps + 1, no_compounds, no_masks), np.inf)
+        back_pointers_cur = np.zeros((tot_no_laps + 1, no_compounds, no_masks, 3), dtype=np.int64)
+
+        for idx_compound in range(no_compounds):
+            # costs for all combinations of previous mask, previous lap and current lap, shape (masks, laps, laps)
+            t_cand = t_opt_prev.T[:, :, None] + t_stint[idx_compound][None, :, :]
+            idxs_lap_prev = np.argmin(t_cand, axis=1)                           # shape (no_masks, tot_no_laps + 1)
+            t_cand = np.min(t_cand, axis=1)                                     # shape (no_masks, tot_no_laps + 1)
+
+            for mask_prev in range(no_masks):
+                mask = mask_prev | (1 << idx_compound)
+                bool_better = t_cand[mask_prev] < t_opt_cur[:, idx_compound, mask]
+
+                t_opt_cur[bool_better, idx_compound, mask] = t_cand[mask_prev, bool_better]
+                back_pointers_cur[bool_better, idx_compound, mask, 0] = idxs_lap_prev[mask_prev, bool_better]
+                back_pointers_cur[bool_better, idx_compound, mask, 1] = \
+                    idxs_compound_prev[idxs_lap_prev[mask_prev, bool_better], mask_prev]
+                back_pointers_cur[bool_better, idx_compound, mask, 2] = mask_prev
+
+        t_opt.append(t_opt_cur)
+        back_pointers.append(back_pointers_cur)
+
+    # ------------------------------------------------------------------------------------------------------------------
+    # BACKTRACKING -----------------------------------------------------------------------------------------------------
+    # ------------------------------------------------------------------------------------------------------------------
+
+    opt_strategies = {}
+
+    for no_stops in range(min_no_pitstops, max_no_pitstops + 1):
+        # determine valid final masks
+        t_final = np.copy(t_opt[no_stops][tot_no_laps])
+
+        if enforce_diff_compounds and no_stops > 0:
+            for mask in range(no_masks):
+                if bin(mask).count("1") < 2:
+                    t_final[:, mask] = np.inf
+
+        if np.isinf(np.min(t_final)):
+            continue
+
+        idx_compound, mask = np.unravel_index(np.argmin(t_final), t_final.shape)
+        lap = tot_no_laps
+
+        # go backwards through the stints
+        stint_lengths = []
+        compounds = []
+
+        for no_stops_cur in range(no_stops, 0, -1):
+            lap_prev, idx_compound_prev, mask_prev = back_pointers[no_stops_cur][lap, idx_compound, mask]
+            stint_lengths.insert(0, int(lap - lap_prev))
+            compounds.insert(0, available_compounds[idx_compound])
+            lap, idx_compound, mask = lap_prev, idx_compound_prev, mask_prev
+
+        stint_lengths.insert(0, int(lap))
+        compounds.insert(0, available_compounds[idx_compound])
+
+        opt_strategies[no_stops] = [stint_lengths, compounds]
+
+    return opt_strategies
+
+
+# testing --------------------------------------------------------------------------------------------------------------
+if __name__ == "__main__":
+    pass